@@ -1,185 +1,1916 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g
+from flask import has_app_context, before_render_template, template_rendered, send_from_directory, Response
 import sqlite3
+import atexit
+import base64
+import collections
+import csv
+import datetime
+import functools
+import gzip
 import hashlib
+import hmac
+import html
+import io
+import json
+import mimetypes
 import os
+import queue
+import random
+import re
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+import click
+from markupsafe import Markup
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+try:
+    import brotli
+except ImportError:
+    # Optional: without it only gzip variants of the static assets are built
+    brotli = None
 
 app = Flask(__name__)
 app.secret_key = 'petlink_secret_key_2024'
 
-# Database initialization
-def init_db():
-    try:
-        conn = sqlite3.connect('petlink.db')
-        cursor = conn.cursor()
-        
-        # Create Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                contact TEXT NOT NULL,
-                address TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create Owners table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS owners (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                contact TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create Categories table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        ''')
-        
-        # Create Pets table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                category_id INTEGER,
-                breed TEXT NOT NULL,
-                age INTEGER NOT NULL,
-                health_details TEXT,
-                medical_details TEXT,
-                adoption_status TEXT DEFAULT 'available',
-                image_url TEXT,
-                owner_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (category_id) REFERENCES categories (id),
-                FOREIGN KEY (owner_id) REFERENCES owners (id)
-            )
-        ''')
-        
-        # Create Adoption Requests table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS adoption_requests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                pet_id INTEGER,
-                status TEXT DEFAULT 'pending',
-                message TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (pet_id) REFERENCES pets (id)
+# Database settings (override with environment variables)
+app.config['DATABASE'] = os.environ.get('PETLINK_DB', 'petlink.db')
+app.config['DB_POOL_SIZE'] = int(os.environ.get('PETLINK_DB_POOL_SIZE', '8'))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('PETLINK_DB_POOL_TIMEOUT', '10'))
+# Prepared statements kept per pooled connection (sqlite3's own LRU cache)
+app.config['DB_STATEMENT_CACHE_SIZE'] = int(os.environ.get('PETLINK_DB_STATEMENT_CACHE_SIZE', '256'))
+# Storage profile: WAL lets readers run alongside the single writer.
+# journal_mode is persistent, so it is applied once at startup in init_db();
+# the remaining PRAGMAs are applied once to every pooled connection.
+app.config['DB_JOURNAL_MODE'] = os.environ.get('PETLINK_DB_JOURNAL_MODE', 'WAL')
+app.config['DB_PRAGMAS'] = {
+    'synchronous': os.environ.get('PETLINK_DB_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('PETLINK_DB_BUSY_TIMEOUT', '5000')),
+    'mmap_size': int(os.environ.get('PETLINK_DB_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'cache_size': int(os.environ.get('PETLINK_DB_CACHE_SIZE', '-16000')),
+    'temp_store': 'MEMORY'
+}
+# Write transactions that hit SQLITE_BUSY are retried with exponential backoff
+app.config['DB_BUSY_RETRIES'] = int(os.environ.get('PETLINK_DB_BUSY_RETRIES', '5'))
+app.config['DB_BUSY_BACKOFF'] = float(os.environ.get('PETLINK_DB_BUSY_BACKOFF', '0.02'))
+app.config['DB_BUSY_BACKOFF_MAX'] = 0.5
+# Request/SQL instrumentation served at /metrics, and the slow-query log threshold
+app.config['METRICS_ENABLED'] = os.environ.get('PETLINK_METRICS', '1') == '1'
+app.config['SLOW_QUERY_MS'] = float(os.environ.get('PETLINK_SLOW_QUERY_MS', '100'))
+app.config['SLOW_QUERY_LOG_SIZE'] = 100
+# /metrics and the *-stats endpoints need this bearer token; without one they
+# only answer requests from the loopback interface
+app.config['METRICS_TOKEN'] = os.environ.get('PETLINK_METRICS_TOKEN', '')
+# Public listing cache (home page and /adopt); a TTL of 0 disables it
+app.config['PAGE_CACHE_TTL'] = float(os.environ.get('PETLINK_PAGE_CACHE_TTL', '60'))
+app.config['PAGE_CACHE_SIZE'] = int(os.environ.get('PETLINK_PAGE_CACHE_SIZE', '256'))
+# Opt-in write-behind buffer for like toggles, flushed every interval or once size keys are pending
+app.config['LIKE_BUFFER_ENABLED'] = os.environ.get('PETLINK_LIKE_BUFFER', '0') == '1'
+app.config['LIKE_FLUSH_INTERVAL'] = float(os.environ.get('PETLINK_LIKE_FLUSH_INTERVAL', '0.5'))
+app.config['LIKE_FLUSH_SIZE'] = int(os.environ.get('PETLINK_LIKE_FLUSH_SIZE', '1000'))
+# Stored responses for Idempotency-Key retries are kept this long
+app.config['IDEMPOTENCY_KEY_TTL_HOURS'] = int(os.environ.get('PETLINK_IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+# Anonymous pages may be reused by a shared cache (reverse proxy) for this many seconds
+app.config['HTTP_SHARED_MAX_AGE'] = int(os.environ.get('PETLINK_HTTP_SHARED_MAX_AGE', '10'))
+# Owner dashboard live updates: how often a worker picks up events written by
+# other workers, the keep-alive interval of idle streams and how long events
+# are kept for clients that reconnect
+app.config['EVENT_POLL_INTERVAL'] = float(os.environ.get('PETLINK_EVENT_POLL_INTERVAL', '1'))
+app.config['EVENT_HEARTBEAT'] = float(os.environ.get('PETLINK_EVENT_HEARTBEAT', '15'))
+app.config['EVENT_RETENTION_MINUTES'] = int(os.environ.get('PETLINK_EVENT_RETENTION_MINUTES', '60'))
+# `flask serve`: worker processes x threads per worker (keep threads <= DB_POOL_SIZE),
+# keep-alive idle timeout and how long a stopping worker may spend finishing requests
+app.config['SERVE_HOST'] = os.environ.get('PETLINK_HOST', '0.0.0.0')
+app.config['SERVE_PORT'] = int(os.environ.get('PETLINK_PORT', '5000'))
+app.config['SERVE_WORKERS'] = int(os.environ.get('PETLINK_WORKERS', str(os.cpu_count() or 1)))
+app.config['SERVE_THREADS'] = int(os.environ.get('PETLINK_THREADS', str(app.config['DB_POOL_SIZE'])))
+app.config['SERVE_KEEPALIVE'] = float(os.environ.get('PETLINK_KEEPALIVE', '5'))
+app.config['SERVE_DRAIN_TIMEOUT'] = float(os.environ.get('PETLINK_DRAIN_TIMEOUT', '30'))
+
+# Schema migrations
+# Each migration runs once, in order, inside its own transaction; the schema
+# version is stored in PRAGMA user_version. Add new schema changes as a new
+# numbered migration instead of editing an existing one.
+MIGRATIONS = []
+
+def migration(version):
+    def register(fn):
+        MIGRATIONS.append((version, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+@migration(1)
+def create_base_tables(conn):
+    # Create Users table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            contact TEXT NOT NULL,
+            address TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Create Owners table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS owners (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            contact TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Create Categories table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    
+    # Create Pets table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category_id INTEGER,
+            breed TEXT NOT NULL,
+            age INTEGER NOT NULL,
+            health_details TEXT,
+            medical_details TEXT,
+            adoption_status TEXT DEFAULT 'available',
+            image_url TEXT,
+            owner_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES categories (id),
+            FOREIGN KEY (owner_id) REFERENCES owners (id)
+        )
+    ''')
+    
+    # Create Adoption Requests table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS adoption_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            pet_id INTEGER,
+            status TEXT DEFAULT 'pending',
+            message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (pet_id) REFERENCES pets (id)
+        )
+    ''')
+    
+    # Create Care Posts table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS care_posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    ''')
+    
+    # Create Care Post Comments table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS care_comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(post_id) REFERENCES care_posts(id) ON DELETE CASCADE,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    ''')
+    
+    # Create Pet Likes table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pet_likes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pet_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(pet_id, user_id),
+            FOREIGN KEY(pet_id) REFERENCES pets(id) ON DELETE CASCADE,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    ''')
+
+@migration(2)
+def add_hot_query_indexes(conn):
+    # /adopt and / list available pets newest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_pets_status_created ON pets (adoption_status, created_at)')
+    # /adopt?category= filters by category before status
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_pets_category_status ON pets (category_id, adoption_status, created_at)')
+    # /owner-dashboard lists an owner's pets newest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_pets_owner_created ON pets (owner_id, created_at)')
+    # Requests are joined to pets by pet_id and filtered by status
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_adoption_requests_pet ON adoption_requests (pet_id, status)')
+    # /profile lists a user's requests newest first; also serves the duplicate check
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_adoption_requests_user ON adoption_requests (user_id, created_at)')
+    # /care/<id> loads a post's comments oldest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_care_comments_post ON care_comments (post_id, created_at)')
+    # /care lists posts newest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_care_posts_created ON care_posts (created_at)')
+    # pet_likes lookups by pet_id are served by its UNIQUE(pet_id, user_id) index
+
+@migration(3)
+def add_pet_like_count(conn):
+    # Denormalized like counter so listings don't aggregate pet_likes
+    conn.execute('ALTER TABLE pets ADD COLUMN like_count INTEGER NOT NULL DEFAULT 0')
+    conn.execute('''
+        UPDATE pets SET like_count = (SELECT COUNT(*) FROM pet_likes WHERE pet_id = pets.id)
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS pet_likes_count_insert AFTER INSERT ON pet_likes
+        BEGIN
+            UPDATE pets SET like_count = like_count + 1 WHERE id = NEW.pet_id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS pet_likes_count_delete AFTER DELETE ON pet_likes
+        BEGIN
+            UPDATE pets SET like_count = like_count - 1 WHERE id = OLD.pet_id;
+        END
+    ''')
+
+@migration(4)
+def add_pet_search_index(conn):
+    # Full-text index over the searchable pet fields, keyed by pets.id (rowid)
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS pets_fts USING fts5(
+            name, breed, health_details, medical_details, category_name,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '1 2 3 4 5 6'
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO pets_fts (rowid, name, breed, health_details, medical_details, category_name)
+        SELECT p.id, p.name, p.breed, p.health_details, p.medical_details, c.name
+        FROM pets p
+        LEFT JOIN categories c ON p.category_id = c.id
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS pets_fts_insert AFTER INSERT ON pets
+        BEGIN
+            INSERT INTO pets_fts (rowid, name, breed, health_details, medical_details, category_name)
+            VALUES (NEW.id, NEW.name, NEW.breed, NEW.health_details, NEW.medical_details,
+                    (SELECT name FROM categories WHERE id = NEW.category_id));
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS pets_fts_delete AFTER DELETE ON pets
+        BEGIN
+            DELETE FROM pets_fts WHERE rowid = OLD.id;
+        END
+    ''')
+    # Only re-index when searchable columns change (not on like_count/status updates)
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS pets_fts_update
+        AFTER UPDATE OF name, breed, health_details, medical_details, category_id ON pets
+        BEGIN
+            DELETE FROM pets_fts WHERE rowid = OLD.id;
+            INSERT INTO pets_fts (rowid, name, breed, health_details, medical_details, category_name)
+            VALUES (NEW.id, NEW.name, NEW.breed, NEW.health_details, NEW.medical_details,
+                    (SELECT name FROM categories WHERE id = NEW.category_id));
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS pets_fts_category_rename AFTER UPDATE OF name ON categories
+        BEGIN
+            UPDATE pets_fts SET category_name = NEW.name
+            WHERE rowid IN (SELECT id FROM pets WHERE category_id = NEW.id);
+        END
+    ''')
+
+@migration(5)
+def add_pets_created_index(conn):
+    # /search_pets without a status filter pages through all pets newest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_pets_created ON pets (created_at)')
+
+@migration(6)
+def add_pet_likes_user_index(conn):
+    # Liked-by-user listings and the batched is_liked lookup start from user_id
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_pet_likes_user ON pet_likes (user_id, pet_id)')
+
+@migration(7)
+def add_owner_stats_rollups(conn):
+    # Per-pet request counters and per-owner rollups behind the owner dashboard
+    conn.execute('ALTER TABLE pets ADD COLUMN request_count INTEGER NOT NULL DEFAULT 0')
+    conn.execute('ALTER TABLE pets ADD COLUMN approved_count INTEGER NOT NULL DEFAULT 0')
+    conn.execute('ALTER TABLE pets ADD COLUMN pending_count INTEGER NOT NULL DEFAULT 0')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_pets_owner_requests
+        ON pets (owner_id, request_count DESC, name)
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS owner_pet_stats (
+            owner_id INTEGER NOT NULL,
+            adoption_status TEXT,
+            pet_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (owner_id, adoption_status)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS owner_category_stats (
+            owner_id INTEGER NOT NULL,
+            category_id INTEGER,
+            pet_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (owner_id, category_id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS owner_request_stats (
+            owner_id INTEGER NOT NULL,
+            status TEXT,
+            request_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (owner_id, status)
+        )
+    ''')
+    rebuild_owner_stats(conn, ('owner_pet_stats', 'owner_category_stats', 'owner_request_stats'))
+    
+    # Pets: move the pet between its owner's status and category buckets
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_pet_insert AFTER INSERT ON pets
+        BEGIN
+            INSERT INTO owner_pet_stats (owner_id, adoption_status, pet_count)
+            VALUES (NEW.owner_id, NEW.adoption_status, 1)
+            ON CONFLICT (owner_id, adoption_status) DO UPDATE SET pet_count = pet_count + 1;
+            INSERT INTO owner_category_stats (owner_id, category_id, pet_count)
+            VALUES (NEW.owner_id, NEW.category_id, 1)
+            ON CONFLICT (owner_id, category_id) DO UPDATE SET pet_count = pet_count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_pet_delete AFTER DELETE ON pets
+        BEGIN
+            UPDATE owner_pet_stats SET pet_count = pet_count - 1
+            WHERE owner_id = OLD.owner_id AND adoption_status = OLD.adoption_status;
+            UPDATE owner_category_stats SET pet_count = pet_count - 1
+            WHERE owner_id = OLD.owner_id AND category_id = OLD.category_id;
+            -- Requests for a deleted pet no longer count towards its owner
+            UPDATE owner_request_stats
+            SET request_count = request_count - (
+                SELECT COUNT(*) FROM adoption_requests
+                WHERE pet_id = OLD.id AND status = owner_request_stats.status
             )
-        ''')
-        
-        # Create Care Posts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS care_posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(user_id) REFERENCES users(id)
+            WHERE owner_id = OLD.owner_id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_pet_update
+        AFTER UPDATE OF owner_id, adoption_status, category_id ON pets
+        BEGIN
+            UPDATE owner_pet_stats SET pet_count = pet_count - 1
+            WHERE owner_id = OLD.owner_id AND adoption_status = OLD.adoption_status;
+            INSERT INTO owner_pet_stats (owner_id, adoption_status, pet_count)
+            VALUES (NEW.owner_id, NEW.adoption_status, 1)
+            ON CONFLICT (owner_id, adoption_status) DO UPDATE SET pet_count = pet_count + 1;
+            UPDATE owner_category_stats SET pet_count = pet_count - 1
+            WHERE owner_id = OLD.owner_id AND category_id = OLD.category_id;
+            INSERT INTO owner_category_stats (owner_id, category_id, pet_count)
+            VALUES (NEW.owner_id, NEW.category_id, 1)
+            ON CONFLICT (owner_id, category_id) DO UPDATE SET pet_count = pet_count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_pet_owner_change
+        AFTER UPDATE OF owner_id ON pets WHEN NEW.owner_id IS NOT OLD.owner_id
+        BEGIN
+            UPDATE owner_request_stats
+            SET request_count = request_count - (
+                SELECT COUNT(*) FROM adoption_requests
+                WHERE pet_id = OLD.id AND status = owner_request_stats.status
             )
-        ''')
-        
-        # Create Care Post Comments table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS care_comments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                content TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(post_id) REFERENCES care_posts(id) ON DELETE CASCADE,
-                FOREIGN KEY(user_id) REFERENCES users(id)
+            WHERE owner_id = OLD.owner_id;
+            INSERT INTO owner_request_stats (owner_id, status, request_count)
+            SELECT NEW.owner_id, status, COUNT(*) FROM adoption_requests
+            WHERE pet_id = NEW.id
+            GROUP BY status
+            ON CONFLICT (owner_id, status) DO UPDATE SET request_count = request_count + excluded.request_count;
+        END
+    ''')
+    
+    # Adoption requests: per-pet counters plus the owner's status buckets
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_request_insert AFTER INSERT ON adoption_requests
+        BEGIN
+            UPDATE pets SET request_count = request_count + 1,
+                            approved_count = approved_count + (NEW.status IS 'approved'),
+                            pending_count = pending_count + (NEW.status IS 'pending')
+            WHERE id = NEW.pet_id;
+            INSERT INTO owner_request_stats (owner_id, status, request_count)
+            SELECT owner_id, NEW.status, 1 FROM pets WHERE id = NEW.pet_id
+            ON CONFLICT (owner_id, status) DO UPDATE SET request_count = request_count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_request_delete AFTER DELETE ON adoption_requests
+        BEGIN
+            UPDATE pets SET request_count = request_count - 1,
+                            approved_count = approved_count - (OLD.status IS 'approved'),
+                            pending_count = pending_count - (OLD.status IS 'pending')
+            WHERE id = OLD.pet_id;
+            UPDATE owner_request_stats SET request_count = request_count - 1
+            WHERE owner_id = (SELECT owner_id FROM pets WHERE id = OLD.pet_id) AND status = OLD.status;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_stats_request_update
+        AFTER UPDATE OF status, pet_id ON adoption_requests
+        BEGIN
+            UPDATE pets SET request_count = request_count - 1,
+                            approved_count = approved_count - (OLD.status IS 'approved'),
+                            pending_count = pending_count - (OLD.status IS 'pending')
+            WHERE id = OLD.pet_id;
+            UPDATE owner_request_stats SET request_count = request_count - 1
+            WHERE owner_id = (SELECT owner_id FROM pets WHERE id = OLD.pet_id) AND status = OLD.status;
+            UPDATE pets SET request_count = request_count + 1,
+                            approved_count = approved_count + (NEW.status IS 'approved'),
+                            pending_count = pending_count + (NEW.status IS 'pending')
+            WHERE id = NEW.pet_id;
+            INSERT INTO owner_request_stats (owner_id, status, request_count)
+            SELECT owner_id, NEW.status, 1 FROM pets WHERE id = NEW.pet_id
+            ON CONFLICT (owner_id, status) DO UPDATE SET request_count = request_count + 1;
+        END
+    ''')
+
+@migration(8)
+def add_owner_request_daily(conn):
+    # Per-owner, per-day request buckets behind the analytics time series.
+    # Requests are bucketed by the day they were created; approved_count is
+    # how many of that day's requests are currently approved.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS owner_request_daily (
+            owner_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            request_count INTEGER NOT NULL DEFAULT 0,
+            approved_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (owner_id, day)
+        )
+    ''')
+    rebuild_owner_stats(conn, ('owner_request_daily',))
+    
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_daily_request_insert AFTER INSERT ON adoption_requests
+        BEGIN
+            INSERT INTO owner_request_daily (owner_id, day, request_count, approved_count)
+            SELECT owner_id, date(NEW.created_at), 1, NEW.status IS 'approved'
+            FROM pets WHERE id = NEW.pet_id
+            ON CONFLICT (owner_id, day) DO UPDATE
+            SET request_count = request_count + 1,
+                approved_count = approved_count + excluded.approved_count;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_daily_request_delete AFTER DELETE ON adoption_requests
+        BEGIN
+            UPDATE owner_request_daily
+            SET request_count = request_count - 1,
+                approved_count = approved_count - (OLD.status IS 'approved')
+            WHERE owner_id = (SELECT owner_id FROM pets WHERE id = OLD.pet_id)
+              AND day = date(OLD.created_at);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_daily_request_update
+        AFTER UPDATE OF status, pet_id, created_at ON adoption_requests
+        BEGIN
+            UPDATE owner_request_daily
+            SET request_count = request_count - 1,
+                approved_count = approved_count - (OLD.status IS 'approved')
+            WHERE owner_id = (SELECT owner_id FROM pets WHERE id = OLD.pet_id)
+              AND day = date(OLD.created_at);
+            INSERT INTO owner_request_daily (owner_id, day, request_count, approved_count)
+            SELECT owner_id, date(NEW.created_at), 1, NEW.status IS 'approved'
+            FROM pets WHERE id = NEW.pet_id
+            ON CONFLICT (owner_id, day) DO UPDATE
+            SET request_count = request_count + 1,
+                approved_count = approved_count + excluded.approved_count;
+        END
+    ''')
+    # A deleted pet's requests leave its owner's buckets; a re-homed pet's move with it
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_daily_pet_delete AFTER DELETE ON pets
+        BEGIN
+            UPDATE owner_request_daily
+            SET request_count = request_count - (
+                    SELECT COUNT(*) FROM adoption_requests
+                    WHERE pet_id = OLD.id AND date(created_at) = owner_request_daily.day),
+                approved_count = approved_count - (
+                    SELECT COUNT(*) FROM adoption_requests
+                    WHERE pet_id = OLD.id AND status = 'approved' AND date(created_at) = owner_request_daily.day)
+            WHERE owner_id = OLD.owner_id
+              AND day IN (SELECT date(created_at) FROM adoption_requests WHERE pet_id = OLD.id);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS owner_daily_pet_owner_change
+        AFTER UPDATE OF owner_id ON pets WHEN NEW.owner_id IS NOT OLD.owner_id
+        BEGIN
+            UPDATE owner_request_daily
+            SET request_count = request_count - (
+                    SELECT COUNT(*) FROM adoption_requests
+                    WHERE pet_id = OLD.id AND date(created_at) = owner_request_daily.day),
+                approved_count = approved_count - (
+                    SELECT COUNT(*) FROM adoption_requests
+                    WHERE pet_id = OLD.id AND status = 'approved' AND date(created_at) = owner_request_daily.day)
+            WHERE owner_id = OLD.owner_id
+              AND day IN (SELECT date(created_at) FROM adoption_requests WHERE pet_id = OLD.id);
+            INSERT INTO owner_request_daily (owner_id, day, request_count, approved_count)
+            SELECT NEW.owner_id, date(created_at), COUNT(*), SUM(status IS 'approved')
+            FROM adoption_requests
+            WHERE pet_id = NEW.id
+            GROUP BY date(created_at)
+            ON CONFLICT (owner_id, day) DO UPDATE
+            SET request_count = request_count + excluded.request_count,
+                approved_count = approved_count + excluded.approved_count;
+        END
+    ''')
+
+DEFAULT_CATEGORIES = ('Dogs', 'Cats', 'Birds', 'Others')
+
+@migration(9)
+def add_default_categories(conn):
+    # Reference data the listings and pet forms rely on; created once with the schema
+    conn.executemany('INSERT OR IGNORE INTO categories (name) VALUES (?)',
+                     [(name,) for name in DEFAULT_CATEGORIES])
+
+@migration(10)
+def add_request_uniqueness_and_idempotency_keys(conn):
+    # One request per user and pet. Keep the copy that got furthest
+    # (approved, then pending, then the oldest) before adding the constraint
+    conn.execute('''
+        DELETE FROM adoption_requests WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_id, pet_id
+                    ORDER BY status = 'approved' DESC, status = 'pending' DESC, id
+                ) as copy
+                FROM adoption_requests
             )
-        ''')
-        
-        # Create Pet Likes table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pet_likes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pet_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(pet_id, user_id),
-                FOREIGN KEY(pet_id) REFERENCES pets(id) ON DELETE CASCADE,
-                FOREIGN KEY(user_id) REFERENCES users(id)
+            WHERE copy > 1
+        )
+    ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_adoption_requests_user_pet ON adoption_requests (user_id, pet_id)')
+    # Responses of POSTs sent with an Idempotency-Key header, replayed on retries
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            user_id INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            response TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, key)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created ON idempotency_keys (created_at)')
+
+def bump_version(scope, source='WHERE true'):
+    """Trigger statement that bumps the change version of scope (a SQL expression over source)."""
+    return f'''
+            INSERT INTO change_versions (scope) SELECT {scope} {source}
+            ON CONFLICT (scope) DO UPDATE SET version = version + 1, changed_at = CURRENT_TIMESTAMP;'''
+
+@migration(11)
+def add_change_versions(conn):
+    # Change versions behind the HTTP validators of the read pages: 'pets'
+    # (every pet listing), 'pet:<id>', 'care' (the forum index),
+    # 'care_post:<id>' and 'users' (author names on the forum)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_versions (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 1,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("INSERT OR IGNORE INTO change_versions (scope) VALUES ('pets'), ('care'), ('users')")
+    conn.execute('''
+        INSERT OR IGNORE INTO change_versions (scope, changed_at)
+        SELECT 'pet:' || id, COALESCE(created_at, CURRENT_TIMESTAMP) FROM pets
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO change_versions (scope, changed_at)
+        SELECT 'care_post:' || id, COALESCE(created_at, CURRENT_TIMESTAMP) FROM care_posts
+    ''')
+    
+    # Only columns the pages show; request counters don't change any page
+    pet_columns = ('name, category_id, breed, age, health_details, medical_details, '
+                   'adoption_status, image_url, owner_id, created_at, like_count')
+    triggers = [
+        ('change_pet_insert', 'AFTER INSERT ON pets', [("'pets'",), ("'pet:' || NEW.id",)]),
+        ('change_pet_update', f'AFTER UPDATE OF {pet_columns} ON pets', [("'pets'",), ("'pet:' || NEW.id",)]),
+        ('change_pet_delete', 'AFTER DELETE ON pets', [("'pets'",), ("'pet:' || OLD.id",)]),
+        ('change_category_insert', 'AFTER INSERT ON categories', [("'pets'",)]),
+        ('change_category_update', 'AFTER UPDATE OF name ON categories',
+         [("'pets'",), ("'pet:' || id", 'FROM pets WHERE category_id = NEW.id')]),
+        ('change_category_delete', 'AFTER DELETE ON categories', [("'pets'",)]),
+        # Pet pages show the owner's name and contact
+        ('change_owner_update', 'AFTER UPDATE OF name, contact ON owners',
+         [("'pet:' || id", 'FROM pets WHERE owner_id = NEW.id')]),
+        ('change_care_post_insert', 'AFTER INSERT ON care_posts', [("'care'",), ("'care_post:' || NEW.id",)]),
+        ('change_care_post_update', 'AFTER UPDATE ON care_posts', [("'care'",), ("'care_post:' || NEW.id",)]),
+        ('change_care_post_delete', 'AFTER DELETE ON care_posts', [("'care'",), ("'care_post:' || OLD.id",)]),
+        ('change_care_comment_insert', 'AFTER INSERT ON care_comments',
+         [("'care'",), ("'care_post:' || NEW.post_id",)]),
+        ('change_care_comment_update', 'AFTER UPDATE ON care_comments',
+         [("'care'",), ("'care_post:' || NEW.post_id",)]),
+        ('change_care_comment_delete', 'AFTER DELETE ON care_comments',
+         [("'care'",), ("'care_post:' || OLD.post_id",)]),
+        ('change_user_update', 'AFTER UPDATE OF name ON users', [("'users'",)]),
+        ('change_user_delete', 'AFTER DELETE ON users', [("'users'",)]),
+    ]
+    for name, event, bumps in triggers:
+        body = ''.join(bump_version(*bump) for bump in bumps)
+        conn.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {event}\n        BEGIN{body}\n        END')
+
+@migration(12)
+def add_care_comment_count(conn):
+    # Denormalized comment counter so the forum index doesn't count comments per post
+    conn.execute('ALTER TABLE care_posts ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0')
+    conn.execute('''
+        UPDATE care_posts SET comment_count = (SELECT COUNT(*) FROM care_comments WHERE post_id = care_posts.id)
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS care_comments_count_insert AFTER INSERT ON care_comments
+        BEGIN
+            UPDATE care_posts SET comment_count = comment_count + 1 WHERE id = NEW.post_id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS care_comments_count_delete AFTER DELETE ON care_comments
+        BEGIN
+            UPDATE care_posts SET comment_count = comment_count - 1 WHERE id = OLD.post_id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS care_comments_count_move
+        AFTER UPDATE OF post_id ON care_comments WHEN NEW.post_id IS NOT OLD.post_id
+        BEGIN
+            UPDATE care_posts SET comment_count = comment_count - 1 WHERE id = OLD.post_id;
+            UPDATE care_posts SET comment_count = comment_count + 1 WHERE id = NEW.post_id;
+        END
+    ''')
+    # Threads are read in id order, a page (or the comments since the last one seen) at a time
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_care_comments_post_id ON care_comments (post_id, id)')
+
+@migration(13)
+def add_owner_events(conn):
+    # What changed on each owner's dashboard, streamed to it by /owner-events.
+    # AUTOINCREMENT keeps ids increasing even after old events are pruned, so
+    # a reconnecting client's Last-Event-ID never points past a reused id.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS owner_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            owner_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            subject_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_owner_events_owner ON owner_events (owner_id, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_owner_events_created ON owner_events (created_at)')
+
+@migration(14)
+def add_request_owner(conn):
+    # The requested pet's owner, copied onto each request so the dashboard can
+    # page through an owner's requests (newest first, optionally by status)
+    # straight from an index instead of sorting all of them
+    conn.execute('ALTER TABLE adoption_requests ADD COLUMN owner_id INTEGER')
+    conn.execute('''
+        UPDATE adoption_requests
+        SET owner_id = (SELECT owner_id FROM pets WHERE id = adoption_requests.pet_id)
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_adoption_requests_owner ON adoption_requests (owner_id, created_at)')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adoption_requests_owner_status
+        ON adoption_requests (owner_id, status, created_at)
+    ''')
+    # The dashboard's pets list filtered by status
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_pets_owner_status_created ON pets (owner_id, adoption_status, created_at)')
+    # Without statistics for the new indexes, a database analyzed before would
+    # have the unfiltered pets list read through idx_pets_owner_status_created
+    # and sorted, instead of walking idx_pets_owner_created
+    for index in ('idx_adoption_requests_owner', 'idx_adoption_requests_owner_status', 'idx_pets_owner_status_created'):
+        conn.execute(f'ANALYZE {index}')
+
+    # request_adoption sets owner_id itself; anything else gets it from the pet
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS request_owner_insert AFTER INSERT ON adoption_requests
+        WHEN NEW.owner_id IS NULL
+        BEGIN
+            UPDATE adoption_requests SET owner_id = (SELECT owner_id FROM pets WHERE id = NEW.pet_id)
+            WHERE id = NEW.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS request_owner_update AFTER UPDATE OF pet_id ON adoption_requests
+        BEGIN
+            UPDATE adoption_requests SET owner_id = (SELECT owner_id FROM pets WHERE id = NEW.pet_id)
+            WHERE id = NEW.id;
+        END
+    ''')
+
+@migration(15)
+def follow_pet_owner_change(conn):
+    # A pet moved to another owner takes its requests along, as the rollups'
+    # owner_stats_pet_owner_change / owner_daily_pet_owner_change do
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS request_owner_pet_owner_change
+        AFTER UPDATE OF owner_id ON pets WHEN NEW.owner_id IS NOT OLD.owner_id
+        BEGIN
+            UPDATE adoption_requests SET owner_id = NEW.owner_id WHERE pet_id = NEW.id;
+        END
+    ''')
+    # Requests of pets that changed owner before this trigger existed
+    conn.execute(REQUEST_OWNER_REPAIR_SQL)
+
+# Owner analytics rollups: table -> (key columns, count columns, recount query).
+# Triggers keep them current; rebuild_owner_stats() recomputes them from scratch.
+OWNER_ROLLUPS = {
+    'owner_pet_stats': ('owner_id, adoption_status', ('pet_count',), '''
+        SELECT owner_id, adoption_status, COUNT(*) FROM pets
+        GROUP BY owner_id, adoption_status
+    '''),
+    'owner_category_stats': ('owner_id, category_id', ('pet_count',), '''
+        SELECT owner_id, category_id, COUNT(*) FROM pets
+        GROUP BY owner_id, category_id
+    '''),
+    'owner_request_stats': ('owner_id, status', ('request_count',), '''
+        SELECT p.owner_id, ar.status, COUNT(*) FROM adoption_requests ar
+        JOIN pets p ON p.id = ar.pet_id
+        GROUP BY p.owner_id, ar.status
+    '''),
+    'owner_request_daily': ('owner_id, day', ('request_count', 'approved_count'), '''
+        SELECT p.owner_id, date(ar.created_at), COUNT(*), SUM(ar.status IS 'approved')
+        FROM adoption_requests ar
+        JOIN pets p ON p.id = ar.pet_id
+        GROUP BY p.owner_id, date(ar.created_at)
+    '''),
+}
+
+# Per-pet request counters as recounted from adoption_requests
+PET_REQUEST_RECOUNT = {
+    'request_count': 'SELECT COUNT(*) FROM adoption_requests WHERE pet_id = pets.id',
+    'approved_count': "SELECT COUNT(*) FROM adoption_requests WHERE pet_id = pets.id AND status = 'approved'",
+    'pending_count': "SELECT COUNT(*) FROM adoption_requests WHERE pet_id = pets.id AND status = 'pending'",
+}
+
+# adoption_requests.owner_id, copied from the pet (migrations 14 and 15)
+REQUEST_OWNER_DRIFT_SQL = '''
+    SELECT COUNT(*) FROM adoption_requests ar
+    JOIN pets p ON p.id = ar.pet_id
+    WHERE ar.owner_id IS NOT p.owner_id
+'''
+REQUEST_OWNER_REPAIR_SQL = '''
+    UPDATE adoption_requests
+    SET owner_id = (SELECT owner_id FROM pets WHERE id = adoption_requests.pet_id)
+    WHERE owner_id IS NOT (SELECT owner_id FROM pets WHERE id = adoption_requests.pet_id)
+'''
+
+def rebuild_owner_stats(conn, tables=None):
+    """Recompute the owner rollups (all, or just tables) and per-pet request counters from the raw rows.
+
+    A full rebuild also repairs adoption_requests.owner_id.
+    """
+    conn.execute('UPDATE pets SET ' + ', '.join(
+        f'{column} = ({recount})' for column, recount in PET_REQUEST_RECOUNT.items()
+    ))
+    if tables is None:
+        # Earlier migrations rebuild some rollups before this column exists
+        conn.execute(REQUEST_OWNER_REPAIR_SQL)
+    for table, (keys, counts, recount) in OWNER_ROLLUPS.items():
+        if tables is not None and table not in tables:
+            continue
+        conn.execute(f'DELETE FROM {table}')
+        conn.execute(f"INSERT INTO {table} ({keys}, {', '.join(counts)}) {recount}")
+
+def check_owner_stats(conn):
+    """Return {rollup name: number of drifted rows} for rollups that disagree with a recount."""
+    drift = {}
+    for table, (keys, counts, recount) in OWNER_ROLLUPS.items():
+        # Triggers leave emptied buckets at zero; a recount doesn't produce them
+        nonzero = ' OR '.join(f'{count} != 0' for count in counts)
+        stored = f"SELECT {keys}, {', '.join(counts)} FROM {table} WHERE {nonzero}"
+        drifted = conn.execute(f'''
+            SELECT COUNT(*) FROM (
+                SELECT * FROM ({recount} EXCEPT {stored})
+                UNION ALL
+                SELECT * FROM ({stored} EXCEPT {recount})
             )
-        ''')
-        
-        # Insert default categories
-        categories = ['Dogs', 'Cats', 'Birds', 'Others']
-        for category in categories:
-            cursor.execute('INSERT OR IGNORE INTO categories (name) VALUES (?)', (category,))
-        
-        # Insert default owner
-        default_owner_password = hashlib.sha256('admin123'.encode()).hexdigest()
-        cursor.execute('''
-            INSERT OR IGNORE INTO owners (name, email, password, contact) 
-            VALUES (?, ?, ?, ?)
-        ''', ('Admin Owner', 'admin@petlink.com', default_owner_password, '+1234567890'))
-        
-        # Insert sample pets
-        sample_pets = [
-            ('Buddy', 1, 'Golden Retriever', 3, 'Healthy and energetic', 'Vaccinated, neutered', 'available', 'https://images.unsplash.com/photo-1552053831-71594a27632d?w=400', 1),
-            ('Luna', 2, 'Persian', 2, 'Calm and friendly', 'Vaccinated, spayed', 'available', 'https://images.unsplash.com/photo-1514888286974-6c03e2ca1dba?w=400', 1),
-            ('Max', 1, 'German Shepherd', 4, 'Well-trained guard dog', 'All vaccinations up to date', 'available', 'https://images.unsplash.com/photo-1589941013453-ec89f33b5e95?w=400', 1),
-            ('Whiskers', 2, 'Maine Coon', 1, 'Playful kitten', 'First vaccinations done', 'available', 'https://images.unsplash.com/photo-1573865526739-10659fec78a5?w=400', 1),
-            ('Charlie', 3, 'Cockatiel', 2, 'Loves to sing', 'Healthy, no medical issues', 'available', 'https://images.unsplash.com/photo-1452570053594-1b985d6ea890?w=400', 1),
-            ('Bella', 1, 'Labrador', 5, 'Great with kids', 'Vaccinated, microchipped', 'available', 'https://images.unsplash.com/photo-1518717758536-85ae29035b6d?w=400', 1),
-            ('Mittens', 2, 'Siamese', 3, 'Independent but loving', 'Vaccinated, spayed', 'available', 'https://images.unsplash.com/photo-1596854407944-bf87f6fdd49e?w=400', 1),
-            ('Rocky', 1, 'Bulldog', 6, 'Gentle giant', 'Regular health checkups', 'available', 'https://images.unsplash.com/photo-1583337130417-3346a1be7dee?w=400', 1),
-            ('Tweety', 3, 'Canary', 1, 'Beautiful singer', 'Healthy and active', 'available', 'https://images.unsplash.com/photo-1444464666168-49d633b86797?w=400', 1),
-            ('Shadow', 4, 'Rabbit', 2, 'Quiet and gentle', 'Vaccinated, litter trained', 'available', 'https://images.unsplash.com/photo-1585110396000-c9ffd4e4b308?w=400', 1)
-        ]
-        
-        for pet in sample_pets:
-            cursor.execute('''
-                INSERT OR IGNORE INTO pets (name, category_id, breed, age, health_details, medical_details, adoption_status, image_url, owner_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', pet)
+        ''').fetchone()[0]
+        if drifted:
+            drift[table] = drifted
+    drifted = conn.execute('SELECT COUNT(*) FROM pets WHERE ' + ' OR '.join(
+        f'{column} != ({recount})' for column, recount in PET_REQUEST_RECOUNT.items()
+    )).fetchone()[0]
+    if drifted:
+        drift['pets.request_count'] = drifted
+    drifted = conn.execute(REQUEST_OWNER_DRIFT_SQL).fetchone()[0]
+    if drifted:
+        drift['adoption_requests.owner_id'] = drifted
+    return drift
+
+def migrate(conn):
+    """Apply pending migrations and return the resulting schema version."""
+    current = conn.execute('PRAGMA user_version').fetchone()[0]
+    for version, apply in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        # Another process may have applied it while we waited for the write lock
+        current = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version <= current:
+            conn.rollback()
+            continue
+        try:
+            apply(conn)
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = version
+    return current
+
+# Hot queries checked by `flask check-query-plans`: (name, sql, params, tables
+# allowed to be scanned). Small lookup tables such as categories may be
+# scanned; everything else must be reached through an index. Keep these in
+# step with the route queries they mirror.
+HOT_QUERIES = [
+    ('home_available_pets', '''
+        SELECT p.*, c.name as category_name
+        FROM pets p
+        JOIN categories c ON p.category_id = c.id
+        WHERE p.adoption_status = "available"
+        LIMIT 6
+    ''', (), ('c',)),
+    ('pet_detail', '''
+        SELECT p.*, c.name as category_name, o.name as owner_name, o.contact as owner_contact
+        FROM pets p
+        JOIN categories c ON p.category_id = c.id
+        LEFT JOIN owners o ON p.owner_id = o.id
+        WHERE p.id = ?
+    ''', (1,), ()),
+    ('liked_pet_ids', '''
+        SELECT pet_id FROM pet_likes WHERE user_id = ? AND pet_id IN (?, ?, ?)
+    ''', (1, 1, 2, 3), ()),
+    ('user_requests', '''
+        SELECT ar.*, p.name as pet_name, p.breed, c.name as category_name
+        FROM adoption_requests ar
+        JOIN pets p ON ar.pet_id = p.id
+        JOIN categories c ON p.category_id = c.id
+        WHERE ar.user_id = ?
+        ORDER BY ar.created_at DESC
+    ''', (1,), ()),
+    ('existing_request', '''
+        SELECT * FROM adoption_requests WHERE user_id = ? AND pet_id = ?
+    ''', (1, 1), ()),
+    ('pet_like_count', '''
+        SELECT like_count FROM pets WHERE id = ?
+    ''', (1,), ()),
+]
+
+def find_full_scans(conn):
+    """Return (query name, plan line) for every hot query that scans a table without an index."""
+    problems = []
+    for name, sql, params, allowed in HOT_QUERIES:
+        for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params):
+            detail = row[3]
+            if not detail.startswith('SCAN '):
+                continue
+            words = detail.split()
+            table = words[1]
+            # "(subquery-N)" is an already-filtered intermediate result, not a table
+            if 'INDEX' in words or table in allowed or table.startswith('('):
+                continue
+            problems.append((name, detail))
+    return problems
+
+# Database initialization
+def schema_is_current(conn):
+    """True when the schema version and journal mode are already what this code expects."""
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+    return version >= MIGRATIONS[-1][0] and journal_mode.lower() == app.config['DB_JOURNAL_MODE'].lower()
+
+def init_db():
+    """Bring the schema up to date. Only reads when it is already current, so
+    any number of workers can call this at startup without taking the write lock."""
+    try:
+        conn = sqlite3.connect(app.config['DATABASE'])
+        if schema_is_current(conn):
+            conn.close()
+            return
+        conn.execute(f"PRAGMA journal_mode = {app.config['DB_JOURNAL_MODE']}")
         
-        conn.commit()
+        # Create or upgrade the schema
+        version = migrate(conn)
         conn.close()
-        print("Database initialized successfully!")
+        print(f"Database initialized successfully (schema version {version})!")
         
     except Exception as e:
         print(f"Database initialization error: {e}")
 
+# Demo data loaded by `flask seed`: the default owner account and its sample pets
+DEMO_OWNER = ('Admin Owner', 'admin@petlink.com', 'admin123', '+1234567890')
+DEMO_PETS = [
+    ('Buddy', 'Dogs', 'Golden Retriever', 3, 'Healthy and energetic', 'Vaccinated, neutered', 'available', 'https://images.unsplash.com/photo-1552053831-71594a27632d?w=400'),
+    ('Luna', 'Cats', 'Persian', 2, 'Calm and friendly', 'Vaccinated, spayed', 'available', 'https://images.unsplash.com/photo-1514888286974-6c03e2ca1dba?w=400'),
+    ('Max', 'Dogs', 'German Shepherd', 4, 'Well-trained guard dog', 'All vaccinations up to date', 'available', 'https://images.unsplash.com/photo-1589941013453-ec89f33b5e95?w=400'),
+    ('Whiskers', 'Cats', 'Maine Coon', 1, 'Playful kitten', 'First vaccinations done', 'available', 'https://images.unsplash.com/photo-1573865526739-10659fec78a5?w=400'),
+    ('Charlie', 'Birds', 'Cockatiel', 2, 'Loves to sing', 'Healthy, no medical issues', 'available', 'https://images.unsplash.com/photo-1452570053594-1b985d6ea890?w=400'),
+    ('Bella', 'Dogs', 'Labrador', 5, 'Great with kids', 'Vaccinated, microchipped', 'available', 'https://images.unsplash.com/photo-1518717758536-85ae29035b6d?w=400'),
+    ('Mittens', 'Cats', 'Siamese', 3, 'Independent but loving', 'Vaccinated, spayed', 'available', 'https://images.unsplash.com/photo-1596854407944-bf87f6fdd49e?w=400'),
+    ('Rocky', 'Dogs', 'Bulldog', 6, 'Gentle giant', 'Regular health checkups', 'available', 'https://images.unsplash.com/photo-1583337130417-3346a1be7dee?w=400'),
+    ('Tweety', 'Birds', 'Canary', 1, 'Beautiful singer', 'Healthy and active', 'available', 'https://images.unsplash.com/photo-1444464666168-49d633b86797?w=400'),
+    ('Shadow', 'Others', 'Rabbit', 2, 'Quiet and gentle', 'Vaccinated, litter trained', 'available', 'https://images.unsplash.com/photo-1585110396000-c9ffd4e4b308?w=400')
+]
+
+# Extra copies of a demo owner's pets (same name and breed as an older row)
+# that no request or like refers to; older versions re-inserted them on every start
+DEMO_DUPLICATES_SQL = '''
+    SELECT p.id, p.name, p.breed
+    FROM pets p
+    WHERE p.owner_id = ?
+      AND EXISTS (SELECT 1 FROM pets o
+                  WHERE o.owner_id = p.owner_id AND o.name = p.name AND o.breed = p.breed AND o.id < p.id)
+      AND NOT EXISTS (SELECT 1 FROM adoption_requests WHERE pet_id = p.id)
+      AND NOT EXISTS (SELECT 1 FROM pet_likes WHERE pet_id = p.id)
+'''
+
+def seed_db(conn, sample_pets=True, remove_duplicates=False):
+    """Load the demo owner and sample pets; returns (rows added, duplicates removed).
+
+    Safe to run any number of times: only missing rows are inserted, and when
+    everything is already there it returns without opening a write transaction.
+    """
+    name, email, password, contact = DEMO_OWNER
+    demo_keys = {(pet[0], pet[2]) for pet in DEMO_PETS}
+    owner = conn.execute('SELECT id FROM owners WHERE email = ?', (email,)).fetchone()
+    missing = list(DEMO_PETS) if sample_pets else []
+    duplicates = []
+    if owner:
+        existing = set(conn.execute('SELECT name, breed FROM pets WHERE owner_id = ?', (owner[0],)).fetchall())
+        missing = [pet for pet in missing if (pet[0], pet[2]) not in existing]
+        if remove_duplicates:
+            duplicates = [row[0] for row in conn.execute(DEMO_DUPLICATES_SQL, (owner[0],))
+                          if (row[1], row[2]) in demo_keys]
+    if owner and not missing and not duplicates:
+        return 0, 0
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        cursor = conn.execute('''
+            INSERT OR IGNORE INTO owners (name, email, password, contact)
+            VALUES (?, ?, ?, ?)
+        ''', (name, email, hash_password(password), contact))
+        added = cursor.rowcount
+        owner_id = conn.execute('SELECT id FROM owners WHERE email = ?', (email,)).fetchone()[0]
+        # NOT EXISTS keeps this idempotent even if another seed ran since the check above
+        for pet in missing:
+            cursor = conn.execute('''
+                INSERT INTO pets (name, category_id, breed, age, health_details, medical_details, adoption_status, image_url, owner_id)
+                SELECT ?, c.id, ?, ?, ?, ?, ?, ?, ?
+                FROM categories c
+                WHERE c.name = ?
+                  AND NOT EXISTS (SELECT 1 FROM pets WHERE owner_id = ? AND name = ? AND breed = ?)
+            ''', (pet[0], *pet[2:], owner_id, pet[1], owner_id, pet[0], pet[2]))
+            added += cursor.rowcount
+        removed = 0
+        for pet_id in duplicates:
+            removed += conn.execute('DELETE FROM pets WHERE id = ?', (pet_id,)).rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return added, removed
+
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
+# Metrics (Prometheus text format, see /metrics)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Histogram:
+    """Prometheus histogram with one series per combination of label values."""
+
+    def __init__(self, name, help_text, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # One counter per bucket, then sum and count
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((values, list(series)) for values, series in self._series.items())
+        for values, series in items:
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-2] + series[-1:]):
+                labels = prometheus_labels(self.labels, values, [('le', bound)])
+                lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = prometheus_labels(self.labels, values)
+            lines.append(f'{self.name}_sum{labels} {series[-2]}')
+            lines.append(f'{self.name}_count{labels} {series[-1]}')
+        return lines
+
+class Counter:
+    """Prometheus counter with one value per combination of label values."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = collections.Counter()
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            lines.append(f'{self.name}{prometheus_labels(self.labels, values)} {value}')
+        return lines
+
+REQUEST_SECONDS = Histogram('petlink_request_duration_seconds',
+                            'Request latency by endpoint', ('endpoint', 'method', 'status'))
+REQUEST_SQL_STATEMENTS = Histogram('petlink_request_sql_statements',
+                                   'SQL statements executed per request', ('endpoint',), STATEMENT_BUCKETS)
+REQUEST_SQL_SECONDS = Histogram('petlink_request_sql_seconds',
+                                'Time spent in SQLite per request', ('endpoint',))
+TEMPLATE_SECONDS = Histogram('petlink_template_render_seconds',
+                             'Template render time', ('template',))
+SLOW_QUERIES = Counter('petlink_slow_queries_total', 'Statements slower than SLOW_QUERY_MS', ('endpoint',))
+slow_query_log = collections.deque(maxlen=app.config['SLOW_QUERY_LOG_SIZE'])
+
+def normalize_sql(sql):
+    """Collapse whitespace and replace literals with ? so equal statements group together."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    return ' '.join(sql.split())
+
+def params_shape(params):
+    """Describe bound parameters by type only, so the slow log never records user data."""
+    if params is None:
+        return 'executemany'
+    if isinstance(params, dict):
+        return {name: type(value).__name__ for name, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+def current_endpoint():
+    if request and request.url_rule is not None:
+        return request.url_rule.rule
+    return 'unmatched'
+
+def log_slow_query(conn, sql, params, elapsed):
+    plan = []
+    if params is not None and sql.lstrip().split(None, 1)[0].upper() in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE'):
+        try:
+            # A plain cursor, so the EXPLAIN itself isn't traced
+            plan = [row[3] for row in sqlite3.Cursor(conn).execute('EXPLAIN QUERY PLAN ' + sql, params)]
+        except sqlite3.Error as e:
+            plan = [f'EXPLAIN failed: {e}']
+    endpoint = current_endpoint() if has_app_context() and 'request_started' in g else 'none'
+    entry = {
+        'endpoint': endpoint,
+        'ms': round(elapsed * 1000, 2),
+        'sql': normalize_sql(sql),
+        'params': params_shape(params),
+        'plan': plan,
+        'at': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+    slow_query_log.append(entry)
+    SLOW_QUERIES.inc(endpoint)
+    app.logger.warning('Slow query (%.1f ms) on %s: %s params=%s plan=%s',
+                       entry['ms'], endpoint, entry['sql'], entry['params'], ' | '.join(plan))
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that times execute and fetch calls.
+
+    Time is added to the current request's SQL total; a statement whose
+    execute plus fetches exceed SLOW_QUERY_MS is written to the slow-query log.
+    """
+
+    _sql = None
+    _params = None
+    _elapsed = 0.0
+    _logged = True
+
+    def execute(self, sql, parameters=()):
+        self._start_statement(sql, parameters)
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start_statement(sql, None)
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._timed(super().fetchall)
+
+    def __next__(self):
+        return self._timed(super().__next__)
+
+    def _start_statement(self, sql, params):
+        self._sql, self._params, self._elapsed, self._logged = sql, params, 0.0, False
+        stats = g.get('sql_stats') if has_app_context() else None
+        if stats is not None:
+            stats['statements'] += 1
+
+    def _timed(self, call, *args):
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._elapsed += elapsed
+            stats = g.get('sql_stats') if has_app_context() else None
+            if stats is not None:
+                stats['seconds'] += elapsed
+            if not self._logged and self._elapsed * 1000 >= app.config['SLOW_QUERY_MS']:
+                self._logged = True
+                log_slow_query(self.connection, self._sql, self._params, self._elapsed)
+
+class TracedConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements run through TracedCursor."""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            stats = g.get('sql_stats') if has_app_context() else None
+            if stats is not None:
+                stats['seconds'] += time.perf_counter() - start
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections shared by all request threads.
+
+    Idle connections are reused most-recently-used first. When every
+    connection is checked out, callers queue up and are handed connections
+    in arrival order so no request thread starves.
+    """
+
+    def __init__(self, database, size=8, timeout=10.0, pragmas=None, statement_cache_size=256,
+                 factory=sqlite3.Connection):
+        self.database = database
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = dict(pragmas or {})
+        self.statement_cache_size = statement_cache_size
+        self._idle = []
+        self._waiters = collections.deque()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, check_same_thread=False, factory=self.factory,
+                               cached_statements=self.statement_cache_size)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            if self._opened < self.size:
+                self._opened += 1
+                self.misses += 1
+                waiter = None
+            else:
+                self.waits += 1
+                waiter = [threading.Event(), None]
+                self._waiters.append(waiter)
+
+        if waiter is None:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        # Pool exhausted: wait for another request to hand over its connection
+        waiter[0].wait(self.timeout)
+        with self._lock:
+            if waiter[1] is None:
+                self._waiters.remove(waiter)
+                self.timeouts += 1
+                raise RuntimeError('Timed out waiting for a database connection')
+        return waiter[1]
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Broken connection: drop it so a fresh one is opened next time
+            self.discard(conn)
+            return
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter[1] = conn
+                waiter[0].set()
+            else:
+                self._idle.append(conn)
+
+    def discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+            waiter = self._waiters.popleft() if self._waiters else None
+            if waiter is not None:
+                self._opened += 1
+        if waiter is not None:
+            # Replace the dropped connection for the oldest waiting request
+            try:
+                waiter[1] = self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                    self._waiters.appendleft(waiter)
+                return
+            waiter[0].set()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._opened,
+                'idle': len(self._idle),
+                'in_use': self._opened - len(self._idle),
+                'waiting': len(self._waiters),
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'timeouts': self.timeouts
+            }
+
+_pool_lock = threading.Lock()
+
+def get_pool():
+    pool = app.extensions.get('db_pool')
+    if pool is None:
+        with _pool_lock:
+            pool = app.extensions.get('db_pool')
+            if pool is None:
+                pool = ConnectionPool(
+                    app.config['DATABASE'],
+                    size=app.config['DB_POOL_SIZE'],
+                    timeout=app.config['DB_POOL_TIMEOUT'],
+                    pragmas=app.config['DB_PRAGMAS'],
+                    statement_cache_size=app.config['DB_STATEMENT_CACHE_SIZE'],
+                    factory=TracedConnection if app.config['METRICS_ENABLED'] else sqlite3.Connection
+                )
+                app.extensions['db_pool'] = pool
+    return pool
+
 def get_db_connection():
-    conn = sqlite3.connect('petlink.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return this app context's pooled connection, checking one out on first use."""
+    if 'db_conn' not in g:
+        g.db_conn = get_pool().acquire()
+    return g.db_conn
+
+def close_pool():
+    pool = app.extensions.pop('db_pool', None)
+    if pool is not None:
+        pool.close_all()
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        get_pool().release(conn)
+
+def is_busy_error(error):
+    message = str(error).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+def run_write(work):
+    """Run work(conn) in an IMMEDIATE transaction and commit it.
+
+    The write lock is taken up front so SQLite's busy_timeout applies; if the
+    database is still busy the whole transaction is retried with bounded,
+    jittered exponential backoff.
+    """
+    conn = get_db_connection()
+    retries = app.config['DB_BUSY_RETRIES']
+    for attempt in range(retries + 1):
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            result = work(conn)
+            conn.commit()
+            return result
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.rollback()
+            if not is_busy_error(e) or attempt == retries:
+                raise
+            delay = min(app.config['DB_BUSY_BACKOFF'] * (2 ** attempt), app.config['DB_BUSY_BACKOFF_MAX'])
+            time.sleep(delay * random.uniform(0.5, 1.0))
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+# Search ranking weights for bm25(): name, breed, health, medical, category
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 1.0, 3.0)
+# Highlight markers (char(2) / char(3) in SQL); swapped for <mark> tags
+# after the text is HTML-escaped
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+def fts_query(text):
+    """Turn free text into an FTS5 query that prefix-matches every word."""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+def highlight_html(text):
+    if not text:
+        return ''
+    return html.escape(text).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+# Keyset pagination page sizes
+ADOPT_PAGE_SIZE = 24
+SEARCH_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(*values):
+    """Pack the sort key of the last row on a page into an opaque URL-safe token."""
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token, kind, length):
+    """Unpack a cursor made by encode_cursor(kind, ...); raise ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(values, list) or len(values) != length + 1 or values[0] != kind:
+        raise ValueError('Invalid cursor')
+    return values[1:]
+
+def page_size_arg(default):
+    size = request.args.get('limit', default, type=int)
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+# Pet listing filters and their predicates, in the fixed order they are
+# emitted. Any combination of filters therefore maps to exactly one SQL
+# string, which keeps the number of distinct prepared statements small.
+PET_FILTERS = (
+    ('text', 'pets_fts MATCH ?'),
+    ('category', 'c.name = ?'),
+    ('status', 'p.adoption_status = ?'),
+    ('owner', 'p.owner_id = ?'),
+    ('min_age', 'p.age >= ?'),
+    ('max_age', 'p.age <= ?'),
+    ('liked_by', 'p.id IN (SELECT pet_id FROM pet_likes WHERE user_id = ?)'),
+)
+PET_FILTER_NAMES = tuple(name for name, _ in PET_FILTERS)
+
+@functools.lru_cache(maxsize=256)
+def pet_listing_sql(shape, mode):
+    """Return the SQL for a filter shape (tuple of filter names, canonical order).
+
+    mode is 'page' for the first page or 'after' for a page following a cursor.
+    """
+    predicates = [sql for name, sql in PET_FILTERS if name in shape]
+    
+    if 'text' not in shape:
+        # Browsing: newest first, keyset on (created_at, id)
+        if mode == 'after':
+            predicates.append('(p.created_at, p.id) < (?, ?)')
+        return f'''
+            SELECT p.*, c.name as category_name
+            FROM pets p
+            JOIN categories c ON p.category_id = c.id
+            WHERE {' AND '.join(predicates) or '1 = 1'}
+            ORDER BY p.created_at DESC, p.id DESC
+            LIMIT ?
+        '''
+    
+    # Text search: bm25 ranking over every match, keyset on (score, id)
+    return f'''
+        SELECT * FROM (
+            SELECT p.*, c.name as category_name,
+                   bm25(pets_fts, {', '.join(str(w) for w in SEARCH_WEIGHTS)}) as score,
+                   highlight(pets_fts, 0, char(2), char(3)) as name_highlight,
+                   snippet(pets_fts, -1, char(2), char(3), '…', 12) as snippet
+            FROM pets_fts
+            JOIN pets p ON p.id = pets_fts.rowid
+            JOIN categories c ON p.category_id = c.id
+            WHERE {' AND '.join(predicates)}
+        )
+        {'WHERE (score, id) > (?, ?)' if mode == 'after' else ''}
+        ORDER BY score, id
+        LIMIT ?
+    '''
+
+class PetQuery:
+    """A pet listing filtered by any of PET_FILTER_NAMES, paged with keyset cursors.
+
+    Filters left as None (or '') are not applied, e.g.
+    PetQuery(status='available', category='Dogs').fetch_page(conn, 24)
+    """
+
+    def __init__(self, **filters):
+        unknown = set(filters) - set(PET_FILTER_NAMES)
+        if unknown:
+            raise TypeError(f"Unknown pet filter(s): {', '.join(sorted(unknown))}")
+        self.filters = {name: value for name, value in filters.items() if value is not None and value != ''}
+        self.shape = tuple(name for name in PET_FILTER_NAMES if name in self.filters)
+
+    def params(self):
+        return [self.filters[name] for name in self.shape]
+
+    def sql(self, mode='page'):
+        return pet_listing_sql(self.shape, mode)
+
+    def fetch_page(self, conn, limit, cursor=None):
+        """Return (rows, next_cursor); raises ValueError for a malformed cursor."""
+        params = self.params()
+        
+        kind = 'r' if 'text' in self.shape else 't'
+        after = decode_cursor(cursor, kind, 2) if cursor else None
+        
+        mode = 'after' if after else 'page'
+        rows = conn.execute(self.sql(mode), [*params, *(after or []), limit + 1]).fetchall()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            if 'text' in self.shape:
+                next_cursor = encode_cursor('r', last['score'], last['id'])
+            else:
+                next_cursor = encode_cursor('t', last['created_at'], last['id'])
+        return rows, next_cursor
+
+# Register the listing shapes the routes use with `flask check-query-plans`
+HOT_QUERIES.extend([
+    ('adopt_available_pets', PetQuery(status='available').sql('after'),
+     ('available', '2100-01-01', 0, ADOPT_PAGE_SIZE + 1), ('c',)),
+    ('adopt_available_pets_by_category', PetQuery(category='Dogs', status='available').sql('after'),
+     ('Dogs', 'available', '2100-01-01', 0, ADOPT_PAGE_SIZE + 1), ('c',)),
+    ('browse_all_pets', PetQuery().sql('after'), ('2100-01-01', 0, SEARCH_PAGE_SIZE + 1), ()),
+    ('browse_liked_pets', PetQuery(liked_by=1).sql('page'), (1, SEARCH_PAGE_SIZE + 1), ()),
+    ('search_pets', PetQuery(text='"bud"*', status='available').sql('after'),
+     ('"bud"*', 'available', -1.0, 0, SEARCH_PAGE_SIZE + 1), ('pets_fts',)),
+])
+
+def liked_pet_ids(conn, user_id, pet_ids):
+    """Return the subset of pet_ids the user has liked, using batched IN lookups."""
+    liked = set()
+    pet_ids = list(pet_ids)
+    for start in range(0, len(pet_ids), 500):
+        chunk = pet_ids[start:start + 500]
+        placeholders = ', '.join('?' * len(chunk))
+        rows = conn.execute(
+            f'SELECT pet_id FROM pet_likes WHERE user_id = ? AND pet_id IN ({placeholders})',
+            (user_id, *chunk)
+        ).fetchall()
+        liked.update(row['pet_id'] for row in rows)
+    if app.config['LIKE_BUFFER_ENABLED']:
+        like_buffer.overlay(user_id, pet_ids, liked)
+    return liked
+
+def mark_liked_pets(conn, pets, user_id):
+    """Set is_liked on each pet dict for the logged-in user (0 for anonymous visitors)."""
+    liked = liked_pet_ids(conn, user_id, [pet['id'] for pet in pets]) if user_id else set()
+    for pet in pets:
+        pet['is_liked'] = 1 if pet['id'] in liked else 0
+    return pets
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ttl seconds after they are stored.
+
+    Every entry belongs to a group. invalidate(group) drops the group's
+    entries and bumps its generation, and set() ignores values loaded under
+    an older generation, so a read that raced a write can't re-cache stale data.
+    """
+
+    def __init__(self, maxsize=256, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._generations = collections.Counter()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, group):
+        with self._lock:
+            return self._generations[group]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, group, value, generation):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if self._generations[group] != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, group, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *groups):
+        groups = set(groups)
+        with self._lock:
+            for group in groups:
+                self._generations[group] += 1
+            stale = [key for key, entry in self._entries.items() if entry[1] in groups]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            for group in {entry[1] for entry in self._entries.values()}:
+                self._generations[group] += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+page_cache = TTLCache(app.config['PAGE_CACHE_SIZE'], app.config['PAGE_CACHE_TTL'])
+
+def cached(key, group, load):
+    """Return the cached value for key, calling load() and caching its result on a miss."""
+    value = page_cache.get(key)
+    if value is None:
+        generation = page_cache.generation(group)
+        value = load()
+        page_cache.set(key, group, value, generation)
+    return value
+
+# Cache groups: the home page, every /adopt listing, and the /adopt listing of one category
+HOME_CACHE_GROUP = 'home'
+
+def adopt_cache_group(category=''):
+    return f'adopt:{category}'
+
+def pet_cache_groups(conn, pet_ids):
+    """Return the cache groups whose listings can show any of pet_ids."""
+    pet_ids = list(pet_ids)
+    if not pet_ids:
+        return set()
+    placeholders = ', '.join('?' * len(pet_ids))
+    rows = conn.execute(f'''
+        SELECT DISTINCT c.name FROM pets p
+        JOIN categories c ON p.category_id = c.id
+        WHERE p.id IN ({placeholders})
+    ''', pet_ids).fetchall()
+    return {HOME_CACHE_GROUP, adopt_cache_group()} | {adopt_cache_group(row['name']) for row in rows}
+
+def invalidate_pet_listings(groups):
+    if groups:
+        page_cache.invalidate(*groups)
+
+def is_anonymous():
+    return not session.get('user_id')
+
+def render_cards(template, key, group, pets):
+    """Render a card fragment; the anonymous rendering is shared by every visitor."""
+    if is_anonymous():
+        return Markup(cached(key, group, lambda: render_template(template, pets=pets)))
+    return Markup(render_template(template, pets=pets))
+
+def load_home_pets():
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT p.*, c.name as category_name 
+        FROM pets p 
+        JOIN categories c ON p.category_id = c.id 
+        WHERE p.adoption_status = "available" 
+        LIMIT 6
+    ''').fetchall()
+    return [dict(row) for row in rows]
+
+# Static assets: the stylesheet and scripts every page loads are served from
+# content-hashed copies under static/dist, next to precompressed gzip (and,
+# with the brotli package installed, brotli) variants, and cached for a year
+ASSET_SOURCES = ('css/petlink.css', 'js/petlink.js', 'js/search.js')
+ASSET_DIST = 'dist'
+ASSET_MAX_AGE = 365 * 24 * 3600
+# Preferred first when the client accepts several
+ASSET_ENCODINGS = [('br', '.br'), ('gzip', '.gz')] if brotli else [('gzip', '.gz')]
+
+def compress_asset(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def write_atomically(path, data):
+    # Write then rename, so a concurrent reader or build never sees half a file
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, path)
+
+def fingerprint_asset(source):
+    """Return the contents of a static source and its content-hashed file name."""
+    with open(os.path.join(app.static_folder, source), 'rb') as f:
+        data = f.read()
+    stem, extension = os.path.splitext(os.path.basename(source))
+    return data, f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{extension}'
+
+def build_assets(clean=False):
+    """Write content-hashed copies of ASSET_SOURCES and their compressed variants to static/dist.
+
+    Returns the manifest (source path -> fingerprinted path under static/).
+    A fingerprinted file that already exists is never rewritten, so this is
+    cheap when nothing changed; clean=True removes files of older builds.
+    """
+    dist = os.path.join(app.static_folder, ASSET_DIST)
+    os.makedirs(dist, exist_ok=True)
+    manifest = {}
+    for source in ASSET_SOURCES:
+        data, name = fingerprint_asset(source)
+        path = os.path.join(dist, name)
+        if not os.path.exists(path):
+            write_atomically(path, data)
+        for encoding, suffix in ASSET_ENCODINGS:
+            if not os.path.exists(path + suffix):
+                write_atomically(path + suffix, compress_asset(data, encoding))
+        manifest[source] = f'{ASSET_DIST}/{name}'
+    
+    # For anything outside the app that needs the current names (a CDN upload, nginx)
+    manifest_path = os.path.join(dist, 'manifest.json')
+    manifest_json = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    if not os.path.exists(manifest_path) or open(manifest_path, 'rb').read() != manifest_json:
+        write_atomically(manifest_path, manifest_json)
+    
+    if clean:
+        current = {os.path.basename(path) for path in manifest.values()} | {'manifest.json'}
+        for name in os.listdir(dist):
+            base = name
+            for suffix in ('.gz', '.br'):
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if base not in current:
+                os.remove(os.path.join(dist, name))
+    return manifest
+
+def load_asset_manifest():
+    """Manifest of the ASSET_SOURCES whose current build is already in static/dist.
+
+    Never writes: importing the app must work on a read-only deploy and
+    when several processes start at once. A source that has not been built
+    (`flask build-assets`) is linked unversioned until it is.
+    """
+    dist = os.path.join(app.static_folder, ASSET_DIST)
+    manifest, missing = {}, []
+    for source in ASSET_SOURCES:
+        name = fingerprint_asset(source)[1]
+        if os.path.exists(os.path.join(dist, name)):
+            manifest[source] = f'{ASSET_DIST}/{name}'
+        else:
+            missing.append(source)
+    if missing:
+        print(f"Static assets not built ({', '.join(missing)}); serving them unversioned until `flask build-assets` runs")
+    return manifest
+
+asset_manifest = load_asset_manifest()
+
+@app.template_global()
+def asset_url(path):
+    """URL of a static asset, fingerprinted when it is one of ASSET_SOURCES."""
+    return url_for('static', filename=asset_manifest.get(path, path))
+
+@app.route(f'{app.static_url_path}/{ASSET_DIST}/<path:filename>')
+def asset(filename):
+    # Fingerprinted files never change, so they can be cached forever;
+    # the precompressed variant is picked from Accept-Encoding
+    dist = os.path.join(app.static_folder, ASSET_DIST)
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in ASSET_ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.exists(os.path.join(dist, filename + suffix)):
+            response = send_from_directory(dist, filename + suffix, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+            response.content_encoding = encoding
+            break
+    else:
+        response = send_from_directory(dist, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Conditional GETs: the read pages carry an ETag and Last-Modified derived
+# from the change versions of what they show (kept by the migration 11
+# triggers), so a revalidation that finds nothing changed is answered with
+# 304 after one primary-key lookup, before any pet or forum query runs
+CHANGE_VERSIONS_SQL = 'SELECT scope, version, changed_at FROM change_versions WHERE scope IN ({})'
+
+HOT_QUERIES.append(('change_versions', CHANGE_VERSIONS_SQL.format('?, ?'), ('pets', 'pet:1'), ()))
+
+def source_version():
+    # Code and templates shape the page as much as the data does, so a
+    # deploy changes every ETag
+    paths = [os.path.abspath(__file__)]
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    paths += sorted(os.path.join(template_dir, name) for name in os.listdir(template_dir))
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f'{path}:{stat.st_mtime_ns}:{stat.st_size};'.encode())
+    # Pages link the fingerprinted assets
+    digest.update(json.dumps(asset_manifest, sort_keys=True).encode())
+    return digest.hexdigest()[:12]
+
+SOURCE_VERSION = source_version()
+
+def page_validators(conn, scopes):
+    """Return (etag, last_modified) for a page built from scopes, as seen by this session."""
+    rows = conn.execute(CHANGE_VERSIONS_SQL.format(', '.join('?' * len(scopes))), scopes).fetchall()
+    g.change_versions = {row['scope']: row['version'] for row in rows}
+    parts = [SOURCE_VERSION] + [f"{scope}={g.change_versions.get(scope, 0)}" for scope in scopes]
+    # The page also depends on who is looking (nav bar, hearts, comment form)
+    parts.append(f"{session.get('user_type')}:{session.get('user_id')}:{session.get('user_name')}")
+    if session.get('user_id') and app.config['LIKE_BUFFER_ENABLED']:
+        # Hearts include this worker's unflushed toggles
+        parts.append(f'likes={like_buffer.toggles}')
+    etag = hashlib.sha1('|'.join(parts).encode()).hexdigest()[:20]
+    
+    last_modified = None
+    if len(rows) == len(scopes):
+        try:
+            last_modified = max(datetime.datetime.fromisoformat(row['changed_at']) for row in rows)
+            last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+        except (TypeError, ValueError):
+            last_modified = None
+    return etag, last_modified
+
+def is_not_modified(etag, last_modified):
+    # If-None-Match wins over If-Modified-Since when both are sent
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+def conditional_get(*scopes):
+    """Serve a GET view with validators from the change versions of scopes.
+
+    scopes are format strings over the view arguments, e.g. 'pet:{pet_id}'.
+    A matching If-None-Match / If-Modified-Since gets a 304 without running
+    the view; a 200 gets ETag, Last-Modified and Cache-Control. Anonymous
+    pages are public so a reverse proxy can share them for HTTP_SHARED_MAX_AGE
+    seconds; logged-in pages are private and always revalidated.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            etag, last_modified = page_validators(
+                get_db_connection(), [scope.format(**kwargs) for scope in scopes])
+            # Pending flash messages have to be rendered, not skipped
+            if '_flashes' not in session and is_not_modified(etag, last_modified):
+                response = app.response_class(status=304)
+            else:
+                response = app.make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            response.vary.add('Cookie')
+            if is_anonymous() and not session.modified:
+                response.cache_control.public = True
+                response.cache_control.max_age = 0
+                response.cache_control.s_maxage = app.config['HTTP_SHARED_MAX_AGE']
+            else:
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+def listing_version():
+    # Cached listings are keyed by the pets version too, so a worker never
+    # serves (and tags with a new ETag) a listing another worker changed
+    return g.get('change_versions', {}).get('pets')
 
 # Routes
 @app.route('/')
+@conditional_get('pets')
 def home():
     try:
-        conn = get_db_connection()
-        pets = conn.execute('''
-            SELECT p.*, c.name as category_name 
-            FROM pets p 
-            JOIN categories c ON p.category_id = c.id 
-            WHERE p.adoption_status = "available" 
-            LIMIT 6
-        ''').fetchall()
-        conn.close()
-        return render_template('index.html', pets=pets)
+        pets = cached(('home', listing_version()), HOME_CACHE_GROUP, load_home_pets)
+        user_id = session.get('user_id') if session.get('user_type') == 'user' else None
+        if user_id:
+            # Logged-in users get copies of the shared rows with their own likes overlaid
+            pets = mark_liked_pets(get_db_connection(), [dict(pet) for pet in pets], user_id)
+        cards_html = render_cards('_featured_pet_cards.html', ('home', listing_version(), 'cards'),
+                                  HOME_CACHE_GROUP, pets)
+        return render_template('index.html', pets=pets, cards_html=cards_html)
     except Exception as e:
         print(f"Home route error: {e}")
-        return f"Error: {e}"
+        return f"Error: {e}", 500
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
@@ -191,13 +1922,10 @@ def register():
             contact = request.form['contact']
             address = request.form['address']
             
-            conn = get_db_connection()
-            conn.execute('''
+            run_write(lambda conn: conn.execute('''
                 INSERT INTO users (name, email, password, contact, address)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (name, email, password, contact, address))
-            conn.commit()
-            conn.close()
+            ''', (name, email, password, contact, address)))
             flash('Registration successful! Please login.', 'success')
             return redirect(url_for('login'))
         except sqlite3.IntegrityError:
@@ -219,7 +1947,6 @@ def login():
                 'SELECT * FROM users WHERE email = ? AND password = ?',
                 (email, password)
             ).fetchone()
-            conn.close()
             
             if user:
                 session['user_id'] = user['id']
@@ -246,7 +1973,6 @@ def owner_login():
                 'SELECT * FROM owners WHERE email = ? AND password = ?',
                 (email, password)
             ).fetchone()
-            conn.close()
             
             if owner:
                 session['user_id'] = owner['id']
@@ -285,25 +2011,23 @@ def profile():
             
             if not name or not contact or not address:
                 flash('All fields are required!', 'error')
-                conn.close()
                 return redirect(url_for('profile'))
             
             # Update user info
             if password:
                 # Update with new password
                 hashed_password = hash_password(password)
-                conn.execute('''
+                run_write(lambda conn: conn.execute('''
                     UPDATE users SET name = ?, contact = ?, address = ?, password = ?
                     WHERE id = ?
-                ''', (name, contact, address, hashed_password, session['user_id']))
+                ''', (name, contact, address, hashed_password, session['user_id'])))
             else:
                 # Update without changing password
-                conn.execute('''
+                run_write(lambda conn: conn.execute('''
                     UPDATE users SET name = ?, contact = ?, address = ?
                     WHERE id = ?
-                ''', (name, contact, address, session['user_id']))
+                ''', (name, contact, address, session['user_id'])))
             
-            conn.commit()
             session['user_name'] = name
             flash('Profile updated successfully!', 'success')
         
@@ -319,87 +2043,124 @@ def profile():
             ORDER BY ar.created_at DESC
         ''', (session['user_id'],)).fetchall()
         
-        conn.close()
         return render_template('profile.html', user=user, requests=requests)
     except Exception as e:
         flash(f'Profile error: {e}', 'error')
         return redirect(url_for('home'))
 
 @app.route('/adopt')
+@conditional_get('pets')
 def adopt():
     try:
         category_filter = request.args.get('category', '')
+        cursor = request.args.get('cursor', '')
+        wants_json = request.args.get('format') == 'json'
         user_id = session.get('user_id') if session.get('user_type') == 'user' else None
-        
-        conn = get_db_connection()
+        group = adopt_cache_group(category_filter)
         
         # Get all categories
-        categories = conn.execute('SELECT * FROM categories').fetchall()
+        categories = [] if wants_json else cached(
+            ('categories', listing_version()), 'categories',
+            lambda: [dict(row) for row in get_db_connection().execute('SELECT * FROM categories')]
+        )
         
-        # Build query based on filter with like counts
-        if category_filter:
-            if user_id:
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count,
-                           MAX(CASE WHEN pl.user_id = ? THEN 1 ELSE 0 END) as is_liked
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE p.adoption_status = "available" AND c.name = ?
-                    GROUP BY p.id, p.name, p.category_id, p.breed, p.age, p.health_details, 
-                             p.medical_details, p.adoption_status, p.image_url, p.owner_id, 
-                             p.created_at, c.name
-                    ORDER BY p.created_at DESC
-                ''', (user_id, category_filter)).fetchall()
-            else:
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count,
-                           0 as is_liked
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE p.adoption_status = "available" AND c.name = ?
-                    GROUP BY p.id, p.name, p.category_id, p.breed, p.age, p.health_details, 
-                             p.medical_details, p.adoption_status, p.image_url, p.owner_id, 
-                             p.created_at, c.name
-                    ORDER BY p.created_at DESC
-                ''', (category_filter,)).fetchall()
-        else:
-            if user_id:
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count,
-                           MAX(CASE WHEN pl.user_id = ? THEN 1 ELSE 0 END) as is_liked
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE p.adoption_status = "available"
-                    GROUP BY p.id, p.name, p.category_id, p.breed, p.age, p.health_details, 
-                             p.medical_details, p.adoption_status, p.image_url, p.owner_id, 
-                             p.created_at, c.name
-                    ORDER BY p.created_at DESC
-                ''', (user_id,)).fetchall()
-            else:
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count,
-                           0 as is_liked
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE p.adoption_status = "available"
-                    GROUP BY p.id, p.name, p.category_id, p.breed, p.age, p.health_details, 
-                             p.medical_details, p.adoption_status, p.image_url, p.owner_id, 
-                             p.created_at, c.name
-                    ORDER BY p.created_at DESC
-                ''').fetchall()
+        # Keyset pagination on (created_at, id): every page is an index range scan.
+        # like_count is maintained on pets, so no aggregate join is needed.
+        def load_page(page_cursor):
+            listing = PetQuery(status='available', category=category_filter)
+            rows, next_cursor = listing.fetch_page(get_db_connection(), ADOPT_PAGE_SIZE, page_cursor or None)
+            return [dict(row) for row in rows], next_cursor
         
-        conn.close()
-        return render_template('adopt.html', pets=pets, categories=categories, selected_category=category_filter)
+        try:
+            pets, next_cursor = cached(('adopt', category_filter, cursor, listing_version()), group,
+                                       lambda: load_page(cursor))
+        except ValueError:
+            if wants_json:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            cursor = ''
+            pets, next_cursor = cached(('adopt', category_filter, cursor, listing_version()), group,
+                                       lambda: load_page(cursor))
+        
+        if user_id:
+            # Logged-in users get copies of the shared rows with their own likes overlaid
+            pets = mark_liked_pets(get_db_connection(), [dict(pet) for pet in pets], user_id)
+        cards_html = render_cards('_pet_cards.html', ('adopt', category_filter, cursor, listing_version(), 'cards'),
+                                  group, pets)
+        
+        if wants_json:
+            # "Load more" on adopt.html appends the rendered cards
+            return jsonify({
+                'html': cards_html,
+                'count': len(pets),
+                'next_cursor': next_cursor
+            })
+        
+        return render_template('adopt.html', pets=pets, categories=categories, cards_html=cards_html,
+                               selected_category=category_filter, next_cursor=next_cursor)
     except Exception as e:
-        return f"Adopt page error: {e}"
+        return f"Adopt page error: {e}", 500
+
+# Idempotency keys: a POST sent with an Idempotency-Key header runs at most
+# once per user and key; a retry gets the stored response back
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+def idempotency_cutoff():
+    return f"-{app.config['IDEMPOTENCY_KEY_TTL_HOURS']} hours"
+
+def stored_response(row, endpoint):
+    if row['endpoint'] != endpoint:
+        raise ValueError('Idempotency-Key was already used for a different request')
+    return json.loads(row['response'])
+
+def keyed_write(work, unchanged=None):
+    """run_write(work) for the logged-in user, at most once per Idempotency-Key.
+
+    work(conn) returns (payload, groups); the payload is stored with the key
+    in the same transaction. Returns (payload, groups, replayed); a replay
+    doesn't take the write lock when the first attempt has already committed.
+    Without a key, unchanged(conn) may answer first from a plain read (a
+    payload, or None to go on and write), so repeats don't queue for the lock.
+    Raises ValueError if the key is too long or was used on another endpoint.
+    """
+    key = request.headers.get('Idempotency-Key', '').strip()
+    if not key:
+        payload = unchanged(get_db_connection()) if unchanged else None
+        if payload:
+            return payload, set(), True
+        payload, groups = run_write(work)
+        return payload, groups, False
+    if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise ValueError(f'Idempotency-Key is longer than {IDEMPOTENCY_KEY_MAX_LENGTH} characters')
+    user_id = session['user_id']
+    endpoint = request.path
+    
+    stored = get_db_connection().execute('''
+        SELECT endpoint, response FROM idempotency_keys
+        WHERE user_id = ? AND key = ? AND response IS NOT NULL AND created_at >= datetime('now', ?)
+    ''', (user_id, key, idempotency_cutoff())).fetchone()
+    if stored:
+        return stored_response(stored, endpoint), set(), True
+    
+    def claim_and_run(conn):
+        # Claim the key (or take over an expired one); a concurrent retry that
+        # committed first makes this return nothing
+        claimed = conn.execute('''
+            INSERT INTO idempotency_keys (user_id, key, endpoint) VALUES (?, ?, ?)
+            ON CONFLICT (user_id, key) DO UPDATE
+            SET endpoint = excluded.endpoint, response = NULL, created_at = CURRENT_TIMESTAMP
+            WHERE idempotency_keys.created_at < datetime('now', ?)
+            RETURNING key
+        ''', (user_id, key, endpoint, idempotency_cutoff())).fetchone()
+        if claimed is None:
+            row = conn.execute('SELECT endpoint, response FROM idempotency_keys WHERE user_id = ? AND key = ?',
+                               (user_id, key)).fetchone()
+            return stored_response(row, endpoint), set(), True
+        payload, groups = work(conn)
+        conn.execute('UPDATE idempotency_keys SET response = ? WHERE user_id = ? AND key = ?',
+                     (json.dumps(payload), user_id, key))
+        return payload, groups, False
+    
+    return run_write(claim_and_run)
 
 @app.route('/request-adoption/<int:pet_id>', methods=['POST'])
 def request_adoption(pet_id):
@@ -407,39 +2168,259 @@ def request_adoption(pet_id):
         return jsonify({'success': False, 'message': 'Please login to request adoption.'})
     
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         message = data.get('message', '') if data else ''
         
         # Use default message if none provided
         if not message:
             message = f"I am interested in adopting this pet. Please contact me to discuss further details."
         
-        conn = get_db_connection()
-        
-        # Check if user already requested this pet
-        existing = conn.execute(
-            'SELECT * FROM adoption_requests WHERE user_id = ? AND pet_id = ?',
-            (session['user_id'], pet_id)
-        ).fetchone()
+        user_id = session['user_id']
         
-        if existing:
-            conn.close()
-            return jsonify({'success': False, 'message': 'You have already requested this pet.'})
+        def already_requested(conn):
+            # The common repeat; the unique index still settles races
+            if conn.execute('SELECT 1 FROM adoption_requests WHERE user_id = ? AND pet_id = ?',
+                            (user_id, pet_id)).fetchone():
+                return {'success': False, 'message': 'You have already requested this pet.'}
         
-        # Create adoption request
-        conn.execute('''
-            INSERT INTO adoption_requests (user_id, pet_id, message)
-            VALUES (?, ?, ?)
-        ''', (session['user_id'], pet_id, message))
-        
-        conn.commit()
-        conn.close()
+        def create_request(conn):
+            # UNIQUE(user_id, pet_id) turns a repeated or concurrent request into a no-op
+            created = conn.execute('''
+                INSERT INTO adoption_requests (user_id, pet_id, message, owner_id)
+                SELECT ?, id, ?, owner_id FROM pets WHERE id = ?
+                ON CONFLICT (user_id, pet_id) DO NOTHING
+                RETURNING id, owner_id
+            ''', (user_id, message, pet_id)).fetchone()
+            if created:
+                publish_owner_events(conn, created['owner_id'], 'request', [created['id']])
+                return {'success': True, 'message': 'Request sent successfully to owner!', 'request_id': created['id']}, set()
+            if conn.execute('SELECT 1 FROM pets WHERE id = ?', (pet_id,)).fetchone() is None:
+                return {'success': False, 'message': 'Pet not found.'}, set()
+            return {'success': False, 'message': 'You have already requested this pet.'}, set()
         
-        flash('Adoption request sent', 'success')
-        return jsonify({'success': True, 'message': 'Request sent successfully to owner!'})
+        payload, groups, replayed = keyed_write(create_request, already_requested)
+        if payload['success'] and not replayed:
+            event_bus.notify()
+            flash('Adoption request sent', 'success')
+        return jsonify(payload)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 422
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {e}'})
 
+# Owner dashboard sections. The summary query reads every count section from
+# the owner rollups (see migration 7) as rows of a single UNION ALL, so its
+# cost doesn't grow with the owner's history; the activity query merges the
+# newest requests and pets.
+OWNER_SUMMARY_SQL = '''
+    SELECT 'pet_status' as section, adoption_status as label, pet_count as count,
+           NULL as id, NULL as breed, NULL as image_url, NULL as category_name,
+           NULL as request_count, NULL as approved_count, NULL as pending_count
+    FROM owner_pet_stats
+    WHERE owner_id = :owner AND pet_count > 0
+    UNION ALL
+    SELECT 'request_status', status, request_count, NULL, NULL, NULL, NULL, NULL, NULL, NULL
+    FROM owner_request_stats
+    WHERE owner_id = :owner AND request_count > 0
+    UNION ALL
+    SELECT 'category', c.name, COALESCE(s.pet_count, 0), NULL, NULL, NULL, NULL, NULL, NULL, NULL
+    FROM categories c
+    LEFT JOIN owner_category_stats s ON s.owner_id = :owner AND s.category_id = c.id
+    UNION ALL
+    SELECT 'top_pet', name, rank, id, breed, image_url, category_name,
+           request_count, approved_count, pending_count
+    FROM (
+        SELECT top.id, top.name, top.breed, top.image_url, c.name as category_name,
+               top.request_count, top.approved_count, top.pending_count,
+               ROW_NUMBER() OVER (ORDER BY top.request_count DESC, top.name ASC) as rank
+        FROM (
+            SELECT * FROM pets
+            WHERE owner_id = :owner
+            ORDER BY request_count DESC, name ASC
+            LIMIT :top_n
+        ) top
+        JOIN categories c ON c.id = top.category_id
+    )
+'''
+
+# Recent activity: the owner's requests and pet additions merged newest first,
+# ordered by (created_at, type, id) so the dashboard can page through it with
+# a keyset cursor. Each half walks its (owner_id, created_at) index and stops
+# after :per_type rows.
+OWNER_ACTIVITY_TYPES = ('request', 'pet')
+OWNER_ACTIVITY_PARTS = {
+    'request': ('ar', '''
+    SELECT * FROM (
+        SELECT 'request' as type, ar.id, ar.created_at,
+               p.name as pet_name, u.name as user_name, ar.status,
+               'Adoption request ' || ar.status || ' for ' || p.name as description
+        FROM adoption_requests ar
+        JOIN pets p ON ar.pet_id = p.id
+        JOIN users u ON ar.user_id = u.id
+        WHERE ar.owner_id = :owner {keyset}
+        ORDER BY ar.created_at DESC, ar.id DESC
+        LIMIT :per_type
+    )'''),
+    'pet': ('p', '''
+    SELECT * FROM (
+        SELECT 'pet' as type, p.id, p.created_at,
+               p.name as pet_name, NULL as user_name, p.adoption_status as status,
+               'Pet ' || p.name || ' added' as description
+        FROM pets p
+        WHERE p.owner_id = :owner {keyset}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT :per_type
+    )'''),
+}
+
+def owner_activity_sql(after=False, types=OWNER_ACTIVITY_TYPES):
+    """The activity feed over the given types; after adds the keyset predicate on :at, :type and :id."""
+    parts = []
+    for kind in types:
+        alias, part = OWNER_ACTIVITY_PARTS[kind]
+        keyset = (f"AND {alias}.created_at <= :at AND ({alias}.created_at, '{kind}', {alias}.id) < (:at, :type, :id)"
+                  if after else '')
+        parts.append(part.format(keyset=keyset))
+    return '\n    UNION ALL'.join(parts) + '''
+    ORDER BY created_at DESC, type DESC, id DESC
+    LIMIT :limit
+'''
+
+OWNER_ACTIVITY_SQL = owner_activity_sql()
+
+HOT_QUERIES.extend([
+    ('owner_dashboard_summary', OWNER_SUMMARY_SQL, {'owner': 1, 'top_n': 10}, ('c', 'top')),
+    ('owner_dashboard_activity', OWNER_ACTIVITY_SQL, {'owner': 1, 'per_type': 5, 'limit': 10}, ()),
+])
+
+# Just the status counts behind the dashboard stat cards
+OWNER_COUNTS_SQL = '''
+    SELECT 'pet_status' as section, adoption_status as label, pet_count as count
+    FROM owner_pet_stats
+    WHERE owner_id = :owner AND pet_count > 0
+    UNION ALL
+    SELECT 'request_status', status, request_count
+    FROM owner_request_stats
+    WHERE owner_id = :owner AND request_count > 0
+'''
+
+HOT_QUERIES.append(('owner_counts', OWNER_COUNTS_SQL, {'owner': 1}, ()))
+
+def summary_stats(pets_by_status, requests_by_status):
+    return {
+        'total_pets': sum(pets_by_status.values()),
+        'available_pets': pets_by_status.get('available', 0),
+        'adopted_pets': pets_by_status.get('adopted', 0),
+        'total_requests': sum(requests_by_status.values()),
+        'pending_requests': requests_by_status.get('pending', 0),
+        'approved_requests': requests_by_status.get('approved', 0),
+        'rejected_requests': requests_by_status.get('rejected', 0)
+    }
+
+def owner_stats(conn, owner_id):
+    """Return the dashboard stat card counts for an owner, read from the rollups."""
+    counts = {'pet_status': {}, 'request_status': {}}
+    for row in conn.execute(OWNER_COUNTS_SQL, {'owner': owner_id}):
+        counts[row['section']][row['label']] = row['count']
+    return summary_stats(counts['pet_status'], counts['request_status'])
+
+def owner_dashboard_data(conn, owner_id, top_n=10, activity_limit=10):
+    """Return every owner dashboard section (stats, status counts, categories, top pets, activity)."""
+    data = {
+        'pets_by_status': {},
+        'requests_by_status': {},
+        'category_distribution': [],
+        'top_pets': []
+    }
+    
+    for row in conn.execute(OWNER_SUMMARY_SQL, {'owner': owner_id, 'top_n': top_n}):
+        if row['section'] == 'pet_status':
+            data['pets_by_status'][row['label']] = row['count']
+        elif row['section'] == 'request_status':
+            data['requests_by_status'][row['label']] = row['count']
+        elif row['section'] == 'category':
+            data['category_distribution'].append({'name': row['label'], 'pet_count': row['count']})
+        else:
+            data['top_pets'].append({
+                'id': row['id'],
+                'name': row['label'],
+                'breed': row['breed'],
+                'image_url': row['image_url'],
+                'category_name': row['category_name'],
+                'request_count': row['request_count'],
+                'approved_count': row['approved_count'],
+                'pending_count': row['pending_count'],
+                'rank': row['count']
+            })
+    
+    data['category_distribution'].sort(key=lambda c: c['pet_count'], reverse=True)
+    data['top_pets'].sort(key=lambda p: p['rank'])
+    data['stats'] = summary_stats(data['pets_by_status'], data['requests_by_status'])
+    
+    # Newest requests and pet additions (up to 5 of each); the dashboard page
+    # passes activity_limit=0 and pages through /owner-dashboard/activity instead
+    data['recent_activity'] = [dict(row) for row in conn.execute(
+        OWNER_ACTIVITY_SQL, {'owner': owner_id, 'per_type': 5, 'limit': activity_limit}
+    )] if activity_limit else []
+    return data
+
+# Request time series: SQL period label for each granularity, computed from
+# owner_request_daily.day (weeks start on Monday and are labelled by that date)
+SERIES_PERIODS = {
+    'day': 'day',
+    'week': "date(day, '-' || ((strftime('%w', day) + 6) % 7) || ' days')",
+    'month': "strftime('%Y-%m', day)",
+}
+MAX_SERIES_DAYS = 3660
+
+def series_periods(start, end, granularity):
+    """Yield the period labels between two dates, matching SERIES_PERIODS."""
+    if granularity == 'day':
+        day = start
+        while day <= end:
+            yield day.isoformat()
+            day += datetime.timedelta(days=1)
+    elif granularity == 'week':
+        week = start - datetime.timedelta(days=start.weekday())
+        while week <= end:
+            yield week.isoformat()
+            week += datetime.timedelta(days=7)
+    else:
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            yield f'{year:04d}-{month:02d}'
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def request_series(conn, owner_id, start, end, granularity='month'):
+    """Requests and approvals per period, read from the daily buckets (missing periods are zero)."""
+    rows = conn.execute(f'''
+        SELECT {SERIES_PERIODS[granularity]} as period,
+               SUM(request_count) as requests, SUM(approved_count) as approved
+        FROM owner_request_daily
+        WHERE owner_id = ? AND day BETWEEN ? AND ?
+        GROUP BY period
+    ''', (owner_id, start.isoformat(), end.isoformat())).fetchall()
+    counts = {row['period']: row for row in rows}
+    series = []
+    for period in series_periods(start, end, granularity):
+        row = counts.get(period)
+        series.append({
+            'period': period,
+            'requests': row['requests'] if row else 0,
+            'approved': row['approved'] if row else 0
+        })
+    return series
+
+HOT_QUERIES.extend([
+    (f'owner_requests_by_{granularity}', f'''
+        SELECT {period} as period, SUM(request_count), SUM(approved_count)
+        FROM owner_request_daily
+        WHERE owner_id = ? AND day BETWEEN ? AND ?
+        GROUP BY period
+    ''', (1, '2024-01-01', '2024-12-31'), ())
+    for granularity, period in SERIES_PERIODS.items()
+])
+
 @app.route('/owner-dashboard')
 def owner_dashboard():
     if 'user_id' not in session or session.get('user_type') != 'owner':
@@ -449,243 +2430,993 @@ def owner_dashboard():
     try:
         conn = get_db_connection()
         
-        # Get owner's pets
-        pets = conn.execute('''
-            SELECT p.*, c.name as category_name 
-            FROM pets p 
-            JOIN categories c ON p.category_id = c.id 
-            WHERE p.owner_id = ?
-            ORDER BY p.created_at DESC
-        ''', (session['user_id'],)).fetchall()
+        # Read first: live updates resume from here, so nothing committed while
+        # the page is built is missed (a change seen twice is applied twice, harmlessly)
+        last_event_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM owner_events').fetchone()[0]
         
-        # Get adoption requests
-        requests = conn.execute('''
-            SELECT ar.*, p.name as pet_name, p.breed, u.name as user_name, u.email, u.contact
-            FROM adoption_requests ar
-            JOIN pets p ON ar.pet_id = p.id
-            JOIN users u ON ar.user_id = u.id
-            WHERE p.owner_id = ?
-            ORDER BY ar.created_at DESC
-        ''', (session['user_id'],)).fetchall()
+        # Only bounded reads here: stats and top pets (shared with
+        # /owner-dashboard/analytics). The page fetches the pets, requests and
+        # activity lists from /owner-dashboard/<section>, a page at a time.
+        dashboard = owner_dashboard_data(conn, session['user_id'], top_n=5, activity_limit=0)
         
-        # Analytics: Get top pets by request count
-        top_pets = conn.execute('''
-            SELECT p.id, p.name, p.breed, p.image_url, c.name as category_name,
-                   COUNT(ar.id) as request_count,
-                   SUM(CASE WHEN ar.status = 'approved' THEN 1 ELSE 0 END) as approved_count
-            FROM pets p
-            LEFT JOIN adoption_requests ar ON p.id = ar.pet_id
-            JOIN categories c ON p.category_id = c.id
-            WHERE p.owner_id = ?
-            GROUP BY p.id, p.name, p.breed, p.image_url, c.name
-            ORDER BY request_count DESC, p.name ASC
-            LIMIT 5
-        ''', (session['user_id'],)).fetchall()
+        categories = conn.execute('SELECT * FROM categories').fetchall()
         
-        # Analytics: Get detailed statistics
-        stats_row = conn.execute('''
-            SELECT 
-                COUNT(DISTINCT p.id) as total_pets,
-                SUM(CASE WHEN p.adoption_status = 'available' THEN 1 ELSE 0 END) as available_pets,
-                SUM(CASE WHEN p.adoption_status = 'adopted' THEN 1 ELSE 0 END) as adopted_pets,
-                COUNT(DISTINCT ar.id) as total_requests,
-                SUM(CASE WHEN ar.status = 'pending' THEN 1 ELSE 0 END) as pending_requests,
-                SUM(CASE WHEN ar.status = 'approved' THEN 1 ELSE 0 END) as approved_requests,
-                SUM(CASE WHEN ar.status = 'rejected' THEN 1 ELSE 0 END) as rejected_requests
-            FROM pets p
-            LEFT JOIN adoption_requests ar ON p.id = ar.pet_id
-            WHERE p.owner_id = ?
-        ''', (session['user_id'],)).fetchone()
-        
-        # Convert Row to dict and ensure all values are integers (not None)
-        if stats_row:
-            stats = {
-                'total_pets': stats_row['total_pets'] or 0,
-                'available_pets': stats_row['available_pets'] or 0,
-                'adopted_pets': stats_row['adopted_pets'] or 0,
-                'total_requests': stats_row['total_requests'] or 0,
-                'pending_requests': stats_row['pending_requests'] or 0,
-                'approved_requests': stats_row['approved_requests'] or 0,
-                'rejected_requests': stats_row['rejected_requests'] or 0
-            }
-        else:
-            stats = {
-                'total_pets': 0,
-                'available_pets': 0,
-                'adopted_pets': 0,
-                'total_requests': 0,
-                'pending_requests': 0,
-                'approved_requests': 0,
-                'rejected_requests': 0
-            }
+        return render_template('owner_dashboard.html', 
+                             categories=categories,
+                             top_pets=dashboard['top_pets'],
+                             stats=dashboard['stats'],
+                             request_statuses=OWNER_REQUEST_STATUSES,
+                             last_event_id=last_event_id)
+    except Exception as e:
+        return f"Owner dashboard error: {e}"
+
+@app.route('/add-pet', methods=['POST'])
+def add_pet():
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'success': False, 'message': 'Unauthorized'})
+    
+    try:
+        data = request.get_json()
         
-        # Analytics: Get recent activity (last 10 activities)
-        recent_activity = []
+        def insert_pet(conn):
+            cursor = conn.execute('''
+                INSERT INTO pets (name, category_id, breed, age, health_details, medical_details, image_url, owner_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                data['name'], data['category_id'], data['breed'], data['age'],
+                data['health_details'], data['medical_details'], data['image_url'], session['user_id']
+            ))
+            publish_owner_events(conn, session['user_id'], 'pet', [cursor.lastrowid])
+            return pet_cache_groups(conn, [cursor.lastrowid])
         
-        # Recent adoption requests
-        recent_requests = conn.execute('''
-            SELECT 'request' as type, ar.created_at, 
-                   p.name as pet_name, u.name as user_name, ar.status,
-                   'Adoption request ' || ar.status || ' for ' || p.name as description
-            FROM adoption_requests ar
-            JOIN pets p ON ar.pet_id = p.id
-            JOIN users u ON ar.user_id = u.id
-            WHERE p.owner_id = ?
-            ORDER BY ar.created_at DESC
-            LIMIT 5
-        ''', (session['user_id'],)).fetchall()
+        invalidate_pet_listings(run_write(insert_pet))
+        event_bus.notify()
         
-        # Recent pet additions
-        recent_pets = conn.execute('''
-            SELECT 'pet' as type, p.created_at, 
-                   p.name as pet_name, NULL as user_name, p.adoption_status as status,
-                   'Pet ' || p.name || ' added' as description
-            FROM pets p
-            WHERE p.owner_id = ?
-            ORDER BY p.created_at DESC
-            LIMIT 5
-        ''', (session['user_id'],)).fetchall()
+        return jsonify({'success': True, 'message': 'Pet added successfully!'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {e}'})
+
+@app.route('/update-pet/<int:pet_id>', methods=['POST'])
+def update_pet(pet_id):
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'success': False, 'message': 'Unauthorized'})
+    
+    try:
+        data = request.get_json()
         
-        # Combine and sort activities
-        for req in recent_requests:
-            recent_activity.append({
-                'type': req['type'],
-                'created_at': req['created_at'],
-                'pet_name': req['pet_name'],
-                'user_name': req['user_name'],
-                'status': req['status'],
-                'description': req['description']
-            })
+        def apply_update(conn):
+            # Listings of both the old and the new category change
+            groups = pet_cache_groups(conn, [pet_id])
+            cursor = conn.execute('''
+                UPDATE pets SET name = ?, category_id = ?, breed = ?, age = ?, 
+                health_details = ?, medical_details = ?, image_url = ?, adoption_status = ?
+                WHERE id = ? AND owner_id = ?
+            ''', (
+                data['name'], data['category_id'], data['breed'], data['age'],
+                data['health_details'], data['medical_details'], data['image_url'],
+                data['adoption_status'], pet_id, session['user_id']
+            ))
+            if not cursor.rowcount:
+                return set()
+            publish_owner_events(conn, session['user_id'], 'pet', [pet_id])
+            return groups | pet_cache_groups(conn, [pet_id])
         
-        for pet in recent_pets:
-            recent_activity.append({
-                'type': pet['type'],
-                'created_at': pet['created_at'],
-                'pet_name': pet['pet_name'],
-                'user_name': pet['user_name'],
-                'status': pet['status'],
-                'description': pet['description']
-            })
+        invalidate_pet_listings(run_write(apply_update))
+        event_bus.notify()
         
-        # Sort by date (most recent first) and limit to 10
-        recent_activity.sort(key=lambda x: x['created_at'] if x['created_at'] else '', reverse=True)
-        recent_activity = recent_activity[:10]
+        return jsonify({'success': True, 'message': 'Pet updated successfully!'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {e}'})
+
+@app.route('/delete-pet/<int:pet_id>', methods=['POST'])
+def delete_pet(pet_id):
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'success': False, 'message': 'Unauthorized'})
+    
+    try:
+        def apply_delete(conn):
+            groups = pet_cache_groups(conn, [pet_id])
+            cursor = conn.execute(
+                'DELETE FROM pets WHERE id = ? AND owner_id = ?', (pet_id, session['user_id'])
+            )
+            if not cursor.rowcount:
+                return set()
+            publish_owner_events(conn, session['user_id'], 'pet-deleted', [pet_id])
+            return groups
         
-        categories = conn.execute('SELECT * FROM categories').fetchall()
+        invalidate_pet_listings(run_write(apply_delete))
+        event_bus.notify()
         
-        conn.close()
+        return jsonify({'success': True, 'message': 'Pet deleted successfully!'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {e}'})
+
+# Request moderation. Only pending requests change; approving one adopts its
+# pet and rejects that pet's other pending requests in the same transaction.
+MODERATION_STATUSES = ('approved', 'rejected')
+MODERATION_BATCH_LIMIT = 500
+
+def moderate_requests(conn, owner_id, request_ids, status):
+    """Set status on the owner's pending requests; returns (error, changed rows, adopted pet ids, skipped).
+
+    Nothing is written when error is set: every id must belong to one of the
+    owner's pets, and at most one request per pet can end up approved.
+    skipped lists the requests left alone because they were no longer pending.
+    """
+    placeholders = ', '.join('?' * len(request_ids))
+    rows = conn.execute(f'''
+        SELECT ar.id, ar.pet_id, ar.status, p.owner_id
+        FROM adoption_requests ar
+        JOIN pets p ON ar.pet_id = p.id
+        WHERE ar.id IN ({placeholders})
+    ''', request_ids).fetchall()
+    owned = {row['id']: row for row in rows if row['owner_id'] == owner_id}
+    missing = [request_id for request_id in request_ids if request_id not in owned]
+    if missing:
+        return f"Request(s) not found: {', '.join(map(str, missing))}", [], [], []
+    
+    pending = [row for row in owned.values() if row['status'] == 'pending']
+    skipped = [{'id': row['id'], 'status': row['status']} for row in owned.values() if row['status'] != 'pending']
+    pet_ids = sorted({row['pet_id'] for row in pending})
+    if status == 'approved' and pending:
+        if len(pet_ids) < len(pending):
+            return 'Only one request per pet can be approved.', [], [], []
+        pet_placeholders = ', '.join('?' * len(pet_ids))
+        taken = conn.execute(f'''
+            SELECT DISTINCT pet_id FROM adoption_requests
+            WHERE status = 'approved' AND pet_id IN ({pet_placeholders})
+        ''', pet_ids).fetchall()
+        if taken:
+            return f"Pet(s) already have an approved request: {', '.join(str(row['pet_id']) for row in taken)}", [], [], []
+    
+    pending_ids = [row['id'] for row in pending]
+    if not pending_ids:
+        return None, [], [], skipped
+    changed = [dict(row, auto=False) for row in conn.execute(f'''
+        UPDATE adoption_requests SET status = ?
+        WHERE status = 'pending' AND id IN ({', '.join('?' * len(pending_ids))})
+        RETURNING id, pet_id, status
+    ''', (status, *pending_ids)).fetchall()]
+    if status != 'approved':
+        return None, changed, [], skipped
+    
+    pet_placeholders = ', '.join('?' * len(pet_ids))
+    adopted = [row['id'] for row in conn.execute(f'''
+        UPDATE pets SET adoption_status = 'adopted'
+        WHERE adoption_status != 'adopted' AND id IN ({pet_placeholders})
+        RETURNING id
+    ''', pet_ids).fetchall()]
+    # The approved requests are no longer pending, so this only hits competing ones
+    changed.extend(dict(row, auto=True) for row in conn.execute(f'''
+        UPDATE adoption_requests SET status = 'rejected'
+        WHERE status = 'pending' AND pet_id IN ({pet_placeholders})
+        RETURNING id, pet_id, status
+    ''', pet_ids).fetchall())
+    return None, changed, adopted, skipped
+
+def moderation_response(request_ids, status):
+    """Run moderate_requests() for the logged-in owner and build the JSON reply."""
+    def apply_status(conn):
+        error, changed, adopted, skipped = moderate_requests(conn, session['user_id'], request_ids, status)
+        publish_owner_events(conn, session['user_id'], 'request', [row['id'] for row in changed])
+        publish_owner_events(conn, session['user_id'], 'pet', adopted)
+        return error, changed, adopted, skipped, pet_cache_groups(conn, adopted)
+    
+    error, changed, adopted, skipped, groups = run_write(apply_status)
+    if error:
+        return jsonify({'success': False, 'message': error}), 409
+    if not changed:
+        # Approved and rejected are final; a request that is no longer pending is a conflict, not a no-op success
+        already = ', '.join(f"{row['id']} is {row['status']}" for row in skipped)
+        return jsonify({'success': False, 'message': f'Only pending requests can be moderated: request {already}.',
+                        'skipped': skipped}), 409
+    invalidate_pet_listings(groups)
+    event_bus.notify()
+    
+    chosen = sum(not row['auto'] for row in changed)
+    competing = len(changed) - chosen
+    message = f'{chosen} request(s) {status}'
+    if competing:
+        message += f', {competing} competing request(s) rejected'
+    if skipped:
+        message += f', {len(skipped)} no longer pending (skipped)'
+    changed_ids = {row['id'] for row in changed}
+    return jsonify({
+        'success': True,
+        'message': message + '.',
+        'changed': changed,
+        'unchanged': [request_id for request_id in request_ids if request_id not in changed_ids],
+        'skipped': skipped,
+        'adopted_pet_ids': adopted,
+        'stats': owner_stats(get_db_connection(), session['user_id'])
+    })
+
+@app.route('/update-request-status/<int:request_id>', methods=['POST'])
+def update_request_status(request_id):
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'success': False, 'message': 'Unauthorized'})
+    
+    try:
+        data = request.get_json() or {}
+        status = data.get('status')
+        if status not in MODERATION_STATUSES:
+            return jsonify({'success': False, 'message': 'Status must be approved or rejected.'}), 400
         
-        # Convert Row objects to dictionaries for JSON serialization in template
-        pets_dict = [dict(pet) for pet in pets]
-        top_pets_dict = [dict(pet) for pet in top_pets]
+        return moderation_response([request_id], status)
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {e}'})
+
+@app.route('/moderate-requests', methods=['POST'])
+def moderate_requests_route():
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'success': False, 'message': 'Unauthorized'})
+    
+    try:
+        data = request.get_json() or {}
+        status = data.get('status')
+        request_ids = data.get('request_ids')
+        if status not in MODERATION_STATUSES:
+            return jsonify({'success': False, 'message': 'Status must be approved or rejected.'}), 400
+        if (not isinstance(request_ids, list) or not request_ids
+                or not all(isinstance(i, int) and not isinstance(i, bool) for i in request_ids)):
+            return jsonify({'success': False, 'message': 'request_ids must be a non-empty list of ids.'}), 400
+        request_ids = list(dict.fromkeys(request_ids))
+        if len(request_ids) > MODERATION_BATCH_LIMIT:
+            return jsonify({'success': False, 'message': f'At most {MODERATION_BATCH_LIMIT} requests per batch.'}), 400
         
-        return render_template('owner_dashboard.html', 
-                             pets=pets, 
-                             pets_json=pets_dict,  # For JavaScript
-                             requests=requests, 
-                             categories=categories,
-                             top_pets=top_pets,
-                             stats=stats,
-                             recent_activity=recent_activity)
+        return moderation_response(request_ids, status)
     except Exception as e:
-        return f"Owner dashboard error: {e}"
+        return jsonify({'success': False, 'message': f'Error: {e}'})
 
-@app.route('/add-pet', methods=['POST'])
-def add_pet():
+# Owner dashboard events. Write routes record what changed for an owner in
+# owner_events inside their own transaction, so an event exists exactly when
+# its change committed, and any worker process can stream it. Each event
+# names a subject ('request' or 'pet' id, or a 'pet-deleted' id); the card
+# is rendered from the current row when the event is sent.
+OWNER_EVENTS_SQL = '''
+    SELECT id, owner_id, kind, subject_id FROM owner_events
+    WHERE id > ?
+    ORDER BY id
+    LIMIT ?
+'''
+
+OWNER_EVENTS_BACKLOG_SQL = '''
+    SELECT id, owner_id, kind, subject_id FROM owner_events
+    WHERE owner_id = ? AND id > ? AND id <= ?
+    ORDER BY id
+    LIMIT ?
+'''
+
+OWNER_EVENTS_PRUNE_SQL = "DELETE FROM owner_events WHERE created_at < datetime('now', ?)"
+
+OWNER_REQUEST_CARD_SQL = '''
+    SELECT ar.*, p.name as pet_name, p.breed, u.name as user_name, u.email, u.contact
+    FROM adoption_requests ar
+    JOIN pets p ON ar.pet_id = p.id
+    JOIN users u ON ar.user_id = u.id
+    WHERE ar.id = ?
+'''
+
+OWNER_PET_CARD_SQL = '''
+    SELECT p.*, c.name as category_name
+    FROM pets p
+    JOIN categories c ON p.category_id = c.id
+    WHERE p.id = ?
+'''
+
+EVENT_BATCH_SIZE = 500
+# A reconnecting client further behind than this reloads the dashboard instead
+EVENT_BACKLOG_LIMIT = 500
+# Output a slow client may leave unsent before it is disconnected (it reconnects with Last-Event-ID)
+EVENT_STREAM_MAX_BUFFER = 256 * 1024
+EVENT_STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+# Sent first on every stream: how long EventSource waits before reconnecting
+EVENT_STREAM_PREAMBLE = b'retry: 3000\n\n'
+
+HOT_QUERIES.extend([
+    ('owner_events', OWNER_EVENTS_SQL, (0, EVENT_BATCH_SIZE), ()),
+    ('owner_events_backlog', OWNER_EVENTS_BACKLOG_SQL, (1, 0, 100, EVENT_BACKLOG_LIMIT + 1), ()),
+    ('owner_events_prune', OWNER_EVENTS_PRUNE_SQL, ('-60 minutes',), ()),
+    ('owner_request_card', OWNER_REQUEST_CARD_SQL, (1,), ()),
+])
+
+def publish_owner_events(conn, owner_id, kind, subject_ids):
+    """Record dashboard events for owner_id; they commit or roll back with the caller's transaction.
+
+    Call event_bus.notify() after the commit so this process sends them right away.
+    """
+    if owner_id is None or not subject_ids:
+        return
+    conn.executemany('INSERT INTO owner_events (owner_id, kind, subject_id) VALUES (?, ?, ?)',
+                     [(owner_id, kind, subject_id) for subject_id in subject_ids])
+    conn.execute(OWNER_EVENTS_PRUNE_SQL, (f"-{app.config['EVENT_RETENTION_MINUTES']} minutes",))
+
+def format_event(event, data, event_id=None):
+    lines = f'id: {event_id}\n' if event_id is not None else ''
+    return f'{lines}event: {event}\ndata: {json.dumps(data)}\n\n'.encode()
+
+class EventStream:
+    """One /owner-events subscriber: a detached socket, or a queue read by a streaming response."""
+
+    def __init__(self, owner_id, last_id, sock=None):
+        self.owner_id = owner_id
+        self.last_id = last_id
+        self.sock = sock
+        self.queue = None if sock else queue.SimpleQueue()
+        self.pending = bytearray()
+        self.closed = False
+
+    def send(self, data):
+        """Queue data for the client; returns False once the client is gone or too far behind."""
+        if self.sock is None:
+            self.queue.put(data)
+            return not self.closed
+        self.pending += data
+        return self.flush()
+
+    def flush(self):
+        try:
+            while self.pending:
+                sent = self.sock.send(self.pending)
+                del self.pending[:sent]
+        except BlockingIOError:
+            pass
+        except OSError:
+            return False
+        return len(self.pending) <= EVENT_STREAM_MAX_BUFFER
+
+class EventBus:
+    """Sends owner_events to /owner-events subscribers from a single thread.
+
+    The dispatcher thread reads new events when a write in this process
+    calls notify(), and otherwise every poll interval while anyone is
+    subscribed, which picks up events written by other worker processes.
+    Under `flask serve` a subscriber's socket is handed over to the bus and
+    multiplexed with a selector, so an idle dashboard costs a file
+    descriptor, not a request thread. Other servers stream from a queue
+    instead (one thread per open stream).
+    """
+
+    def __init__(self, poll_interval=1.0, heartbeat=15.0):
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.last_id = None
+        self._streams = {}
+        self._new = []
+        self._lock = threading.Lock()
+        self._selector = None
+        self._waker = None
+        self._thread = None
+        self._stopping = False
+        self._notified = False
+        self.sent = 0
+        self.dropped = 0
+
+    def subscribe(self, owner_id, last_id=None, sock=None):
+        """Start streaming owner_id's events after last_id (None: from now on) to a new EventStream."""
+        stream = EventStream(owner_id, last_id, sock)
+        if sock is not None:
+            sock.setblocking(False)
+        with self._lock:
+            self._new.append(stream)
+        self._start()
+        self._wake()
+        return stream
+
+    def unsubscribe(self, stream):
+        stream.closed = True
+        self._wake()
+
+    def notify(self):
+        """Send events committed by this process now rather than at the next poll."""
+        if self._thread is not None:
+            self._notified = True
+            self._wake()
+
+    def _wake(self):
+        if self._waker is not None:
+            try:
+                self._waker[1].send(b'\0')
+            except (BlockingIOError, OSError):
+                # Already woken, or the bus is closing
+                pass
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._selector = selectors.DefaultSelector()
+                    self._waker = socket.socketpair()
+                    for end in self._waker:
+                        end.setblocking(False)
+                    self._selector.register(self._waker[0], selectors.EVENT_READ)
+                    self._thread = threading.Thread(target=self._run, name='event-bus', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        next_poll = time.monotonic()
+        next_heartbeat = next_poll + self.heartbeat
+        while not self._stopping:
+            timeout = None
+            if self._streams:
+                timeout = max(0, min(next_poll, next_heartbeat) - time.monotonic())
+            for key, mask in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        while key.fileobj.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    self._handle_socket(key.data, mask)
+            if self._stopping:
+                break
+
+            with self._lock:
+                new, self._new = self._new, []
+            for stream in [s for streams in self._streams.values() for s in streams if s.closed]:
+                self._drop(stream)
+            now = time.monotonic()
+            if new or self._notified or (self._streams and now >= next_poll):
+                self._notified = False
+                try:
+                    with app.app_context():
+                        self._dispatch(new)
+                except Exception:
+                    # Events stay in the table; the next pass retries from last_id
+                    app.logger.exception('Event bus dispatch failed')
+                next_poll = now + self.poll_interval
+            if now >= next_heartbeat:
+                for stream in [s for streams in self._streams.values() for s in streams]:
+                    self._send(stream, b': keep-alive\n\n')
+                next_heartbeat = now + self.heartbeat
+
+    def _handle_socket(self, stream, mask):
+        if mask & selectors.EVENT_READ:
+            # An EventSource sends nothing after its request, so readable means closed
+            try:
+                data = stream.sock.recv(4096)
+            except BlockingIOError:
+                data = b'.'
+            except OSError:
+                data = b''
+            if not data:
+                self._drop(stream)
+                return
+        if mask & selectors.EVENT_WRITE:
+            self._send(stream, b'')
+
+    def _send(self, stream, data):
+        if not stream.send(data):
+            self._drop(stream)
+            return
+        if stream.sock is not None:
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if stream.pending else 0)
+            if self._selector.get_key(stream.sock).events != events:
+                self._selector.modify(stream.sock, events, stream)
+
+    def _drop(self, stream):
+        streams = self._streams.get(stream.owner_id)
+        if streams is None or stream not in streams:
+            return
+        streams.discard(stream)
+        if not streams:
+            del self._streams[stream.owner_id]
+        stream.closed = True
+        if stream.sock is not None:
+            self._selector.unregister(stream.sock)
+            stream.sock.close()
+        else:
+            # Ends the streaming response
+            stream.queue.put(None)
+        self.dropped += 1
+        if not self._streams:
+            # Nobody is listening; start from the newest event next time
+            self.last_id = None
+
+    def _dispatch(self, new):
+        pool = get_pool()
+        conn = pool.acquire()
+        try:
+            if self.last_id is None:
+                self.last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM owner_events').fetchone()[0]
+            for stream in new:
+                self._streams.setdefault(stream.owner_id, set()).add(stream)
+                if stream.sock is not None:
+                    self._selector.register(stream.sock, selectors.EVENT_READ, stream)
+                if stream.last_id is None or stream.last_id >= self.last_id:
+                    stream.last_id = max(stream.last_id or 0, self.last_id)
+                    continue
+                # A reconnecting client: replay what it missed, if it is still stored
+                oldest = conn.execute('SELECT MIN(id) FROM owner_events').fetchone()[0]
+                rows = conn.execute(OWNER_EVENTS_BACKLOG_SQL, (
+                    stream.owner_id, stream.last_id, self.last_id, EVENT_BACKLOG_LIMIT + 1
+                )).fetchall()
+                if len(rows) > EVENT_BACKLOG_LIMIT or oldest is None or oldest > stream.last_id + 1:
+                    self._send(stream, format_event('reload', {}))
+                    stream.last_id = self.last_id
+                else:
+                    self._deliver(conn, stream.owner_id, rows, [stream])
+
+            while self._streams:
+                rows = conn.execute(OWNER_EVENTS_SQL, (self.last_id, EVENT_BATCH_SIZE)).fetchall()
+                if not rows:
+                    break
+                self.last_id = rows[-1]['id']
+                by_owner = {}
+                for row in rows:
+                    if row['owner_id'] in self._streams:
+                        by_owner.setdefault(row['owner_id'], []).append(row)
+                for owner_id, owner_rows in by_owner.items():
+                    self._deliver(conn, owner_id, owner_rows, list(self._streams[owner_id]))
+                if len(rows) < EVENT_BATCH_SIZE:
+                    break
+        finally:
+            pool.release(conn)
+
+    def _deliver(self, conn, owner_id, rows, streams):
+        """Render owner_id's events (each subject once, at its latest id) and send them to streams."""
+        latest = {}
+        for row in rows:
+            latest.pop((row['kind'], row['subject_id']), None)
+            latest[(row['kind'], row['subject_id'])] = row['id']
+        messages = []
+        for (kind, subject_id), event_id in latest.items():
+            if kind == 'request':
+                card = conn.execute(OWNER_REQUEST_CARD_SQL, (subject_id,)).fetchone()
+                if card is None:
+                    continue
+                html = render_template('_owner_request_cards.html', requests=[card])
+                data = {'id': subject_id, 'pet_id': card['pet_id'], 'status': card['status'], 'html': html}
+            elif kind == 'pet':
+                pet = conn.execute(OWNER_PET_CARD_SQL, (subject_id,)).fetchone()
+                if pet is None:
+                    continue
+                html = render_template('_owner_pet_cards.html', pets=[pet])
+                data = {'id': subject_id, 'pet': dict(pet), 'html': html}
+            else:
+                data = {'id': subject_id}
+            messages.append((event_id, format_event(kind, data, event_id)))
+        stats = format_event('stats', owner_stats(conn, owner_id))
+        for stream in streams:
+            unseen = [message for event_id, message in messages if event_id > stream.last_id]
+            stream.last_id = max(stream.last_id, rows[-1]['id'])
+            if unseen:
+                self.sent += len(unseen)
+                self._send(stream, b''.join(unseen) + stats)
+
+    def close(self):
+        """Stop the dispatcher and disconnect every subscriber."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake()
+        self._thread.join()
+        for stream in [s for streams in self._streams.values() for s in streams]:
+            self._drop(stream)
+        self._selector.close()
+        for end in self._waker:
+            end.close()
+        self._thread = self._selector = self._waker = None
+        self._stopping = False
+        self.last_id = None
+
+    def stats(self):
+        streams = [s for streams in list(self._streams.values()) for s in list(streams)]
+        return {
+            'subscribers': len(streams),
+            'detached': sum(s.sock is not None for s in streams),
+            'owners': len(self._streams),
+            'last_id': self.last_id,
+            'sent': self.sent,
+            'dropped': self.dropped
+        }
+
+event_bus = EventBus(app.config['EVENT_POLL_INTERVAL'], app.config['EVENT_HEARTBEAT'])
+
+@app.route('/owner-events')
+def owner_events():
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    # EventSource sends Last-Event-ID when it reconnects; the dashboard passes
+    # ?after= with the newest event id it was rendered from
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    if last_id is None:
+        last_id = request.args.get('after', type=int)
+    owner_id = session['user_id']
+
+    detach = request.environ.get('petlink.detach_socket')
+    if detach is not None:
+        head = ''.join(f'{name}: {value}\r\n' for name, value in EVENT_STREAM_HEADERS.items())
+        sock = detach(f'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n{head}Connection: close\r\n\r\n'.encode()
+                      + EVENT_STREAM_PREAMBLE)
+        event_bus.subscribe(owner_id, last_id, sock)
+        # Never sent: the connection now belongs to the event bus
+        return ''
+
+    stream = event_bus.subscribe(owner_id, last_id)
+
+    def generate():
+        try:
+            yield EVENT_STREAM_PREAMBLE
+            while True:
+                data = stream.queue.get()
+                if data is None:
+                    return
+                yield data
+        finally:
+            event_bus.unsubscribe(stream)
+
+    return Response(generate(), mimetype='text/event-stream', headers=EVENT_STREAM_HEADERS)
+
+# Owner dashboard sections (GET /owner-dashboard/<pets|requests|activity>).
+# The dashboard page renders just the stats; each list is fetched here a page
+# at a time, newest first, with a keyset cursor, so neither the page nor any
+# one fetch grows with the number of pets and requests an owner has.
+OWNER_PETS_PAGE_SIZE = 24
+OWNER_REQUESTS_PAGE_SIZE = 20
+OWNER_ACTIVITY_PAGE_SIZE = 10
+OWNER_PET_STATUSES = ('available', 'adopted')
+OWNER_REQUEST_STATUSES = ('pending',) + MODERATION_STATUSES
+
+def owner_pets_sql(status, after):
+    return f'''
+        SELECT p.*, c.name as category_name
+        FROM pets p
+        JOIN categories c ON p.category_id = c.id
+        WHERE p.owner_id = ?
+        {'AND p.adoption_status = ?' if status else ''}
+        {'AND (p.created_at, p.id) < (?, ?)' if after else ''}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT ?
+    '''
+
+def owner_requests_sql(status, after):
+    return f'''
+        SELECT ar.*, p.name as pet_name, p.breed, u.name as user_name, u.email, u.contact
+        FROM adoption_requests ar
+        JOIN pets p ON ar.pet_id = p.id
+        JOIN users u ON ar.user_id = u.id
+        WHERE ar.owner_id = ?
+        {'AND ar.status = ?' if status else ''}
+        {'AND (ar.created_at, ar.id) < (?, ?)' if after else ''}
+        ORDER BY ar.created_at DESC, ar.id DESC
+        LIMIT ?
+    '''
+
+HOT_QUERIES.extend([
+    ('owner_pets', owner_pets_sql(None, False), (1, OWNER_PETS_PAGE_SIZE + 1), ()),
+    ('owner_pets_status_after', owner_pets_sql('available', True),
+     (1, 'available', '2100-01-01', 0, OWNER_PETS_PAGE_SIZE + 1), ()),
+    ('owner_requests', owner_requests_sql(None, False), (1, OWNER_REQUESTS_PAGE_SIZE + 1), ()),
+    ('owner_requests_status_after', owner_requests_sql('pending', True),
+     (1, 'pending', '2100-01-01', 0, OWNER_REQUESTS_PAGE_SIZE + 1), ()),
+    ('owner_activity_after', owner_activity_sql(True), {
+        'owner': 1, 'at': '2100-01-01', 'type': 'request', 'id': 0,
+        'per_type': OWNER_ACTIVITY_PAGE_SIZE + 1, 'limit': OWNER_ACTIVITY_PAGE_SIZE + 1
+    }, ()),
+])
+
+def fetch_owner_pets(conn, owner_id, status=None, cursor=None, limit=OWNER_PETS_PAGE_SIZE):
+    """Return (pets, next_cursor) for one page of an owner's pets; raises ValueError for a malformed cursor."""
+    after = decode_cursor(cursor, 'op', 2) if cursor else None
+    params = [owner_id, *([status] if status else []), *(after or []), limit + 1]
+    rows = conn.execute(owner_pets_sql(status, after), params).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor('op', rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+def fetch_owner_requests(conn, owner_id, status=None, cursor=None, limit=OWNER_REQUESTS_PAGE_SIZE):
+    """Return (requests, next_cursor) for one page of an owner's adoption requests."""
+    after = decode_cursor(cursor, 'or', 2) if cursor else None
+    params = [owner_id, *([status] if status else []), *(after or []), limit + 1]
+    rows = conn.execute(owner_requests_sql(status, after), params).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor('or', rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+def fetch_owner_activity(conn, owner_id, kind=None, cursor=None, limit=OWNER_ACTIVITY_PAGE_SIZE):
+    """Return (activity, next_cursor) for one page of an owner's activity, optionally of one kind."""
+    after = decode_cursor(cursor, 'oa', 3) if cursor else None
+    params = {'owner': owner_id, 'per_type': limit + 1, 'limit': limit + 1}
+    if after:
+        params.update(zip(('at', 'type', 'id'), after))
+    types = (kind,) if kind else OWNER_ACTIVITY_TYPES
+    rows = conn.execute(owner_activity_sql(bool(after), types), params).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor('oa', rows[-1]['created_at'], rows[-1]['type'], rows[-1]['id'])
+    return rows, next_cursor
+
+# Section -> (fetch, card template, its list variable, filter parameter, filter values, page size)
+OWNER_SECTIONS = {
+    'pets': (fetch_owner_pets, '_owner_pet_cards.html', 'pets', 'status',
+             OWNER_PET_STATUSES, OWNER_PETS_PAGE_SIZE),
+    'requests': (fetch_owner_requests, '_owner_request_cards.html', 'requests', 'status',
+                 OWNER_REQUEST_STATUSES, OWNER_REQUESTS_PAGE_SIZE),
+    'activity': (fetch_owner_activity, '_owner_activity_items.html', 'recent_activity', 'type',
+                 OWNER_ACTIVITY_TYPES, OWNER_ACTIVITY_PAGE_SIZE),
+}
+
+@app.route('/owner-dashboard/<any(pets, requests, activity):section>')
+def owner_dashboard_section(section):
+    """One page of a dashboard list as rendered cards: ?status= or ?type= filters, ?cursor= continues"""
     if 'user_id' not in session or session.get('user_type') != 'owner':
-        return jsonify({'success': False, 'message': 'Unauthorized'})
-    
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    fetch, template, name, param, choices, page_size = OWNER_SECTIONS[section]
+    value = request.args.get(param) or None
+    if value is not None and value not in choices:
+        return jsonify({'error': f"{param} must be one of {', '.join(choices)}"}), 400
     try:
-        data = request.get_json()
-        
         conn = get_db_connection()
-        conn.execute('''
-            INSERT INTO pets (name, category_id, breed, age, health_details, medical_details, image_url, owner_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data['name'], data['category_id'], data['breed'], data['age'],
-            data['health_details'], data['medical_details'], data['image_url'], session['user_id']
-        ))
-        conn.commit()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Pet added successfully!'})
+        try:
+            rows, next_cursor = fetch(conn, session['user_id'], value,
+                                      request.args.get('cursor') or None, page_size_arg(page_size))
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+        result = {
+            'html': render_template(template, **{name: rows}),
+            'count': len(rows),
+            'next_cursor': next_cursor
+        }
+        if section == 'pets':
+            # What the edit form is filled from
+            result['pets'] = [dict(row) for row in rows]
+        return jsonify(result)
     except Exception as e:
-        return jsonify({'success': False, 'message': f'Error: {e}'})
+        return jsonify({'error': str(e)}), 500
 
-@app.route('/update-pet/<int:pet_id>', methods=['POST'])
-def update_pet(pet_id):
-    if 'user_id' not in session or session.get('user_type') != 'owner':
-        return jsonify({'success': False, 'message': 'Unauthorized'})
-    
+# Bulk pet import (POST /import-pets and `flask import-pets`). The upload is
+# parsed and validated a row at a time as it streams in, and valid rows are
+# written with executemany, one transaction per chunk. Within a chunk the
+# per-row AFTER INSERT triggers on pets are dropped, replaced by one set-based
+# statement each over the chunk's new ids, and recreated before the chunk
+# commits, so no other connection ever sees them missing. The pets indexes are
+# kept: the rows are appended in id and created_at order, which costs less
+# than rebuilding the indexes over the whole table afterwards.
+PET_IMPORT_CHUNK_SIZE = 5000
+# Per-row errors listed in the report; all of them are counted
+PET_IMPORT_MAX_ERRORS = 100
+PET_IMPORT_MAX_AGE = 30
+PET_IMPORT_STATUSES = ('available', 'adopted')
+PET_IMPORT_DEFAULT_IMAGE = 'https://images.unsplash.com/photo-1601758228041-f3b2795255f1?w=400'
+PET_IMPORT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+PET_IMPORT_MIMETYPES = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson', 'application/jsonl': 'ndjson'}
+
+PET_IMPORT_SQL = '''
+    INSERT INTO pets (name, category_id, breed, age, health_details, medical_details,
+                      image_url, adoption_status, owner_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Suspended trigger -> the statements that do its work for every pet with id > :first
+PET_IMPORT_TRIGGERS = {
+    'pets_fts_insert': ['''
+        INSERT INTO pets_fts (rowid, name, breed, health_details, medical_details, category_name)
+        SELECT p.id, p.name, p.breed, p.health_details, p.medical_details, c.name
+        FROM pets p
+        LEFT JOIN categories c ON p.category_id = c.id
+        WHERE p.id > :first
+    '''],
+    'owner_stats_pet_insert': ['''
+        INSERT INTO owner_pet_stats (owner_id, adoption_status, pet_count)
+        SELECT owner_id, adoption_status, COUNT(*) FROM pets WHERE id > :first
+        GROUP BY owner_id, adoption_status
+        ON CONFLICT (owner_id, adoption_status) DO UPDATE SET pet_count = pet_count + excluded.pet_count
+    ''', '''
+        INSERT INTO owner_category_stats (owner_id, category_id, pet_count)
+        SELECT owner_id, category_id, COUNT(*) FROM pets WHERE id > :first
+        GROUP BY owner_id, category_id
+        ON CONFLICT (owner_id, category_id) DO UPDATE SET pet_count = pet_count + excluded.pet_count
+    '''],
+    'change_pet_insert': [bump_version("'pets'"), bump_version("'pet:' || id", 'FROM pets WHERE id > :first')],
+}
+
+def insert_pets_bulk(conn, rows):
+    """Insert PET_IMPORT_SQL rows inside the caller's write transaction and return the last new id.
+
+    The search index, owner rollups and change versions are brought up to date
+    once for the whole batch instead of by a trigger per row.
+    """
+    first = conn.execute('SELECT COALESCE(MAX(id), 0) FROM pets').fetchone()[0]
+    placeholders = ', '.join('?' * len(PET_IMPORT_TRIGGERS))
+    triggers = conn.execute(f'''
+        SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})
+    ''', tuple(PET_IMPORT_TRIGGERS)).fetchall()
+    for name, _ in triggers:
+        conn.execute(f'DROP TRIGGER {name}')
+    conn.executemany(PET_IMPORT_SQL, rows)
+    for name, sql in triggers:
+        for statement in PET_IMPORT_TRIGGERS[name]:
+            conn.execute(statement, {'first': first})
+        conn.execute(sql)
+    return conn.execute('SELECT MAX(id) FROM pets').fetchone()[0]
+
+def pet_import_format(filename, mimetype):
+    """'csv' or 'ndjson' as told by an upload's file extension or content type, else None."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    return PET_IMPORT_EXTENSIONS.get(extension) or PET_IMPORT_MIMETYPES.get(mimetype)
+
+def read_pet_import(stream, fmt):
+    """Yield (line number, record, error) for each row of a CSV or NDJSON byte stream as it is read.
+
+    A row that can't be parsed comes with an error message instead of a record;
+    a file that can't be read at all (bad encoding, broken CSV) raises ValueError.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if fmt == 'csv' else None)
+    if fmt == 'ndjson':
+        for number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line), None
+            except ValueError as e:
+                yield number, None, f'invalid JSON: {e}'
+        return
+
+    reader = csv.DictReader(text)
     try:
-        data = request.get_json()
-        
-        conn = get_db_connection()
-        conn.execute('''
-            UPDATE pets SET name = ?, category_id = ?, breed = ?, age = ?, 
-            health_details = ?, medical_details = ?, image_url = ?, adoption_status = ?
-            WHERE id = ? AND owner_id = ?
-        ''', (
-            data['name'], data['category_id'], data['breed'], data['age'],
-            data['health_details'], data['medical_details'], data['image_url'],
-            data['adoption_status'], pet_id, session['user_id']
-        ))
-        conn.commit()
-        conn.close()
+        if reader.fieldnames is None:
+            return
+        reader.fieldnames = [(name or '').strip().lower() for name in reader.fieldnames]
+        missing = [name for name in ('name', 'breed', 'age') if name not in reader.fieldnames]
+        if 'category' not in reader.fieldnames and 'category_id' not in reader.fieldnames:
+            missing.append('category')
+        if missing:
+            raise ValueError(f"missing column(s): {', '.join(missing)}")
+        for record in reader:
+            yield reader.line_num, record, None
+    except csv.Error as e:
+        raise ValueError(f'line {reader.line_num}: {e}')
+
+class PetImport:
+    """One bulk import for an owner: validates records and writes them a chunk per transaction."""
+
+    def __init__(self, conn, owner_id, chunk_size=PET_IMPORT_CHUNK_SIZE):
+        self.owner_id = owner_id
+        self.chunk_size = max(1, chunk_size)
+        # Categories by lowercased name and by id
+        self.categories = {}
+        self.category_names = {}
+        for row in conn.execute('SELECT id, name FROM categories'):
+            self.categories[row['name'].lower()] = self.categories[str(row['id'])] = row['id']
+            self.category_names[row['id']] = row['name']
+        self.pending = []
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.last_id = None
+        self.started = time.perf_counter()
+
+    def validate(self, record):
+        """Return the PET_IMPORT_SQL row for one record, or raise ValueError."""
+        if not isinstance(record, dict):
+            raise ValueError('expected an object')
+
+        def text(field):
+            value = record.get(field)
+            return '' if value is None else str(value).strip()
         
-        return jsonify({'success': True, 'message': 'Pet updated successfully!'})
-    except Exception as e:
-        return jsonify({'success': False, 'message': f'Error: {e}'})
+        name, breed = text('name'), text('breed')
+        if not name:
+            raise ValueError('name is required')
+        if not breed:
+            raise ValueError('breed is required')
+        category = text('category') or text('category_id')
+        if not category:
+            raise ValueError('category is required')
+        category_id = self.categories.get(category.lower())
+        if category_id is None:
+            raise ValueError(f'unknown category {category!r}')
+        if not text('age'):
+            raise ValueError('age is required')
+        try:
+            age = int(text('age'))
+        except ValueError:
+            raise ValueError(f"age must be a whole number, not {text('age')!r}")
+        if not 0 <= age <= PET_IMPORT_MAX_AGE:
+            raise ValueError(f'age must be between 0 and {PET_IMPORT_MAX_AGE}')
+        status = text('adoption_status').lower() or 'available'
+        if status not in PET_IMPORT_STATUSES:
+            raise ValueError(f"adoption_status must be one of {', '.join(PET_IMPORT_STATUSES)}")
+        image_url = text('image_url') or PET_IMPORT_DEFAULT_IMAGE
+        if not image_url.startswith(('http://', 'https://')):
+            raise ValueError('image_url must be an http(s) URL')
+        return (name, category_id, breed, age, text('health_details'), text('medical_details'),
+                image_url, status, self.owner_id)
 
-@app.route('/delete-pet/<int:pet_id>', methods=['POST'])
-def delete_pet(pet_id):
-    if 'user_id' not in session or session.get('user_type') != 'owner':
-        return jsonify({'success': False, 'message': 'Unauthorized'})
-    
-    try:
-        conn = get_db_connection()
-        conn.execute('DELETE FROM pets WHERE id = ? AND owner_id = ?', (pet_id, session['user_id']))
-        conn.commit()
-        conn.close()
+    def run(self, records):
+        """Import (line, record, error) tuples from read_pet_import().
+
+        Valid rows read before the records raise are still written.
+        """
+        try:
+            for line, record, error in records:
+                if error is None:
+                    try:
+                        self.pending.append(self.validate(record))
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    self.failed += 1
+                    if len(self.errors) < PET_IMPORT_MAX_ERRORS:
+                        self.errors.append({'line': line, 'error': error})
+                elif len(self.pending) >= self.chunk_size:
+                    self.flush()
+        finally:
+            self.flush(final=True)
+
+    def flush(self, final=False):
+        """Write the pending rows in one transaction; the final flush also tells the owner's dashboard."""
+        rows, self.pending = self.pending, []
+        if not rows and not (final and self.imported):
+            return
+
+        def write(conn):
+            last_id = insert_pets_bulk(conn, rows) if rows else self.last_id
+            if final:
+                publish_owner_events(conn, self.owner_id, 'pets-imported', [last_id])
+            return last_id
         
-        return jsonify({'success': True, 'message': 'Pet deleted successfully!'})
-    except Exception as e:
-        return jsonify({'success': False, 'message': f'Error: {e}'})
+        self.last_id = run_write(write)
+        self.imported += len(rows)
+        category_ids = {row[1] for row in rows}
+        invalidate_pet_listings({HOME_CACHE_GROUP, adopt_cache_group()} | {
+            adopt_cache_group(self.category_names[category_id]) for category_id in category_ids
+        })
+        if final:
+            event_bus.notify()
 
-@app.route('/update-request-status/<int:request_id>', methods=['POST'])
-def update_request_status(request_id):
+    def report(self):
+        seconds = time.perf_counter() - self.started
+        rows = self.imported + self.failed
+        return {
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(rows / seconds) if seconds else rows
+        }
+
+@app.route('/import-pets', methods=['POST'])
+def import_pets():
     if 'user_id' not in session or session.get('user_type') != 'owner':
-        return jsonify({'success': False, 'message': 'Unauthorized'})
-    
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    # Either a multipart upload (field "file") or the file as the raw request body
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, fmt = upload.stream, pet_import_format(upload.filename, upload.mimetype)
+    else:
+        stream, fmt = request.stream, pet_import_format('', request.mimetype)
+    fmt = request.args.get('format') or fmt
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'success': False, 'message': 'Unknown format; upload a .csv or .ndjson file or pass ?format='}), 400
+
+    pet_import = PetImport(get_db_connection(), session['user_id'])
     try:
-        data = request.get_json()
-        status = data.get('status')
-        
-        conn = get_db_connection()
-        
-        # Update request status
-        conn.execute('UPDATE adoption_requests SET status = ? WHERE id = ?', (status, request_id))
-        
-        # If approved, update pet status
-        if status == 'approved':
-            request_info = conn.execute(
-                'SELECT pet_id FROM adoption_requests WHERE id = ?', (request_id,)
-            ).fetchone()
-            if request_info:
-                conn.execute(
-                    'UPDATE pets SET adoption_status = "adopted" WHERE id = ?',
-                    (request_info['pet_id'],)
-                )
-        
-        conn.commit()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': f'Request {status} successfully!'})
+        pet_import.run(read_pet_import(stream, fmt))
+    except ValueError as e:
+        return jsonify(dict(pet_import.report(), success=False, message=f'Import stopped: {e}')), 400
     except Exception as e:
-        return jsonify({'success': False, 'message': f'Error: {e}'})
+        return jsonify(dict(pet_import.report(), success=False, message=f'Error: {e}')), 500
+
+    report = pet_import.report()
+    message = f"Imported {report['imported']} pet(s)"
+    if report['failed']:
+        message += f", skipped {report['failed']} invalid row(s)"
+    return jsonify(dict(report, success=True, message=message))
 
 @app.route('/search_pets')
+@conditional_get('pets')
 def search_pets():
     try:
         query = request.args.get('q', '').strip()
@@ -693,54 +3424,27 @@ def search_pets():
         
         conn = get_db_connection()
         
-        if query:
-            search_term = f'%{query}%'
-            if status == 'all':
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE (p.name LIKE ? OR p.breed LIKE ?)
-                    GROUP BY p.id
-                    LIMIT 50
-                ''', (search_term, search_term)).fetchall()
-            else:
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE (p.name LIKE ? OR p.breed LIKE ?) AND p.adoption_status = ?
-                    GROUP BY p.id
-                    LIMIT 50
-                ''', (search_term, search_term, status)).fetchall()
-        else:
-            if status == 'all':
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    GROUP BY p.id
-                    LIMIT 50
-                ''').fetchall()
-            else:
-                pets = conn.execute('''
-                    SELECT p.*, c.name as category_name,
-                           COUNT(DISTINCT pl.id) as like_count
-                    FROM pets p 
-                    JOIN categories c ON p.category_id = c.id 
-                    LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                    WHERE p.adoption_status = ?
-                    GROUP BY p.id
-                    LIMIT 50
-                ''', (status,)).fetchall()
+        page_size = page_size_arg(SEARCH_PAGE_SIZE)
         
-        conn.close()
+        match = fts_query(query)
+        if query and not match:
+            # Nothing searchable in the query (e.g. only punctuation)
+            return jsonify({'pets': [], 'next_cursor': None})
+        
+        user_id = session.get('user_id') if session.get('user_type') == 'user' else None
+        listing = PetQuery(
+            text=match,
+            category=request.args.get('category', '').strip(),
+            status=None if status == 'all' else status,
+            owner=request.args.get('owner_id', type=int),
+            min_age=request.args.get('min_age', type=int),
+            max_age=request.args.get('max_age', type=int),
+            liked_by=user_id if request.args.get('liked') == '1' else None
+        )
+        try:
+            pets, next_cursor = listing.fetch_page(conn, page_size, request.args.get('cursor'))
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
         
         # Convert to list of dicts for JSON
         results = []
@@ -756,71 +3460,114 @@ def search_pets():
                 'health_details': pet['health_details'],
                 'like_count': pet['like_count'] or 0
             })
+            if match:
+                results[-1]['name_html'] = highlight_html(pet['name_highlight'])
+                results[-1]['snippet_html'] = highlight_html(pet['snippet'])
         
-        return jsonify(results)
+        return jsonify({'pets': results, 'next_cursor': next_cursor})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/pet/<int:pet_id>')
+@conditional_get('pet:{pet_id}')
 def pet_detail(pet_id):
     try:
         conn = get_db_connection()
         user_id = session.get('user_id') if session.get('user_type') == 'user' else None
         
-        if user_id:
-            pet = conn.execute('''
-                SELECT p.*, c.name as category_name, o.name as owner_name, o.contact as owner_contact,
-                       COUNT(DISTINCT pl.id) as like_count,
-                       MAX(CASE WHEN pl.user_id = ? THEN 1 ELSE 0 END) as is_liked
-                FROM pets p 
-                JOIN categories c ON p.category_id = c.id 
-                LEFT JOIN owners o ON p.owner_id = o.id
-                LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                WHERE p.id = ?
-                GROUP BY p.id
-            ''', (user_id, pet_id)).fetchone()
-        else:
-            pet = conn.execute('''
-                SELECT p.*, c.name as category_name, o.name as owner_name, o.contact as owner_contact,
-                       COUNT(DISTINCT pl.id) as like_count,
-                       0 as is_liked
-                FROM pets p 
-                JOIN categories c ON p.category_id = c.id 
-                LEFT JOIN owners o ON p.owner_id = o.id
-                LEFT JOIN pet_likes pl ON p.id = pl.pet_id
-                WHERE p.id = ?
-                GROUP BY p.id
-            ''', (pet_id,)).fetchone()
-        
-        conn.close()
+        pet = conn.execute('''
+            SELECT p.*, c.name as category_name, o.name as owner_name, o.contact as owner_contact
+            FROM pets p 
+            JOIN categories c ON p.category_id = c.id 
+            LEFT JOIN owners o ON p.owner_id = o.id
+            WHERE p.id = ?
+        ''', (pet_id,)).fetchone()
         
         if not pet:
             flash('Pet not found!', 'error')
             return redirect(url_for('adopt'))
         
+        pet = mark_liked_pets(conn, [dict(pet)], user_id)[0]
+        
         return render_template('pet_detail.html', pet=pet)
     except Exception as e:
         flash(f'Error loading pet details: {e}', 'error')
         return redirect(url_for('adopt'))
 
+# Care forum: the index is newest first with keyset pagination on
+# (created_at, id); a thread is read in id order, a page at a time, and
+# ?after=<comment id> returns just the comments added since
+CARE_PAGE_SIZE = 20
+COMMENT_PAGE_SIZE = 50
+
+def care_posts_sql(after):
+    return f'''
+        SELECT cp.*, u.name as author_name
+        FROM care_posts cp
+        JOIN users u ON cp.user_id = u.id
+        {'WHERE (cp.created_at, cp.id) < (?, ?)' if after else ''}
+        ORDER BY cp.created_at DESC, cp.id DESC
+        LIMIT ?
+    '''
+
+COMMENTS_AFTER_SQL = '''
+    SELECT cc.*, u.name as author_name
+    FROM care_comments cc
+    JOIN users u ON cc.user_id = u.id
+    WHERE cc.post_id = ? AND cc.id > ?
+    ORDER BY cc.id
+    LIMIT ?
+'''
+
+HOT_QUERIES.extend([
+    ('care_posts', care_posts_sql(False), (CARE_PAGE_SIZE + 1,), ()),
+    ('care_posts_after', care_posts_sql(True), ('2100-01-01', 0, CARE_PAGE_SIZE + 1), ()),
+    ('care_comments_after', COMMENTS_AFTER_SQL, (1, 0, COMMENT_PAGE_SIZE + 1), ()),
+])
+
+def fetch_care_posts(conn, cursor=None):
+    """Return (posts, next_cursor) for one page of the forum; raises ValueError for a malformed cursor."""
+    after = decode_cursor(cursor, 'p', 2) if cursor else None
+    rows = conn.execute(care_posts_sql(after), [*(after or []), CARE_PAGE_SIZE + 1]).fetchall()
+    next_cursor = None
+    if len(rows) > CARE_PAGE_SIZE:
+        rows = rows[:CARE_PAGE_SIZE]
+        next_cursor = encode_cursor('p', rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+def fetch_comments(conn, post_id, after=0, limit=COMMENT_PAGE_SIZE):
+    """Return (comments, has_more): up to limit comments of post_id with an id above after."""
+    rows = conn.execute(COMMENTS_AFTER_SQL, (post_id, after, limit + 1)).fetchall()
+    return rows[:limit], len(rows) > limit
+
 @app.route('/care')
+@conditional_get('care', 'users')
 def care_list():
     try:
         conn = get_db_connection()
-        posts = conn.execute('''
-            SELECT cp.*, u.name as author_name,
-                   (SELECT COUNT(*) FROM care_comments WHERE post_id = cp.id) as comment_count
-            FROM care_posts cp
-            JOIN users u ON cp.user_id = u.id
-            ORDER BY cp.created_at DESC
-        ''').fetchall()
-        conn.close()
-        return render_template('care_list.html', posts=posts)
+        cursor = request.args.get('cursor', '')
+        wants_json = request.args.get('format') == 'json'
+        try:
+            posts, next_cursor = fetch_care_posts(conn, cursor)
+        except ValueError:
+            if wants_json:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            posts, next_cursor = fetch_care_posts(conn)
+        
+        if wants_json:
+            # "Load more" on care_list.html appends the rendered cards
+            return jsonify({
+                'html': render_template('_care_post_cards.html', posts=posts),
+                'count': len(posts),
+                'next_cursor': next_cursor
+            })
+        return render_template('care_list.html', posts=posts, next_cursor=next_cursor)
     except Exception as e:
         flash(f'Error loading care tips: {e}', 'error')
         return redirect(url_for('home'))
 
 @app.route('/care/<int:post_id>')
+@conditional_get('care_post:{post_id}', 'users')
 def care_detail(post_id):
     try:
         conn = get_db_connection()
@@ -835,24 +3582,37 @@ def care_detail(post_id):
         
         if not post:
             flash('Post not found!', 'error')
-            conn.close()
             return redirect(url_for('care_list'))
         
-        # Get comments for this post
-        comments = conn.execute('''
-            SELECT cc.*, u.name as author_name
-            FROM care_comments cc
-            JOIN users u ON cc.user_id = u.id
-            WHERE cc.post_id = ?
-            ORDER BY cc.created_at ASC
-        ''', (post_id,)).fetchall()
+        # First page of the thread; the rest loads through care_comments
+        comments, has_more = fetch_comments(conn, post_id)
         
-        conn.close()
-        return render_template('care_detail.html', post=post, comments=comments)
+        return render_template('care_detail.html', post=post, comments=comments, has_more=has_more)
     except Exception as e:
         flash(f'Error loading post: {e}', 'error')
         return redirect(url_for('care_list'))
 
+@app.route('/care/<int:post_id>/comments')
+@conditional_get('care_post:{post_id}', 'users')
+def care_comments(post_id):
+    try:
+        conn = get_db_connection()
+        post = conn.execute('SELECT comment_count FROM care_posts WHERE id = ?', (post_id,)).fetchone()
+        if not post:
+            return jsonify({'error': 'Post not found'}), 404
+        
+        after = request.args.get('after', 0, type=int)
+        comments, has_more = fetch_comments(conn, post_id, after, page_size_arg(COMMENT_PAGE_SIZE))
+        return jsonify({
+            'html': render_template('_care_comments.html', comments=comments),
+            'count': len(comments),
+            'last_id': comments[-1]['id'] if comments else after,
+            'has_more': has_more,
+            'comment_count': post['comment_count']
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/care/<int:post_id>/comment', methods=['POST'])
 def add_comment(post_id):
     if 'user_id' not in session or session.get('user_type') != 'user':
@@ -870,22 +3630,20 @@ def add_comment(post_id):
         # Verify post exists
         post = conn.execute('SELECT id FROM care_posts WHERE id = ?', (post_id,)).fetchone()
         if not post:
-            conn.close()
             return jsonify({'success': False, 'message': 'Post not found!'})
         
-        # Add comment
-        conn.execute('''
+        # Add comment; the trigger keeps care_posts.comment_count in step
+        comment = run_write(lambda conn: conn.execute('''
             INSERT INTO care_comments (post_id, user_id, content)
             VALUES (?, ?, ?)
-        ''', (post_id, session['user_id'], content))
-        
-        conn.commit()
-        conn.close()
+            RETURNING id
+        ''', (post_id, session['user_id'], content)).fetchone())
         
         return jsonify({
             'success': True, 
             'message': 'Comment added successfully!',
-            'author_name': session.get('user_name', 'User')
+            'author_name': session.get('user_name', 'User'),
+            'comment_id': comment['id']
         })
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {e}'})
@@ -905,13 +3663,10 @@ def care_new():
                 flash('Title and content are required!', 'error')
                 return render_template('care_new.html')
             
-            conn = get_db_connection()
-            conn.execute('''
+            run_write(lambda conn: conn.execute('''
                 INSERT INTO care_posts (user_id, title, content)
                 VALUES (?, ?, ?)
-            ''', (session['user_id'], title, content))
-            conn.commit()
-            conn.close()
+            ''', (session['user_id'], title, content)))
             
             flash('Care tip posted successfully!', 'success')
             return redirect(url_for('care_list'))
@@ -927,117 +3682,420 @@ def owner_analytics():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
-        conn = get_db_connection()
-        
-        # Get comprehensive analytics
-        analytics = {
-            'pets_by_status': {},
-            'requests_by_status': {},
-            'requests_by_month': [],
-            'top_pets': [],
-            'category_distribution': []
-        }
-        
-        # Pets by status
-        pets_by_status = conn.execute('''
-            SELECT adoption_status, COUNT(*) as count
-            FROM pets
-            WHERE owner_id = ?
-            GROUP BY adoption_status
-        ''', (session['user_id'],)).fetchall()
-        
-        for row in pets_by_status:
-            analytics['pets_by_status'][row['adoption_status']] = row['count']
-        
-        # Requests by status
-        requests_by_status = conn.execute('''
-            SELECT ar.status, COUNT(*) as count
-            FROM adoption_requests ar
-            JOIN pets p ON ar.pet_id = p.id
-            WHERE p.owner_id = ?
-            GROUP BY ar.status
-        ''', (session['user_id'],)).fetchall()
-        
-        for row in requests_by_status:
-            analytics['requests_by_status'][row['status']] = row['count']
-        
-        # Top pets with details
-        top_pets = conn.execute('''
-            SELECT p.id, p.name, p.breed, p.image_url, c.name as category_name,
-                   COUNT(ar.id) as request_count,
-                   SUM(CASE WHEN ar.status = 'approved' THEN 1 ELSE 0 END) as approved_count,
-                   SUM(CASE WHEN ar.status = 'pending' THEN 1 ELSE 0 END) as pending_count
-            FROM pets p
-            LEFT JOIN adoption_requests ar ON p.id = ar.pet_id
-            JOIN categories c ON p.category_id = c.id
-            WHERE p.owner_id = ?
-            GROUP BY p.id, p.name, p.breed, p.image_url, c.name
-            ORDER BY request_count DESC
-            LIMIT 10
-        ''', (session['user_id'],)).fetchall()
-        
-        analytics['top_pets'] = [dict(row) for row in top_pets]
+        # Request series range and granularity (defaults: the last 12 months, monthly)
+        granularity = request.args.get('granularity', 'month')
+        if granularity not in SERIES_PERIODS:
+            return jsonify({'error': 'granularity must be day, week or month'}), 400
+        try:
+            end = datetime.date.fromisoformat(request.args['to']) if request.args.get('to') else datetime.datetime.now(datetime.timezone.utc).date()
+            if request.args.get('from'):
+                start = datetime.date.fromisoformat(request.args['from'])
+            elif granularity == 'month':
+                first_month = end.year * 12 + end.month - 12
+                start = datetime.date(first_month // 12, first_month % 12 + 1, 1)
+            else:
+                start = end - datetime.timedelta(days=29 if granularity == 'day' else 7 * 11)
+        except ValueError:
+            return jsonify({'error': 'from and to must be YYYY-MM-DD dates'}), 400
+        if start > end:
+            return jsonify({'error': 'from must not be after to'}), 400
+        if (end - start).days >= MAX_SERIES_DAYS:
+            return jsonify({'error': f'Date range is limited to {MAX_SERIES_DAYS} days'}), 400
         
-        # Category distribution
-        category_dist = conn.execute('''
-            SELECT c.name, COUNT(p.id) as pet_count
-            FROM categories c
-            LEFT JOIN pets p ON c.id = p.category_id AND p.owner_id = ?
-            GROUP BY c.id, c.name
-            ORDER BY pet_count DESC
-        ''', (session['user_id'],)).fetchall()
+        conn = get_db_connection()
         
-        analytics['category_distribution'] = [dict(row) for row in category_dist]
+        # Get comprehensive analytics (same data layer as the dashboard page)
+        analytics = owner_dashboard_data(conn, session['user_id'])
+        analytics[f'requests_by_{granularity}'] = request_series(
+            conn, session['user_id'], start, end, granularity
+        )
+        analytics['series_range'] = {'from': start.isoformat(), 'to': end.isoformat(), 'granularity': granularity}
         
-        conn.close()
         return jsonify(analytics)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Owner exports (GET /owner-dashboard/export/<pets|requests>.<csv|ndjson>).
+# Rows are fetched from one cursor a batch at a time and each batch is sent as
+# soon as it is encoded, so memory stays flat however many rows there are.
+# Both queries walk the owner's pets through idx_pets_owner_created, so nothing
+# is sorted up front: pets come oldest first, and requests grouped by pet
+# (oldest pet first, each pet's requests in the order they arrived).
+EXPORT_BATCH_SIZE = 500
+# Exportable columns (name -> SQL expression), in their default order. The
+# pets columns match what `flask import-pets` reads.
+EXPORT_COLUMNS = {
+    'pets': {
+        'id': 'p.id',
+        'name': 'p.name',
+        'category': 'c.name',
+        'breed': 'p.breed',
+        'age': 'p.age',
+        'adoption_status': 'p.adoption_status',
+        'health_details': 'p.health_details',
+        'medical_details': 'p.medical_details',
+        'image_url': 'p.image_url',
+        'like_count': 'p.like_count',
+        'request_count': 'p.request_count',
+        'pending_count': 'p.pending_count',
+        'approved_count': 'p.approved_count',
+        'created_at': 'p.created_at'
+    },
+    'requests': {
+        'id': 'ar.id',
+        'created_at': 'ar.created_at',
+        'status': 'ar.status',
+        'message': 'ar.message',
+        'pet_id': 'p.id',
+        'pet_name': 'p.name',
+        'breed': 'p.breed',
+        'user_name': 'u.name',
+        'email': 'u.email',
+        'contact': 'u.contact'
+    },
+}
+# Dataset -> (alias whose created_at the date range filters, FROM clause, ORDER BY)
+EXPORT_SOURCES = {
+    'pets': ('p', '''
+        FROM pets p
+        LEFT JOIN categories c ON p.category_id = c.id
+    ''', 'p.created_at, p.id'),
+    'requests': ('ar', '''
+        FROM pets p
+        JOIN adoption_requests ar ON ar.pet_id = p.id
+        JOIN users u ON ar.user_id = u.id
+    ''', 'p.created_at, p.id, ar.id'),
+}
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+# CSV cells starting with these get a leading ' so a spreadsheet shows them
+# as text instead of running them as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def export_query(dataset, columns, owner_id, start=None, end=None):
+    """SQL and parameters for an owner's export; start and end (inclusive dates) filter on created_at."""
+    alias, source, order = EXPORT_SOURCES[dataset]
+    where, params = ['p.owner_id = ?'], [owner_id]
+    if start is not None:
+        where.append(f'{alias}.created_at >= ?')
+        params.append(start.isoformat())
+    if end is not None:
+        where.append(f'{alias}.created_at < ?')
+        params.append((end + datetime.timedelta(days=1)).isoformat())
+    select = ', '.join(EXPORT_COLUMNS[dataset][column] for column in columns)
+    return f"SELECT {select} {source} WHERE {' AND '.join(where)} ORDER BY {order}", params
+
+def csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def export_chunks(sql, params, columns, fmt):
+    """Yield the encoded export a batch of rows at a time, reading from a single cursor.
+
+    Runs after the view has returned, so it checks out its own pooled
+    connection and gives it back when the response is finished or abandoned.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    cursor = None
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == 'csv':
+            writer.writerow(columns)
+            yield buffer.getvalue().encode()
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            buffer.seek(0)
+            buffer.truncate()
+            if fmt == 'csv':
+                writer.writerows([csv_cell(value) for value in row] for row in rows)
+            else:
+                buffer.writelines(json.dumps(dict(zip(columns, row))) + '\n' for row in rows)
+            yield buffer.getvalue().encode()
+    finally:
+        if cursor is not None:
+            cursor.close()
+        pool.release(conn)
+
+HOT_QUERIES.extend([
+    ('owner_export_pets', *export_query('pets', list(EXPORT_COLUMNS['pets']), 1,
+                                        datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)), ()),
+    ('owner_export_requests', *export_query('requests', list(EXPORT_COLUMNS['requests']), 1), ()),
+])
+
+@app.route('/owner-dashboard/export/<any(pets, requests):dataset>.<any(csv, ndjson):fmt>')
+def owner_export(dataset, fmt):
+    """Stream the owner's pets or adoption requests as CSV or NDJSON"""
+    if 'user_id' not in session or session.get('user_type') != 'owner':
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    # ?columns=name,breed,... picks and orders the columns (default: all)
+    available = EXPORT_COLUMNS[dataset]
+    columns = list(dict.fromkeys(
+        name.strip() for name in request.args.get('columns', '').split(',') if name.strip()
+    )) or list(available)
+    unknown = [name for name in columns if name not in available]
+    if unknown:
+        return jsonify({'error': f"Unknown column(s): {', '.join(unknown)}; choose from {', '.join(available)}"}), 400
+    try:
+        start = datetime.date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = datetime.date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({'error': 'from and to must be YYYY-MM-DD dates'}), 400
+    if start and end and start > end:
+        return jsonify({'error': 'from must not be after to'}), 400
+
+    sql, params = export_query(dataset, columns, session['user_id'], start, end)
+    filename = f'petlink-{dataset}-{datetime.date.today().isoformat()}.{fmt}'
+    return Response(export_chunks(sql, params, columns, fmt), mimetype=EXPORT_MIMETYPES[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Cache-Control': 'no-store'
+    })
+
+# Like write-behind buffer (PETLINK_LIKE_BUFFER=1)
+class LikeBuffer:
+    """Collects like/unlike toggles in memory and writes them in batched transactions.
+
+    Each (pet_id, user_id) keeps its stored state and the state the user
+    wants, so toggles that cancel out never reach the database. A background
+    thread flushes every interval seconds, or sooner once size keys are
+    pending. The lock is held across a flush, so a toggle never sees a batch
+    counted both in the buffer and in pets.like_count.
+    """
+
+    def __init__(self, interval=0.5, size=1000):
+        self.interval = interval
+        self.size = size
+        self._pending = {}
+        self._deltas = collections.Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
+        self.toggles = 0
+        self.cancelled = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.flush_errors = 0
+
+    def toggle(self, conn, pet_id, user_id, liked=None):
+        """Record a like toggle (or set the state, if liked is given); return (action, like_count).
+
+        Returns None if the pet doesn't exist.
+        """
+        key = (pet_id, user_id)
+        with self._lock:
+            pet = conn.execute('SELECT like_count FROM pets WHERE id = ?', (pet_id,)).fetchone()
+            if pet is None:
+                return None
+            if key in self._pending:
+                stored, current = self._pending[key]
+            else:
+                stored = current = conn.execute(
+                    'SELECT 1 FROM pet_likes WHERE pet_id = ? AND user_id = ?', key
+                ).fetchone() is not None
+            if liked is None:
+                liked = not current
+            if liked == current:
+                pass
+            elif liked == stored:
+                del self._pending[key]
+                self.cancelled += 1
+            else:
+                self._pending[key] = (stored, liked)
+            if liked != current:
+                self._deltas[pet_id] += 1 if liked else -1
+            like_count = pet['like_count'] + self._deltas.get(pet_id, 0)
+            if pet_id in self._deltas and not self._deltas[pet_id]:
+                del self._deltas[pet_id]
+            self.toggles += 1
+            full = len(self._pending) >= self.size
+        self._start()
+        if full:
+            self._wake.set()
+        return ('liked' if liked else 'unliked'), like_count
+
+    def overlay(self, user_id, pet_ids, liked):
+        """Apply the user's buffered toggles to liked, a set of pet ids read from pet_likes."""
+        if not self._pending:
+            return liked
+        with self._lock:
+            for pet_id in pet_ids:
+                entry = self._pending.get((pet_id, user_id))
+                if entry is not None:
+                    if entry[1]:
+                        liked.add(pet_id)
+                    else:
+                        liked.discard(pet_id)
+        return liked
+
+    def flush(self):
+        """Write every pending toggle in one transaction; return how many were written."""
+        if not self._pending:
+            return 0
+        # Check the connection out before locking: requests blocked on the
+        # lock may be holding the pool's other connections
+        pool = get_pool()
+        conn = pool.acquire()
+        with self._lock:
+            if not self._pending:
+                pool.release(conn)
+                return 0
+            likes = [key for key, (stored, liked) in self._pending.items() if liked]
+            unlikes = [key for key, (stored, liked) in self._pending.items() if not liked]
+            pet_ids = list({pet_id for pet_id, user_id in self._pending})
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                # Skip pets deleted while their likes were buffered
+                conn.executemany('''
+                    INSERT OR IGNORE INTO pet_likes (pet_id, user_id)
+                    SELECT ?1, ?2 WHERE EXISTS (SELECT 1 FROM pets WHERE id = ?1)
+                ''', likes)
+                conn.executemany('DELETE FROM pet_likes WHERE pet_id = ? AND user_id = ?', unlikes)
+                groups = set()
+                for start in range(0, len(pet_ids), 500):
+                    groups |= pet_cache_groups(conn, pet_ids[start:start + 500])
+                conn.commit()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                self.flush_errors += 1
+                raise
+            finally:
+                pool.release(conn)
+            written = len(self._pending)
+            self._pending = {}
+            self._deltas.clear()
+            self.flushes += 1
+            self.flushed_rows += written
+        # Cached listings show like counts
+        invalidate_pet_listings(groups)
+        return written
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='like-buffer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The batch stays buffered and is retried on the next interval
+                app.logger.exception('Like buffer flush failed')
+
+    def close(self):
+        """Stop the flusher thread and write whatever is still buffered."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stopping = False
+        return self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': app.config['LIKE_BUFFER_ENABLED'],
+                'pending': len(self._pending),
+                'toggles': self.toggles,
+                'cancelled': self.cancelled,
+                'flushes': self.flushes,
+                'flushed_rows': self.flushed_rows,
+                'flush_errors': self.flush_errors
+            }
+
+like_buffer = LikeBuffer(app.config['LIKE_FLUSH_INTERVAL'], app.config['LIKE_FLUSH_SIZE'])
+# Normal interpreter exit (Ctrl+C, end of a script); `flask serve` workers close it while draining
+atexit.register(like_buffer.close)
+
 @app.route('/like-pet/<int:pet_id>', methods=['POST'])
 def like_pet(pet_id):
     if 'user_id' not in session or session.get('user_type') != 'user':
         return jsonify({'success': False, 'message': 'Please login to like pets.'})
     
     try:
-        conn = get_db_connection()
-        
-        # Check if already liked
-        existing = conn.execute(
-            'SELECT * FROM pet_likes WHERE pet_id = ? AND user_id = ?',
-            (pet_id, session['user_id'])
-        ).fetchone()
+        # {"liked": true/false} sets the state (safe to repeat); no body toggles it
+        data = request.get_json(silent=True) or {}
+        liked = data.get('liked')
+        if liked is not None and not isinstance(liked, bool):
+            return jsonify({'success': False, 'message': 'liked must be true or false.'}), 400
+        user_id = session['user_id']
         
-        if existing:
-            # Unlike
-            conn.execute(
-                'DELETE FROM pet_likes WHERE pet_id = ? AND user_id = ?',
-                (pet_id, session['user_id'])
-            )
-            action = 'unliked'
-        else:
-            # Like
-            conn.execute(
-                'INSERT INTO pet_likes (pet_id, user_id) VALUES (?, ?)',
-                (pet_id, session['user_id'])
-            )
-            action = 'liked'
+        if app.config['LIKE_BUFFER_ENABLED']:
+            # Buffered: the count is pets.like_count plus this pet's unflushed toggles
+            result = like_buffer.toggle(get_db_connection(), pet_id, user_id, liked)
+            if result is None:
+                return jsonify({'success': False, 'message': 'Pet not found.'})
+            action, like_count = result
+            return jsonify({
+                'success': True,
+                'action': action,
+                'like_count': like_count,
+                'message': f'Pet {action} successfully!'
+            })
         
-        # Get updated like count
-        like_count = conn.execute(
-            'SELECT COUNT(*) as count FROM pet_likes WHERE pet_id = ?',
-            (pet_id,)
-        ).fetchone()['count']
+        def already_set(conn):
+            # Asking for the state the pet already has needs no write
+            if liked is None:
+                return None
+            pet = conn.execute('''
+                SELECT like_count, EXISTS(SELECT 1 FROM pet_likes WHERE pet_id = pets.id AND user_id = ?) as liked
+                FROM pets WHERE id = ?
+            ''', (user_id, pet_id)).fetchone()
+            if pet and bool(pet['liked']) == liked:
+                action = 'liked' if liked else 'unliked'
+                return {
+                    'success': True,
+                    'action': action,
+                    'like_count': pet['like_count'],
+                    'message': f'Pet {action} successfully!'
+                }
         
-        conn.commit()
-        conn.close()
+        def set_like(conn):
+            # UNIQUE(pet_id, user_id) decides between like and unlike; no read first
+            changed = None
+            if liked is not False:
+                changed = conn.execute('''
+                    INSERT INTO pet_likes (pet_id, user_id)
+                    SELECT id, ? FROM pets WHERE id = ?
+                    ON CONFLICT (pet_id, user_id) DO NOTHING
+                    RETURNING id
+                ''', (user_id, pet_id)).fetchone()
+            action = 'liked' if changed or liked else 'unliked'
+            if action == 'unliked':
+                changed = conn.execute(
+                    'DELETE FROM pet_likes WHERE pet_id = ? AND user_id = ? RETURNING id', (pet_id, user_id)
+                ).fetchone()
+            
+            # Like count is maintained by the pet_likes triggers
+            pet = conn.execute('SELECT like_count FROM pets WHERE id = ?', (pet_id,)).fetchone()
+            if pet is None:
+                return {'success': False, 'message': 'Pet not found.'}, set()
+            payload = {
+                'success': True,
+                'action': action,
+                'like_count': pet['like_count'],
+                'message': f'Pet {action} successfully!'
+            }
+            # Cached listings show like counts
+            return payload, pet_cache_groups(conn, [pet_id]) if changed else set()
         
-        return jsonify({
-            'success': True,
-            'action': action,
-            'like_count': like_count,
-            'message': f'Pet {action} successfully!'
-        })
+        payload, groups, replayed = keyed_write(set_like, already_set)
+        invalidate_pet_listings(groups)
+        return jsonify(payload)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 422
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {e}'})
 
@@ -1065,20 +4123,20 @@ def delete_profile():
         ).fetchone()
         
         if not user:
-            conn.close()
             return jsonify({'success': False, 'message': 'Incorrect password. Profile deletion cancelled.'})
         
         user_id = session['user_id']
         user_name = user['name']
         
-        # Delete all adoption requests by this user
-        conn.execute('DELETE FROM adoption_requests WHERE user_id = ?', (user_id,))
-        
-        # Delete the user account
-        conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
+        def delete_user(conn):
+            # Delete all adoption requests by this user
+            conn.execute('DELETE FROM adoption_requests WHERE user_id = ?', (user_id,))
+            conn.execute('DELETE FROM idempotency_keys WHERE user_id = ?', (user_id,))
+            
+            # Delete the user account
+            conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
         
-        conn.commit()
-        conn.close()
+        run_write(delete_user)
         
         # Clear session
         session.clear()
@@ -1091,6 +4149,434 @@ def delete_profile():
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error deleting profile: {e}'})
 
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending schema migrations."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    version = migrate(conn)
+    conn.close()
+    print(f"Schema is at version {version}")
+
+@app.cli.command('seed')
+@click.option('--no-sample-pets', is_flag=True, help='Only create the demo owner account.')
+@click.option('--remove-duplicates', is_flag=True,
+              help='Delete extra copies of the sample pets that no request or like refers to.')
+def seed_command(no_sample_pets, remove_duplicates):
+    """Load the demo owner and sample pets (skips rows that already exist)."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    migrate(conn)
+    added, removed = seed_db(conn, sample_pets=not no_sample_pets, remove_duplicates=remove_duplicates)
+    conn.close()
+    print(f"Seeded {added} row(s), removed {removed} duplicate pet(s)")
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Fail if any hot query falls back to a full table scan."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    migrate(conn)
+    problems = find_full_scans(conn)
+    conn.close()
+    for name, detail in problems:
+        print(f"{name}: {detail}")
+    if problems:
+        raise SystemExit(f"{len(problems)} hot query plan(s) use a full table scan")
+    print(f"All {len(HOT_QUERIES)} hot queries use indexes")
+
+@app.cli.command('reconcile-like-counts')
+def reconcile_like_counts_command():
+    """Recompute pets.like_count from pet_likes and report drifted rows."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    try:
+        migrate(conn)
+        cursor = conn.execute('''
+            UPDATE pets
+            SET like_count = (SELECT COUNT(*) FROM pet_likes WHERE pet_id = pets.id)
+            WHERE like_count != (SELECT COUNT(*) FROM pet_likes WHERE pet_id = pets.id)
+        ''')
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"Reconciled like_count on {cursor.rowcount} pet(s)")
+
+@app.cli.command('rebuild-owner-stats')
+def rebuild_owner_stats_command():
+    """Recompute the owner analytics rollups from pets and adoption_requests."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    migrate(conn)
+    conn.execute('BEGIN IMMEDIATE')
+    rebuild_owner_stats(conn)
+    conn.commit()
+    conn.close()
+    print("Owner analytics rollups rebuilt")
+
+@app.cli.command('prune-idempotency-keys')
+def prune_idempotency_keys_command():
+    """Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL_HOURS."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    migrate(conn)
+    cursor = conn.execute("DELETE FROM idempotency_keys WHERE created_at < datetime('now', ?)",
+                          (idempotency_cutoff(),))
+    conn.commit()
+    conn.close()
+    print(f"Pruned {cursor.rowcount} idempotency key(s)")
+
+@app.cli.command('build-assets')
+@click.option('--clean', is_flag=True, help='Also delete fingerprinted files from older builds.')
+def build_assets_command(clean):
+    """Write the fingerprinted static assets and their gzip/brotli variants to static/dist."""
+    manifest = build_assets(clean=clean)
+    for source, built in manifest.items():
+        print(f"{source} -> static/{built}")
+    if not brotli:
+        print("brotli is not installed; only gzip variants were built")
+
+@app.cli.command('check-owner-stats')
+def check_owner_stats_command():
+    """Fail if any owner analytics rollup disagrees with a full recount."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    migrate(conn)
+    drift = check_owner_stats(conn)
+    conn.close()
+    for name, rows in drift.items():
+        print(f"{name}: {rows} row(s) out of date")
+    if drift:
+        raise SystemExit("Owner analytics rollups are out of date; run `flask rebuild-owner-stats`")
+    print("Owner analytics rollups are consistent")
+
+@app.cli.command('import-pets')
+@click.argument('file', type=click.File('rb'))
+@click.option('--owner', 'owner_email', required=True, help='Email of the owner account the pets are added to.')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), help='Defaults to the file extension.')
+@click.option('--chunk-size', type=int, default=PET_IMPORT_CHUNK_SIZE, show_default=True,
+              help='Rows written per transaction.')
+def import_pets_command(file, owner_email, fmt, chunk_size):
+    """Bulk-load pets from a CSV or NDJSON file ('-' reads stdin)."""
+    fmt = fmt or pet_import_format(file.name, None)
+    if fmt is None:
+        raise click.UsageError('Cannot tell the format from the file name; pass --format')
+    conn = sqlite3.connect(app.config['DATABASE'])
+    migrate(conn)
+    conn.close()
+    owner = get_db_connection().execute('SELECT id FROM owners WHERE email = ?', (owner_email,)).fetchone()
+    if owner is None:
+        raise SystemExit(f"No owner account with email {owner_email}")
+
+    pet_import = PetImport(get_db_connection(), owner['id'], chunk_size)
+    stopped = None
+    try:
+        pet_import.run(read_pet_import(file, fmt))
+    except ValueError as e:
+        stopped = e
+    report = pet_import.report()
+    for error in report['errors']:
+        print(f"line {error['line']}: {error['error']}")
+    if report['failed'] > len(report['errors']):
+        print(f"... and {report['failed'] - len(report['errors'])} more invalid row(s)")
+    print(f"Imported {report['imported']} pet(s), skipped {report['failed']} invalid row(s) "
+          f"in {report['seconds']:.2f}s ({report['rows_per_second']} rows/s)")
+    if stopped:
+        raise SystemExit(f"Import stopped: {stopped}")
+
+# Production server (`flask serve`)
+# The parent migrates the database once, opens the listening socket and forks
+# the workers; each worker warms up, then accepts on the shared socket and hands
+# connections to a fixed set of threads. SIGTERM/SIGINT stop accepting and let
+# in-flight and queued requests finish before the worker exits. Event streams
+# (/owner-events) take their socket off the request thread; see EventBus.
+class ServeRequestHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # An idle keep-alive connection gives its thread back after this long
+    timeout = app.config['SERVE_KEEPALIVE']
+
+    def make_environ(self):
+        environ = super().make_environ()
+        environ['petlink.detach_socket'] = self.detach_socket
+        return environ
+
+    def detach_socket(self, head):
+        """Send head on the raw socket and give the connection to the caller.
+
+        The response the app then returns is discarded, and the server
+        neither keeps this thread on the connection nor closes it.
+        """
+        self.connection.sendall(head)
+        self.server.detached.add(self.connection)
+        self.wfile = io.BytesIO()
+        self.close_connection = True
+        return self.connection
+
+    def handle_one_request(self):
+        super().handle_one_request()
+        if self.server.draining:
+            self.close_connection = True
+
+class PreforkWSGIServer(BaseWSGIServer):
+    """Serves an inherited listening socket with a fixed number of threads."""
+    multithread = True
+
+    def __init__(self, listener, threads):
+        host, port = listener.getsockname()[:2]
+        super().__init__(host, port, app, handler=ServeRequestHandler, fd=listener.fileno())
+        self.draining = False
+        self.detached = set()
+        self.connections = queue.Queue()
+        self.threads = [threading.Thread(target=self.handle_connections, daemon=True) for _ in range(threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def process_request(self, request, client_address):
+        self.connections.put((request, client_address))
+
+    def handle_connections(self):
+        while True:
+            item = self.connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def shutdown_request(self, request):
+        if request in self.detached:
+            self.detached.discard(request)
+            return
+        super().shutdown_request(request)
+
+    def drain(self, timeout):
+        """Finish accepted connections; return how many threads were still busy at the timeout."""
+        for _ in self.threads:
+            self.connections.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        return sum(thread.is_alive() for thread in self.threads)
+
+def warm_up():
+    """Open every pooled connection and compile every template; returns the counts."""
+    pool = get_pool()
+    conns = [pool.acquire() for _ in range(pool.size)]
+    for conn in conns:
+        pool.release(conn)
+    templates = app.jinja_env.list_templates()
+    for name in templates:
+        app.jinja_env.get_template(name)
+    return len(conns), len(templates)
+
+def run_worker(listener, threads):
+    started = time.perf_counter()
+    # Forked workers would otherwise share the parent's retry jitter
+    random.seed()
+    connections, templates = warm_up()
+    server = PreforkWSGIServer(listener, threads)
+
+    def stop(signum, frame):
+        if not server.draining:
+            server.draining = True
+            # shutdown() waits for serve_forever(), so it cannot run on this thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Worker {os.getpid()} ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({connections} connections, {templates} templates, {threads} threads)")
+    server.serve_forever()
+    busy = server.drain(app.config['SERVE_DRAIN_TIMEOUT'])
+    # Forked workers leave through os._exit(), which skips atexit
+    like_buffer.close()
+    event_bus.close()
+    close_pool()
+    if busy:
+        print(f"Worker {os.getpid()} stopped with {busy} request(s) still running")
+    else:
+        print(f"Worker {os.getpid()} stopped")
+
+def serve(host, port, workers, threads):
+    # Schema changes happen here, once; workers only read the database
+    init_db()
+    close_pool()
+    listener = socket.create_server((host, port), backlog=1024)
+    print(f"PetLink serving on http://{host}:{port} with {workers} worker(s) x {threads} thread(s)")
+    if workers == 1:
+        run_worker(listener, threads)
+        listener.close()
+        return
+
+    children = set()
+    stopping = []
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(listener, threads)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children.add(pid)
+
+    def stop(signum, frame):
+        if not stopping:
+            stopping.append(signum)
+            print("Shutting down: draining workers...")
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; starting a replacement")
+            time.sleep(1)
+            spawn()
+    listener.close()
+    print("PetLink stopped")
+
+@app.cli.command('serve', with_appcontext=False)
+@click.option('--host', default=app.config['SERVE_HOST'], show_default=True)
+@click.option('--port', type=int, default=app.config['SERVE_PORT'], show_default=True)
+@click.option('--workers', type=click.IntRange(min=1), default=app.config['SERVE_WORKERS'], show_default=True,
+              help='Worker processes (forked; use 1 where os.fork is unavailable).')
+@click.option('--threads', type=click.IntRange(min=1), default=app.config['SERVE_THREADS'], show_default=True,
+              help='Request threads per worker.')
+def serve_command(host, port, workers, threads):
+    """Serve the app with pre-forked, warmed-up worker processes."""
+    if workers > 1 and not hasattr(os, 'fork'):
+        raise click.UsageError('--workers > 1 needs os.fork; use --workers 1 --threads N on this platform')
+    serve(host, port, workers, threads)
+
+# Per-request instrumentation
+@app.before_request
+def start_request_metrics():
+    if app.config['METRICS_ENABLED']:
+        g.request_started = time.perf_counter()
+        g.sql_stats = {'statements': 0, 'seconds': 0.0}
+
+def record_request_metrics(status):
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    endpoint = current_endpoint()
+    REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, request.method, str(status))
+    REQUEST_SQL_STATEMENTS.observe(g.sql_stats['statements'], endpoint)
+    REQUEST_SQL_SECONDS.observe(g.sql_stats['seconds'], endpoint)
+
+@app.after_request
+def record_response_metrics(response):
+    record_request_metrics(response.status_code)
+    return response
+
+@app.teardown_request
+def record_failed_request_metrics(exception):
+    # Only still pending if the view raised before a response was made
+    record_request_metrics(500)
+
+@before_render_template.connect_via(app)
+def start_template_timer(sender, template, context, **extra):
+    if app.config['METRICS_ENABLED']:
+        g.setdefault('template_timers', []).append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def record_template_time(sender, template, context, **extra):
+    timers = g.get('template_timers')
+    if timers:
+        TEMPLATE_SECONDS.observe(time.perf_counter() - timers.pop(), template.name or 'string')
+
+LOOPBACK_ADDRS = {'127.0.0.1', '::1'}
+
+def operator_only(view):
+    """Restrict an instrumentation view to holders of METRICS_TOKEN.
+
+    With no token configured only loopback clients are let in, so a fresh
+    deploy does not publish its query log and pool counters to the world.
+    """
+    @functools.wraps(view)
+    def wrapper(**kwargs):
+        token = app.config['METRICS_TOKEN']
+        if token:
+            scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+            allowed = scheme.lower() == 'bearer' and hmac.compare_digest(supplied.encode(), token.encode())
+        else:
+            allowed = request.remote_addr in LOOPBACK_ADDRS
+        if not allowed:
+            return jsonify({'error': 'Forbidden'}), 403
+        return view(**kwargs)
+    return wrapper
+
+def gauge_lines(name, help_text, value, metric_type='gauge'):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {value}']
+
+@app.route('/metrics')
+@operator_only
+def metrics():
+    lines = []
+    for metric in (REQUEST_SECONDS, REQUEST_SQL_STATEMENTS, REQUEST_SQL_SECONDS, TEMPLATE_SECONDS, SLOW_QUERIES):
+        lines.extend(metric.render())
+    
+    pool = get_pool().stats()
+    lines += gauge_lines('petlink_db_pool_open', 'Open pooled connections', pool['open'])
+    lines += gauge_lines('petlink_db_pool_in_use', 'Checked-out pooled connections', pool['in_use'])
+    lines += gauge_lines('petlink_db_pool_waiting', 'Requests waiting for a connection', pool['waiting'])
+    lines += gauge_lines('petlink_db_pool_waits_total', 'Acquires that had to wait', pool['waits'], 'counter')
+    lines += gauge_lines('petlink_db_pool_timeouts_total', 'Acquires that timed out', pool['timeouts'], 'counter')
+    
+    cache = page_cache.stats()
+    lines += gauge_lines('petlink_page_cache_hits_total', 'Listing cache hits', cache['hits'], 'counter')
+    lines += gauge_lines('petlink_page_cache_misses_total', 'Listing cache misses', cache['misses'], 'counter')
+    lines += gauge_lines('petlink_page_cache_entries', 'Cached listings and fragments', cache['size'])
+    
+    likes = like_buffer.stats()
+    lines += gauge_lines('petlink_like_buffer_pending', 'Buffered like toggles not yet written', likes['pending'])
+    lines += gauge_lines('petlink_like_buffer_flushes_total', 'Like buffer flush transactions', likes['flushes'], 'counter')
+    lines += gauge_lines('petlink_like_buffer_flush_errors_total', 'Failed like buffer flushes', likes['flush_errors'], 'counter')
+    
+    events = event_bus.stats()
+    lines += gauge_lines('petlink_event_subscribers', 'Open owner dashboard event streams', events['subscribers'])
+    lines += gauge_lines('petlink_events_sent_total', 'Dashboard events sent to subscribers', events['sent'], 'counter')
+    
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/slow-queries')
+@operator_only
+def slow_queries():
+    return jsonify({'threshold_ms': app.config['SLOW_QUERY_MS'], 'queries': list(slow_query_log)})
+
+@app.route('/cache-stats')
+@operator_only
+def cache_stats():
+    return jsonify(page_cache.stats())
+
+@app.route('/db-stats')
+@operator_only
+def db_stats():
+    stats = get_pool().stats()
+    sql_cache = pet_listing_sql.cache_info()
+    stats['pet_listing_sql_cache'] = {
+        'hits': sql_cache.hits,
+        'misses': sql_cache.misses,
+        'shapes': sql_cache.currsize,
+        'max_shapes': sql_cache.maxsize,
+        'statement_cache_size': app.config['DB_STATEMENT_CACHE_SIZE']
+    }
+    stats['like_buffer'] = like_buffer.stats()
+    stats['event_bus'] = event_bus.stats()
+    return jsonify(stats)
+
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -1102,13 +4588,21 @@ def internal_error(error):
 
 if __name__ == '__main__':
     print("🐾 Starting PetLink Application...")
+    # A checkout has nothing in static/dist yet; production builds it at deploy time
+    asset_manifest.update(build_assets())
+    SOURCE_VERSION = source_version()
     print("Initializing database...")
     init_db()
+    # The development server also loads the demo account; production uses `flask seed`
+    conn = sqlite3.connect(app.config['DATABASE'])
+    seed_db(conn)
+    conn.close()
     print("Database ready!")
     print("\n" + "="*50)
     print("🌐 PetLink is running!")
     print("📍 Main site: http://localhost:5000")
     print("🔑 Owner login: http://localhost:5000/owner-login")
     print("📧 Demo owner: admin@petlink.com / admin123")
+    print("🚀 Production: flask --app app serve --workers N --threads N")
     print("="*50)
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
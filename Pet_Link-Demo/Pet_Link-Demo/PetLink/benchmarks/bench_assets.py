@@ -0,0 +1,94 @@
+"""Bytes per page view, before and after moving base.html's CSS/JS to static assets.
+
+Renders pages of a freshly seeded database through the Flask test client
+and reports, per page:
+
+  * inline: the page with the stylesheet and scripts put back inline, as
+    base.html sent them on every view before they were extracted,
+  * first view: the HTML plus every linked asset, as transferred with
+    Accept-Encoding (gzip, and brotli if installed),
+  * repeat view: the HTML alone, since the fingerprinted assets are cached
+    as immutable for a year.
+
+HTML sizes are shown uncompressed and gzipped (as a compressing reverse
+proxy would send them).
+
+    python benchmarks/bench_assets.py
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAGES = ['/', '/adopt', '/pet/1', '/care', '/login']
+ASSET_TAG = re.compile(r'<link href="(/static/dist/[^"]+\.css)" rel="stylesheet">'
+                       r'|<script src="(/static/dist/[^"]+\.js)"></script>')
+
+
+def gzipped(data):
+    return len(gzip.compress(data, compresslevel=6))
+
+
+def inline(html, client):
+    # Put each asset back where base.html used to have it
+    def replace(match):
+        css, js = match.groups()
+        body = client.get(css or js).get_data(as_text=True)
+        return f'<style>{body}</style>' if css else f'<script>{body}</script>'
+    return ASSET_TAG.sub(replace, html).encode()
+
+
+def measure(petlink, encoding):
+    client = petlink.app.test_client()
+    results = {}
+    for page in PAGES:
+        html = client.get(page).data
+        assets = [css or js for css, js in ASSET_TAG.findall(html.decode())]
+        transferred = sum(len(client.get(url, headers={'Accept-Encoding': encoding}).data) for url in assets)
+        before = inline(html.decode(), client)
+        results[page] = {
+            'inline_bytes': len(before),
+            'inline_gzip_bytes': gzipped(before),
+            'html_bytes': len(html),
+            'html_gzip_bytes': gzipped(html),
+            'assets': len(assets),
+            'asset_bytes': transferred,
+            'first_view_bytes': len(html) + transferred,
+            'repeat_view_bytes': len(html)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    os.environ['PETLINK_DB'] = os.path.join(tempfile.mkdtemp(prefix='petlink-assets-'), 'petlink.db')
+    import app as petlink
+    petlink.asset_manifest.update(petlink.build_assets())
+    petlink.init_db()
+    conn = sqlite3.connect(petlink.app.config['DATABASE'])
+    petlink.seed_db(conn)
+    conn.close()
+
+    encoding = ', '.join(encoding for encoding, _ in petlink.ASSET_ENCODINGS)
+    results = measure(petlink, encoding)
+    if args.json:
+        print(json.dumps({'accept_encoding': encoding, 'pages': results}, indent=2))
+        return
+    print(f"Accept-Encoding: {encoding}")
+    print(f"{'page':<10}{'inline':>10}{'gz':>8}{'html':>10}{'gz':>8}{'assets':>10}{'first':>10}{'repeat':>10}")
+    for page, r in results.items():
+        print(f"{page:<10}{r['inline_bytes']:>10}{r['inline_gzip_bytes']:>8}{r['html_bytes']:>10}"
+              f"{r['html_gzip_bytes']:>8}{r['asset_bytes']:>10}{r['first_view_bytes']:>10}{r['repeat_view_bytes']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Bulk pet import throughput and memory, against adding the same pets one by one.
+
+Generates a datagen.py dataset, writes a CSV or NDJSON file of --rows pets
+for one of its owners, and uploads it to POST /import-pets through the Flask
+test client as a streamed request body. For comparison, --baseline pets are
+added through POST /add-pet, one request (and transaction) each.
+
+Reports rows per second for both. With --trace-memory it also reports the
+peak Python heap (tracemalloc, which slows the import down) during the
+import; it stays flat as --rows grows, since the upload is parsed a row at
+a time and written a chunk at a time. (Process RSS also counts SQLite's
+page cache and the memory-mapped database file.)
+
+    python benchmarks/bench_import.py --rows 100000 --format csv
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import app as petlink
+import datagen
+
+CATEGORIES = ['Dogs', 'Cats', 'Birds', 'Others']
+BREEDS = ['Golden Retriever', 'Beagle', 'Maine Coon', 'Siamese', 'Budgie', 'Rabbit']
+CONTENT_TYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def pet(rng, i):
+    return {
+        'name': f'Imported {i}',
+        'category': rng.choice(CATEGORIES),
+        'breed': rng.choice(BREEDS),
+        'age': rng.randint(0, 15),
+        'health_details': 'Vaccinated, dewormed',
+        'medical_details': 'Microchipped',
+        'image_url': '',
+        'adoption_status': 'available'
+    }
+
+
+def write_file(path, fmt, rows, seed):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=list(pet(rng, 0)))
+            writer.writeheader()
+            for i in range(rows):
+                writer.writerow(pet(rng, i))
+        else:
+            for i in range(rows):
+                f.write(json.dumps(pet(rng, i)) + '\n')
+
+
+def owner_client():
+    client = petlink.app.test_client()
+    client.post('/owner-login', data={'email': 'owner0@bench.petlink', 'password': datagen.PASSWORD})
+    return client
+
+
+def run_import(path, fmt, trace_memory=False):
+    client = owner_client()
+    if trace_memory:
+        tracemalloc.start()
+    with open(path, 'rb') as f:
+        started = time.perf_counter()
+        response = client.post(f'/import-pets?format={fmt}', input_stream=f,
+                               content_length=os.path.getsize(path), content_type=CONTENT_TYPES[fmt])
+        elapsed = time.perf_counter() - started
+    result = response.get_json()
+    results = {
+        'status': response.status_code,
+        'imported': result['imported'],
+        'failed': result['failed'],
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(result['imported'] / elapsed)
+    }
+    if trace_memory:
+        results['peak_python_heap_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+    return results
+
+
+def run_baseline(rows, seed):
+    client = owner_client()
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for i in range(rows):
+        data = pet(rng, i)
+        data.update(category_id=CATEGORIES.index(data.pop('category')) + 1, image_url='https://example.com/pet.jpg')
+        client.post('/add-pet', json=data)
+    elapsed = time.perf_counter() - started
+    return {'added': rows, 'seconds': round(elapsed, 3), 'rows_per_second': round(rows / elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000, help='pets in the imported file')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    parser.add_argument('--baseline', type=int, default=2000, help='pets added one by one through /add-pet (0 skips)')
+    parser.add_argument('--scale', choices=sorted(datagen.SCALES), default='small', help='dataset imported into')
+    parser.add_argument('--trace-memory', action='store_true', help='report the peak Python heap of the import')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='petlink-import-')
+    path = os.path.join(workdir, 'petlink.db')
+    dataset = datagen.generate(path, seed=args.seed, **datagen.SCALES[args.scale])
+    upload = os.path.join(workdir, f'pets.{args.format}')
+    write_file(upload, args.format, args.rows, args.seed)
+
+    petlink.close_pool()
+    petlink.app.config['DATABASE'] = path
+    petlink.app.config['METRICS_ENABLED'] = False
+    # Each chunk's search index catch-up is logged as a slow query
+    petlink.app.logger.setLevel(logging.ERROR)
+
+    results = {'dataset_pets': dataset['pets'], 'file_bytes': os.path.getsize(upload)}
+    results['import'] = run_import(upload, args.format, args.trace_memory)
+    if args.baseline:
+        results['add_pet'] = run_baseline(args.baseline, args.seed)
+    petlink.close_pool()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
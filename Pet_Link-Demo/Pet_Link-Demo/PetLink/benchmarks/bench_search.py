@@ -0,0 +1,142 @@
+"""Search benchmark: LIKE scan vs. the FTS5 index behind /search_pets.
+
+Builds a synthetic catalog (500k pets by default) in a scratch database,
+then times type-ahead style queries (growing prefixes, as typed into
+_search_component.html) against the old `name LIKE '%q%' OR breed LIKE '%q%'`
+query and the FTS5 query used by search_pets().
+
+    python benchmarks/bench_search.py --pets 500000
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as petlink
+
+NAMES = ['Buddy', 'Luna', 'Max', 'Bella', 'Charlie', 'Daisy', 'Rocky', 'Milo', 'Coco', 'Shadow',
+         'Oliver', 'Lucy', 'Bailey', 'Whiskers', 'Tweety', 'Mittens', 'Simba', 'Nala', 'Pepper', 'Ziggy']
+BREEDS = ['Golden Retriever', 'Labrador', 'German Shepherd', 'Bulldog', 'Beagle', 'Poodle',
+          'Persian', 'Maine Coon', 'Siamese', 'Bengal', 'Cockatiel', 'Canary', 'Parrot', 'Rabbit',
+          'Hamster', 'Dachshund', 'Husky', 'Ragdoll', 'Sphynx', 'Budgerigar']
+HEALTH = ['Healthy and energetic', 'Calm and friendly', 'Playful kitten', 'Loves to sing',
+          'Great with kids', 'Quiet and gentle', 'Needs daily walks', 'Shy at first']
+MEDICAL = ['Vaccinated, neutered', 'Vaccinated, spayed', 'All vaccinations up to date',
+           'Microchipped', 'Regular health checkups', 'On a special diet']
+TYPED = ['g', 'go', 'gol', 'gold', 'golden', 'golden r', 'golden ret',
+         'm', 'ma', 'mai', 'main', 'maine', 'maine c',
+         'vacc', 'micro', 'bud', 'sh', 'shy', 'husk']
+
+
+def build_catalog(path, pets, seed):
+    petlink.app.config['DATABASE'] = path
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    petlink.migrate(conn)
+    conn.executemany('INSERT OR IGNORE INTO categories (name) VALUES (?)',
+                     [(name,) for name in ('Dogs', 'Cats', 'Birds', 'Others')])
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    batch = []
+    for i in range(pets):
+        batch.append((
+            f'{rng.choice(NAMES)} {i}', rng.randint(1, 4), rng.choice(BREEDS), rng.randint(1, 15),
+            rng.choice(HEALTH), rng.choice(MEDICAL),
+            'available' if rng.random() < 0.7 else 'adopted', 1
+        ))
+        if len(batch) == 10000:
+            conn.executemany('''
+                INSERT INTO pets (name, category_id, breed, age, health_details, medical_details, adoption_status, owner_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', batch)
+            batch = []
+    if batch:
+        conn.executemany('''
+            INSERT INTO pets (name, category_id, breed, age, health_details, medical_details, adoption_status, owner_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+    return time.perf_counter() - started
+
+
+def like_search(conn, query, status):
+    term = f'%{query}%'
+    sql = '''
+        SELECT p.*, c.name as category_name
+        FROM pets p
+        JOIN categories c ON p.category_id = c.id
+        WHERE (p.name LIKE ? OR p.breed LIKE ?)
+    '''
+    params = [term, term]
+    if status != 'all':
+        sql += ' AND p.adoption_status = ?'
+        params.append(status)
+    return conn.execute(sql + ' LIMIT 50', params).fetchall()
+
+
+def fts_search(client, query, status):
+    response = client.get('/search_pets', query_string={'q': query, 'status': status})
+    return response.get_json()
+
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        for query in TYPED:
+            started = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'mean_ms': round(statistics.mean(samples), 3),
+        'p50_ms': round(samples[len(samples) // 2], 3),
+        'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 3),
+        'max_ms': round(samples[-1], 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pets', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--status', default='all')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='petlink-search-'), 'petlink.db')
+    build_seconds = build_catalog(path, args.pets, args.seed)
+    petlink.close_pool()
+
+    conn = sqlite3.connect(path)
+    client = petlink.app.test_client()
+    results = {
+        'pets': args.pets,
+        'insert_with_fts_seconds': round(build_seconds, 1),
+        'like_scan': time_calls(lambda q: like_search(conn, q, args.status), args.repeat),
+        'fts5_endpoint': time_calls(lambda q: fts_search(client, q, args.status), args.repeat)
+    }
+    conn.close()
+    petlink.close_pool()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.pets} pets inserted (with FTS triggers) in {results['insert_with_fts_seconds']}s")
+    print(f"{'query':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name in ('like_scan', 'fts5_endpoint'):
+        r = results[name]
+        print(f"{name:<16}{r['mean_ms']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['max_ms']:>10}")
+
+
+if __name__ == '__main__':
+    main()
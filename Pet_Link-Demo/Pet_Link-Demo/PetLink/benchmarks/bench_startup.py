@@ -0,0 +1,134 @@
+"""Cold-start benchmark for PetLink.
+
+Starts fresh Python processes the way a worker would (import the app, call
+init_db(), serve a first request) and times each step, against:
+
+  * a new, empty database (all migrations run, then `flask seed`),
+  * a database whose schema is already current (init_db() only reads),
+  * a datagen.py dataset, to show the current-schema path does not grow with data,
+  * several workers starting at once on a new database.
+
+It also checks the database and WAL files are untouched when the schema is
+current, i.e. the worker started without a write transaction.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+
+def child(path, seed):
+    # Runs in the measured process: each step is timed from interpreter start
+    started = time.perf_counter()
+    os.environ['PETLINK_DB'] = path
+    import app as petlink
+    imported = time.perf_counter()
+    petlink.init_db()
+    initialized = time.perf_counter()
+    if seed:
+        conn = petlink.sqlite3.connect(path)
+        petlink.seed_db(conn)
+        conn.close()
+    seeded = time.perf_counter()
+    response = petlink.app.test_client().get('/')
+    served = time.perf_counter()
+    print(json.dumps({
+        'status': response.status_code,
+        'import_ms': (imported - started) * 1000,
+        'init_db_ms': (initialized - imported) * 1000,
+        'seed_ms': (seeded - initialized) * 1000,
+        'first_request_ms': (served - seeded) * 1000
+    }))
+
+
+def file_state(path):
+    return {suffix: (os.stat(path + suffix).st_size, os.stat(path + suffix).st_mtime_ns)
+            for suffix in ('', '-wal') if os.path.exists(path + suffix)}
+
+
+def start(path, seed=False):
+    command = [sys.executable, os.path.abspath(__file__), '--child', path] + (['--seed'] if seed else [])
+    return subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                            env=dict(os.environ, PETLINK_METRICS='0'))
+
+
+def finish(process, started):
+    output, _ = process.communicate()
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def run_once(path, seed=False):
+    started = time.perf_counter()
+    return finish(start(path, seed), started)
+
+
+def summarize(results):
+    keys = ('process_ms', 'import_ms', 'init_db_ms', 'seed_ms', 'first_request_ms')
+    summary = {key: round(statistics.median(r[key] for r in results), 2) for key in keys}
+    summary['runs'] = len(results)
+    summary['errors'] = sum(r['status'] != 200 for r in results)
+    return summary
+
+
+def current_schema(path, runs):
+    # Warm the database once, then every start must leave the files untouched
+    run_once(path, seed=True)
+    results, writes = [], 0
+    for _ in range(runs):
+        before = file_state(path)
+        results.append(run_once(path))
+        writes += file_state(path) != before
+    summary = summarize(results)
+    summary['starts_that_wrote'] = writes
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--seed', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--runs', type=int, default=5, help='process starts per case')
+    parser.add_argument('--workers', type=int, default=4, help='workers started together on a new database')
+    parser.add_argument('--pets', type=int, default=20000, help='pets in the datagen.py dataset')
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.seed)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='petlink-startup-')
+    results = {}
+
+    results['new_database'] = summarize([
+        run_once(os.path.join(workdir, f'new-{i}.db'), seed=True) for i in range(args.runs)
+    ])
+    results['current_schema'] = current_schema(os.path.join(workdir, 'demo.db'), args.runs)
+
+    import datagen
+    dataset_path = os.path.join(workdir, 'dataset.db')
+    sizes = dict(datagen.SCALES['small'], pets=args.pets, requests=args.pets * 2, likes=args.pets * 5)
+    datagen.generate(dataset_path, **sizes)
+    results[f'current_schema_{args.pets}_pets'] = current_schema(dataset_path, args.runs)
+
+    # Workers racing to migrate the same new database must all come up
+    path = os.path.join(workdir, 'racing.db')
+    started = time.perf_counter()
+    processes = [start(path) for _ in range(args.workers)]
+    results[f'{args.workers}_workers_new_database'] = summarize([finish(p, started) for p in processes])
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
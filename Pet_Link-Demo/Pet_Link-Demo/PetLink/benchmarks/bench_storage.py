@@ -0,0 +1,141 @@
+"""Mixed read/write load benchmark for the SQLite storage profile.
+
+Runs reader threads against /adopt and /search_pets while writer threads
+toggle likes and submit adoption requests, once with SQLite's default
+rollback journal and once with the WAL profile from app.py, and prints
+throughput and "database is locked" failures for each.
+
+    python benchmarks/bench_storage.py --seconds 10 --readers 8 --writers 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as petlink
+
+ROLLBACK_PROFILE = {
+    'DB_JOURNAL_MODE': 'DELETE',
+    'DB_PRAGMAS': {},
+    'DB_BUSY_RETRIES': 0
+}
+
+WAL_PROFILE = {
+    'DB_JOURNAL_MODE': petlink.app.config['DB_JOURNAL_MODE'],
+    'DB_PRAGMAS': dict(petlink.app.config['DB_PRAGMAS']),
+    'DB_BUSY_RETRIES': petlink.app.config['DB_BUSY_RETRIES']
+}
+
+
+def setup_database(path, profile, writers):
+    petlink.close_pool()
+    petlink.app.config['DATABASE'] = path
+    petlink.app.config.update(profile)
+    petlink.init_db()
+    conn = petlink.sqlite3.connect(path)
+    petlink.seed_db(conn)
+    conn.close()
+
+    clients = []
+    for i in range(writers):
+        client = petlink.app.test_client()
+        email = f'bench{i}@petlink.test'
+        client.post('/register', data={
+            'name': f'Bench {i}', 'email': email, 'password': 'bench',
+            'contact': '000', 'address': 'Bench Street'
+        })
+        client.post('/login', data={'email': email, 'password': 'bench'})
+        clients.append(client)
+    return clients
+
+
+def run_profile(name, profile, args):
+    workdir = tempfile.mkdtemp(prefix='petlink-bench-')
+    writer_clients = setup_database(os.path.join(workdir, 'petlink.db'), profile, args.writers)
+    pet_ids = [row[0] for row in petlink.sqlite3.connect(petlink.app.config['DATABASE']).execute('SELECT id FROM pets')]
+
+    counters = {'reads': 0, 'writes': 0, 'locked': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def record(key):
+        with lock:
+            counters[key] += 1
+
+    def check(response, key):
+        body = response.get_data(as_text=True)
+        if 'database is locked' in body:
+            record('locked')
+        elif response.status_code != 200 or 'error' in body[:200].lower():
+            record('errors')
+        else:
+            record(key)
+
+    def reader():
+        client = petlink.app.test_client()
+        i = 0
+        while time.perf_counter() < deadline:
+            if i % 2:
+                check(client.get('/adopt'), 'reads')
+            else:
+                check(client.get('/search_pets?q=a&status=all'), 'reads')
+            i += 1
+
+    def writer(client):
+        i = 0
+        while time.perf_counter() < deadline:
+            pet_id = pet_ids[i % len(pet_ids)]
+            if i % 4 == 3:
+                check(client.post(f'/request-adoption/{pet_id}', json={}), 'writes')
+            else:
+                check(client.post(f'/like-pet/{pet_id}'), 'writes')
+            i += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(client,)) for client in writer_clients]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    petlink.close_pool()
+
+    return {
+        'profile': name,
+        'seconds': round(elapsed, 2),
+        'reads_per_sec': round(counters['reads'] / elapsed, 1),
+        'writes_per_sec': round(counters['writes'] / elapsed, 1),
+        'locked_errors': counters['locked'],
+        'other_errors': counters['errors']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    results = [
+        run_profile('rollback-journal', ROLLBACK_PROFILE, args),
+        run_profile('wal', WAL_PROFILE, args)
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'profile':<18}{'reads/s':>10}{'writes/s':>10}{'locked':>8}{'errors':>8}")
+    for r in results:
+        print(f"{r['profile']:<18}{r['reads_per_sec']:>10}{r['writes_per_sec']:>10}"
+              f"{r['locked_errors']:>8}{r['other_errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""Concurrency stress test for the PetLink write paths.
+
+Generates a datagen.py dataset, then has many threads (one user each) hammer
+/request-adoption and /like-pet on a handful of hot pets over HTTP, the way
+double clicks and client retries arrive: every POST is sent at least twice,
+half of them concurrently, and half (--keyed) carry an Idempotency-Key.
+
+Afterwards it checks the database and fails if
+  * any (user, pet) pair has more than one adoption request,
+  * any pet's like_count differs from its pet_likes rows,
+  * a retry with the same Idempotency-Key got a different response,
+and reports p50/p95/p99 latency per route.
+
+    python benchmarks/bench_writes.py --threads 16 --rounds 50
+"""
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from werkzeug.serving import make_server
+
+import app as petlink
+import datagen
+from harness import percentile
+
+
+class Client:
+    """A logged-in user with its own cookie jar."""
+
+    def __init__(self, base_url, user):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        form = {'email': f'user{user}@bench.petlink', 'password': datagen.PASSWORD}
+        self.opener.open(base_url + '/login', urllib.parse.urlencode(form).encode()).read()
+
+    def post(self, path, body, key=None):
+        headers = {'Content-Type': 'application/json'}
+        if key:
+            headers['Idempotency-Key'] = key
+        request = urllib.request.Request(self.base_url + path, json.dumps(body).encode(), headers, method='POST')
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request) as response:
+                payload = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            payload = {'success': False, 'status': e.code}
+        return payload, (time.perf_counter() - started) * 1000
+
+
+def send_twice(client, path, body, key, concurrent):
+    """Send the same POST twice (together or back to back); return both responses and latencies."""
+    results = [None, None]
+
+    def send(i):
+        results[i] = client.post(path, body, key)
+    if concurrent:
+        threads = [threading.Thread(target=send, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        send(0)
+        send(1)
+    return results
+
+
+def hammer(base_url, user, pets, args, samples, mismatches, lock):
+    rng = random.Random(f'{args.seed}-{user}')
+    client = Client(base_url, user)
+    local = {'request_adoption': [], 'like_pet': []}
+    bad = 0
+    for _ in range(args.rounds):
+        pet_id = rng.choice(pets)
+        key = str(uuid.uuid4()) if rng.random() < args.keyed else None
+        concurrent = rng.random() < 0.5
+        if rng.random() < 0.5:
+            name, path, body = 'request_adoption', f'/request-adoption/{pet_id}', {}
+        else:
+            name, path, body = 'like_pet', f'/like-pet/{pet_id}', {'liked': rng.random() < 0.6}
+        (first, first_ms), (second, second_ms) = send_twice(client, path, body, key, concurrent)
+        local[name] += [first_ms, second_ms]
+        if key and first != second:
+            bad += 1
+    with lock:
+        for name, values in local.items():
+            samples[name].extend(values)
+        mismatches[0] += bad
+
+
+def check(path):
+    conn = sqlite3.connect(path)
+    duplicates = conn.execute('''
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM adoption_requests GROUP BY user_id, pet_id HAVING COUNT(*) > 1
+        )
+    ''').fetchone()[0]
+    drift = conn.execute('''
+        SELECT COUNT(*) FROM pets
+        WHERE like_count != (SELECT COUNT(*) FROM pet_likes WHERE pet_id = pets.id)
+    ''').fetchone()[0]
+    keys = conn.execute('SELECT COUNT(*) FROM idempotency_keys').fetchone()[0]
+    conn.close()
+    return {'duplicate_requests': duplicates, 'like_count_drift': drift, 'idempotency_keys': keys}
+
+
+def summarize(values):
+    values.sort()
+    return {
+        'requests': len(values),
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(values[-1], 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16, help='concurrent users')
+    parser.add_argument('--rounds', type=int, default=50, help='POSTs (each sent twice) per user')
+    parser.add_argument('--hot-pets', type=int, default=5, help='pets all users compete for')
+    parser.add_argument('--keyed', type=float, default=0.5, help='share of POSTs sent with an Idempotency-Key')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='petlink-writes-'), 'petlink.db')
+    sizes = dict(datagen.SCALES['small'], users=max(args.threads, 10), requests=0, likes=0)
+    datagen.generate(path, seed=args.seed, **sizes)
+
+    petlink.close_pool()
+    petlink.app.config['DATABASE'] = path
+    petlink.app.config['METRICS_ENABLED'] = False
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, petlink.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    pets = list(range(1, args.hot_pets + 1))
+    samples = {'request_adoption': [], 'like_pet': []}
+    mismatches = [0]
+    lock = threading.Lock()
+    threads = [threading.Thread(target=hammer, args=(base_url, user, pets, args, samples, mismatches, lock))
+               for user in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    petlink.close_pool()
+
+    results = check(path)
+    results['replay_mismatches'] = mismatches[0]
+    results['throughput_rps'] = round(sum(len(v) for v in samples.values()) / elapsed, 1)
+    results['routes'] = {name: summarize(values) for name, values in samples.items() if values}
+    print(json.dumps(results, indent=2))
+    if results['duplicate_requests'] or results['like_count_drift'] or results['replay_mismatches']:
+        raise SystemExit('write paths are not race-free')
+
+
+if __name__ == '__main__':
+    main()
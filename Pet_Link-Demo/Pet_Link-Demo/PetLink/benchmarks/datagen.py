@@ -0,0 +1,205 @@
+"""Deterministic synthetic dataset for PetLink benchmarks.
+
+Generates owners, users, pets, adoption requests, likes, care posts and
+comments into a fresh database. Activity is skewed like real traffic: a
+few owners list most pets, a few pets draw most requests and likes, and a
+few users do most of the posting. The same seed and sizes always produce
+the same rows (timestamps are offsets from a fixed date, not from now).
+
+    python benchmarks/datagen.py --out /tmp/petlink-bench.db --pets 20000
+
+Every generated account uses the password "bench": owners are
+owner<N>@bench.petlink and users are user<N>@bench.petlink (N from 0).
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as petlink
+from bench_search import NAMES, BREEDS, HEALTH, MEDICAL
+
+PASSWORD = 'bench'
+CATEGORIES = ('Dogs', 'Cats', 'Birds', 'Others')
+EPOCH = datetime.datetime(2024, 1, 1)
+DAYS = 365
+BATCH = 5000
+
+# Dataset sizes: --scale picks one, individual flags override it
+SCALES = {
+    'small': {'owners': 5, 'users': 200, 'pets': 2000, 'requests': 5000,
+              'likes': 10000, 'posts': 200, 'comments': 2000},
+    'medium': {'owners': 20, 'users': 2000, 'pets': 20000, 'requests': 50000,
+               'likes': 100000, 'posts': 2000, 'comments': 20000},
+    'large': {'owners': 100, 'users': 20000, 'pets': 200000, 'requests': 500000,
+              'likes': 1000000, 'posts': 20000, 'comments': 200000},
+}
+
+POST_TITLES = ['Feeding schedule for a new puppy', 'Litter training tips', 'Keeping birds warm in winter',
+               'First week with a rescue cat', 'Grooming long-haired breeds', 'Dental care basics',
+               'Crate training without stress', 'Choosing a vet', 'Travelling with pets', 'Senior pet care']
+COMMENT_TEXT = ['Thanks, this helped a lot!', 'We tried this and it worked.', 'Great advice.',
+                'How often should we do this?', 'Our vet said the same thing.', 'Bookmarking this.']
+
+
+def zipf_weights(n, rng, exponent=1.1):
+    """Cumulative Zipf weights over n items, with the popular items at random positions."""
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return list(itertools.accumulate(1.0 / rank ** exponent for rank in ranks))
+
+
+def timestamp(rng, after=None):
+    """A created_at within the year after EPOCH (and after `after`, if given)."""
+    start = after or EPOCH
+    end = EPOCH + datetime.timedelta(days=DAYS)
+    moment = start + (end - start) * rng.random()
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def insert_batches(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+
+
+def unique_pairs(count, left, right, rng, limit):
+    """Up to `count` distinct (left, right) pairs drawn with the given cumulative weights."""
+    pairs = set()
+    attempts = 0
+    while len(pairs) < min(count, limit) and attempts < count * 5:
+        attempts += 1
+        pairs.add((rng.choices(left[0], cum_weights=left[1])[0],
+                   rng.choices(right[0], cum_weights=right[1])[0]))
+    return sorted(pairs)
+
+
+def generate(path, owners, users, pets, requests, likes, posts, comments, seed=42):
+    """Create a database at path and fill it; return the row counts and build time."""
+    if os.path.exists(path):
+        raise SystemExit(f'{path} already exists; choose a new path')
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    password = petlink.hash_password(PASSWORD)
+
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+    petlink.migrate(conn)
+    conn.execute('BEGIN')
+    conn.executemany('INSERT OR IGNORE INTO categories (name) VALUES (?)', [(name,) for name in CATEGORIES])
+
+    insert_batches(conn, '''
+        INSERT INTO owners (name, email, password, contact, created_at) VALUES (?, ?, ?, ?, ?)
+    ''', ((f'Owner {i}', f'owner{i}@bench.petlink', password, f'+1555{i:06d}', EPOCH.isoformat(' '))
+          for i in range(owners)))
+    insert_batches(conn, '''
+        INSERT INTO users (name, email, password, contact, address, created_at) VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((f'User {i}', f'user{i}@bench.petlink', password, f'+1666{i:06d}', f'{i} Bench Street',
+           EPOCH.isoformat(' ')) for i in range(users)))
+
+    # The first owner lists the most pets, and so on down a Zipf curve
+    owner_ids = list(range(1, owners + 1))
+    owner_weights = list(itertools.accumulate(1.0 / rank ** 1.1 for rank in owner_ids))
+    pet_rows = []
+    for i in range(pets):
+        pet_rows.append((
+            f'{rng.choice(NAMES)} {i}', rng.randint(1, len(CATEGORIES)), rng.choice(BREEDS),
+            rng.randint(1, 15), rng.choice(HEALTH), rng.choice(MEDICAL), 'available',
+            f'https://images.example.com/pets/{i}.jpg',
+            rng.choices(owner_ids, cum_weights=owner_weights)[0], timestamp(rng)
+        ))
+    insert_batches(conn, '''
+        INSERT INTO pets (name, category_id, breed, age, health_details, medical_details,
+                          adoption_status, image_url, owner_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', pet_rows)
+    pet_created = {i + 1: row[-1] for i, row in enumerate(pet_rows)}
+
+    pet_ids = list(range(1, pets + 1))
+    user_ids = list(range(1, users + 1))
+    popular_pets = (pet_ids, zipf_weights(pets, rng))
+    active_users = (user_ids, zipf_weights(users, rng))
+
+    request_pairs = unique_pairs(requests, active_users, popular_pets, rng, users * pets)
+    request_rows = []
+    for user_id, pet_id in request_pairs:
+        status = rng.choices(('pending', 'approved', 'rejected'), weights=(60, 15, 25))[0]
+        created = timestamp(rng, datetime.datetime.fromisoformat(pet_created[pet_id]))
+        request_rows.append((user_id, pet_id, 'I would love to adopt this pet.', status, created,
+                             pet_rows[pet_id - 1][8]))
+    insert_batches(conn, '''
+        INSERT INTO adoption_requests (user_id, pet_id, message, status, created_at, owner_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', request_rows)
+    conn.execute('''
+        UPDATE pets SET adoption_status = 'adopted'
+        WHERE id IN (SELECT pet_id FROM adoption_requests WHERE status = 'approved')
+    ''')
+
+    like_pairs = unique_pairs(likes, popular_pets, active_users, rng, users * pets)
+    insert_batches(conn, 'INSERT INTO pet_likes (pet_id, user_id, created_at) VALUES (?, ?, ?)',
+                   ((pet_id, user_id, timestamp(rng, datetime.datetime.fromisoformat(pet_created[pet_id])))
+                    for pet_id, user_id in like_pairs))
+
+    insert_batches(conn, 'INSERT INTO care_posts (user_id, title, content, created_at) VALUES (?, ?, ?, ?)',
+                   ((rng.choices(user_ids, cum_weights=active_users[1])[0], rng.choice(POST_TITLES),
+                     ' '.join(rng.choice(HEALTH) + '.' for _ in range(rng.randint(3, 12))), timestamp(rng))
+                    for _ in range(posts)))
+    if posts:
+        post_ids = list(range(1, posts + 1))
+        popular_posts = zipf_weights(posts, rng)
+        insert_batches(conn, 'INSERT INTO care_comments (post_id, user_id, content, created_at) VALUES (?, ?, ?, ?)',
+                       ((rng.choices(post_ids, cum_weights=popular_posts)[0],
+                         rng.choices(user_ids, cum_weights=active_users[1])[0],
+                         rng.choice(COMMENT_TEXT), timestamp(rng))
+                        for _ in range(comments)))
+
+    conn.commit()
+    conn.execute('ANALYZE')
+    counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+              for table in ('owners', 'users', 'pets', 'adoption_requests', 'pet_likes',
+                            'care_posts', 'care_comments')}
+    conn.close()
+    counts['seed'] = seed
+    counts['build_seconds'] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def add_size_arguments(parser):
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    for name in SCALES['small']:
+        parser.add_argument(f'--{name}', type=int, help=f'override the number of {name}')
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def sizes_from_args(args):
+    sizes = dict(SCALES[args.scale])
+    for name in sizes:
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', required=True, help='path of the database to create')
+    add_size_arguments(parser)
+    args = parser.parse_args()
+    print(json.dumps(generate(args.out, seed=args.seed, **sizes_from_args(args)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
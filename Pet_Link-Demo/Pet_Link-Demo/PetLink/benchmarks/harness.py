@@ -0,0 +1,298 @@
+"""Route latency benchmark for PetLink.
+
+Generates a dataset with datagen.py (or uses --db), then drives the real
+routes, either in-process through the Flask test client or over HTTP
+against a threaded WSGI server, and reports p50/p95/p99 latency and
+throughput per route.
+
+    python benchmarks/harness.py --scale small --mode both --threads 4 --out results.json
+
+With --conditional, each worker revalidates: it sends back the ETag it got
+for a URL as If-None-Match, the way a browser or reverse proxy does.
+
+With --url, server mode targets an already running server instead (for
+example `flask serve` on a datagen.py database given with --db).
+
+Results are JSON (--json prints them, --out writes them to a file) and
+carry the git commit and dataset sizes so runs can be compared.
+"""
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+import app as petlink
+import datagen
+
+SEARCH_TERMS = ['g', 'go', 'gold', 'golden r', 'ma', 'maine', 'bud', 'sh', 'husk', 'vacc', 'micro']
+
+
+class Scenario:
+    """One benchmarked route: how to build each request and which account it needs."""
+
+    def __init__(self, name, method, path, login=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.login = login
+
+
+def scenarios(dataset):
+    pets = dataset['pets']
+    weights = datagen.zipf_weights(pets, random.Random(dataset['seed']))
+    pet_ids = range(1, pets + 1)
+
+    def popular_pet(rng):
+        return rng.choices(pet_ids, cum_weights=weights)[0]
+
+    return [
+        Scenario('home', 'GET', lambda rng: '/'),
+        Scenario('adopt', 'GET', lambda rng: '/adopt' + rng.choice(
+            ['', '?category=Dogs', '?category=Cats', '?category=Birds'])),
+        Scenario('search_pets', 'GET', lambda rng: '/search_pets?' + urllib.parse.urlencode(
+            {'q': rng.choice(SEARCH_TERMS)})),
+        Scenario('pet_detail', 'GET', lambda rng: f'/pet/{popular_pet(rng)}'),
+        Scenario('owner_dashboard', 'GET', lambda rng: '/owner-dashboard', login='owner'),
+        Scenario('care', 'GET', lambda rng: '/care'),
+        Scenario('like_pet', 'POST', lambda rng: f'/like-pet/{popular_pet(rng)}', login='user'),
+    ]
+
+
+def login_form(role, worker):
+    # Owner 0 has the most pets; each worker likes as a different user
+    if role == 'owner':
+        return '/owner-login', {'email': 'owner0@bench.petlink', 'password': datagen.PASSWORD}
+    return '/login', {'email': f'user{worker}@bench.petlink', 'password': datagen.PASSWORD}
+
+
+class TestClientDriver:
+    """Requests go through app.test_client(), in-process."""
+
+    def __init__(self, role, worker, conditional=False):
+        self.client = petlink.app.test_client()
+        self.etags = {} if conditional else None
+        if role:
+            path, form = login_form(role, worker)
+            self.client.post(path, data=form)
+
+    def request(self, method, path):
+        headers = {}
+        if self.etags is not None and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+        response = self.client.open(path, method=method, headers=headers)
+        response.close()
+        if self.etags is not None and response.headers.get('ETag'):
+            self.etags[path] = response.headers['ETag']
+        return response.status_code
+
+
+class HTTPDriver:
+    """Requests go over HTTP to the threaded WSGI server, with a cookie jar per worker."""
+
+    def __init__(self, role, worker, base_url, conditional=False):
+        self.base_url = base_url
+        self.etags = {} if conditional else None
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        if role:
+            path, form = login_form(role, worker)
+            self.opener.open(base_url + path, urllib.parse.urlencode(form).encode()).read()
+
+    def request(self, method, path):
+        data = b'' if method == 'POST' else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if self.etags is not None and path in self.etags:
+            request.add_header('If-None-Match', self.etags[path])
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                if self.etags is not None and response.headers.get('ETag'):
+                    self.etags[path] = response.headers['ETag']
+                return response.status
+        except urllib.error.HTTPError as e:
+            # urllib reports 304 Not Modified as an error
+            return e.code
+
+
+def percentile(samples, pct):
+    # Nearest-rank percentile of sorted samples
+    index = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def run_scenario(scenario, make_driver, args):
+    """Run args.per_route requests of one scenario spread across args.threads workers."""
+    per_worker = [args.per_route // args.threads + (1 if i < args.per_route % args.threads else 0)
+                  for i in range(args.threads)]
+    drivers = [make_driver(scenario.login, i) for i in range(args.threads)]
+    samples = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(f'{args.seed}-{scenario.name}-{index}')
+        driver = drivers[index]
+        for _ in range(args.warmup):
+            driver.request(scenario.method, scenario.path(rng))
+        local, failed = [], 0
+        for _ in range(per_worker[index]):
+            path = scenario.path(rng)
+            started = time.perf_counter()
+            try:
+                status = driver.request(scenario.method, path)
+            except Exception:
+                status = 599
+            local.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                failed += 1
+        with lock:
+            samples.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    return {
+        'requests': len(samples),
+        'errors': errors[0],
+        'throughput_rps': round(len(samples) / elapsed, 1),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'max_ms': round(samples[-1], 3)
+    }
+
+
+def run_mode(mode, selected, args):
+    server = None
+    if mode == 'client':
+        def make_driver(role, worker):
+            return TestClientDriver(role, worker, args.conditional)
+    elif args.url:
+        def make_driver(role, worker):
+            return HTTPDriver(role, worker, args.url.rstrip('/'), args.conditional)
+    else:
+        server = make_server('127.0.0.1', 0, petlink.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+
+        def make_driver(role, worker):
+            return HTTPDriver(role, worker, base_url, args.conditional)
+    try:
+        return {scenario.name: run_scenario(scenario, make_driver, args) for scenario in selected}
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_counts(path):
+    conn = sqlite3.connect(path)
+    counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+              for table in ('owners', 'users', 'pets', 'adoption_requests', 'pet_likes',
+                            'care_posts', 'care_comments')}
+    conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='benchmark an existing datagen.py database instead of generating one')
+    datagen.add_size_arguments(parser)
+    parser.add_argument('--mode', choices=['client', 'server', 'both'], default='both')
+    parser.add_argument('--url', help='in server mode, benchmark this running server (needs --db)')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--per-route', type=int, default=400, help='timed requests per route')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per worker and route')
+    parser.add_argument('--routes', help='comma-separated subset of routes to run')
+    parser.add_argument('--no-page-cache', action='store_true', help='disable the home/adopt listing cache')
+    parser.add_argument('--conditional', action='store_true', help='revalidate with If-None-Match')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    parser.add_argument('--out', help='also write the JSON results to this file')
+    args = parser.parse_args()
+    args.threads = max(1, args.threads)
+    if args.url and not args.db:
+        parser.error('--url needs --db, the database the server is using')
+
+    if args.db:
+        path = args.db
+        dataset = dict(dataset_counts(path), seed=args.seed)
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix='petlink-harness-'), 'petlink.db')
+        dataset = datagen.generate(path, seed=args.seed, **datagen.sizes_from_args(args))
+
+    petlink.close_pool()
+    petlink.app.config['DATABASE'] = path
+    petlink.app.config['METRICS_ENABLED'] = False
+    if args.no_page_cache:
+        petlink.page_cache.ttl = 0
+    # Keep server access logs out of the results
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    selected = scenarios(dataset)
+    if args.routes:
+        wanted = set(args.routes.split(','))
+        selected = [scenario for scenario in selected if scenario.name in wanted]
+
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'dataset': dataset,
+        'threads': args.threads,
+        'requests_per_route': args.per_route,
+        'page_cache': not args.no_page_cache,
+        'conditional': args.conditional,
+        'url': args.url,
+        'modes': {}
+    }
+    for mode in (['client', 'server'] if args.mode == 'both' else [args.mode]):
+        petlink.page_cache.clear()
+        results['modes'][mode] = run_mode(mode, selected, args)
+    petlink.close_pool()
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for mode, routes in results['modes'].items():
+        print(f"\n{mode} ({args.threads} threads, {args.per_route} requests per route)")
+        print(f"{'route':<18}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for name, r in routes.items():
+            print(f"{name:<18}{r['throughput_rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as petlink
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """A freshly migrated database, used by the app for the length of the test."""
+    path = str(tmp_path / 'petlink.db')
+    petlink.close_pool()
+    monkeypatch.setitem(petlink.app.config, 'DATABASE', path)
+    petlink.init_db()
+    yield path
+    petlink.close_pool()
+
+
+@pytest.fixture
+def db(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def client(db_path):
+    return petlink.app.test_client()
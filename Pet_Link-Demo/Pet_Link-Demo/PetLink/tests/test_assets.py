@@ -0,0 +1,28 @@
+import os
+import shutil
+
+import pytest
+
+import app as petlink
+
+
+@pytest.fixture
+def static_folder(tmp_path, monkeypatch):
+    """A copy of the asset sources with nothing built yet."""
+    for source in petlink.ASSET_SOURCES:
+        os.makedirs(tmp_path / os.path.dirname(source), exist_ok=True)
+        shutil.copy(os.path.join(petlink.app.static_folder, source), tmp_path / source)
+    monkeypatch.setattr(petlink.app, 'static_folder', str(tmp_path))
+    return tmp_path
+
+
+def test_unbuilt_assets_are_linked_unversioned_without_writing(static_folder):
+    assert petlink.load_asset_manifest() == {}
+    assert not (static_folder / petlink.ASSET_DIST).exists()
+
+
+def test_loading_reads_the_names_written_by_a_build(static_folder):
+    built = petlink.build_assets()
+
+    assert petlink.load_asset_manifest() == built
+    assert all(name.startswith(petlink.ASSET_DIST + '/') for name in built.values())
@@ -0,0 +1,21 @@
+import pytest
+
+import app as petlink
+
+ENDPOINTS = ['/metrics', '/slow-queries', '/db-stats', '/cache-stats']
+REMOTE = {'REMOTE_ADDR': '203.0.113.5'}
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_without_a_token_only_loopback_is_let_in(client, url):
+    assert client.get(url).status_code == 200
+    assert client.get(url, environ_base=REMOTE).status_code == 403
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_a_configured_token_is_required_from_everywhere(client, monkeypatch, url):
+    monkeypatch.setitem(petlink.app.config, 'METRICS_TOKEN', 's3cret')
+
+    assert client.get(url).status_code == 403
+    assert client.get(url, headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    assert client.get(url, headers={'Authorization': 'Bearer s3cret'}, environ_base=REMOTE).status_code == 200
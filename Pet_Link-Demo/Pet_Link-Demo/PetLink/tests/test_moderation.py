@@ -0,0 +1,43 @@
+import pytest
+
+import app as petlink
+
+
+@pytest.fixture
+def owner(client, db):
+    """The demo owner, logged in, with two pending requests on pets 1 and 2."""
+    petlink.seed_db(db)
+    adopter = petlink.app.test_client()
+    adopter.post('/register', data=dict(name='U', email='u@test', password='p', contact='1', address='a'))
+    adopter.post('/login', data=dict(email='u@test', password='p'))
+    for pet_id in (1, 2):
+        adopter.post(f'/request-adoption/{pet_id}', json={})
+    client.post('/owner-login', data=dict(email='admin@petlink.com', password='admin123'))
+    return client
+
+
+def request_status(db, request_id):
+    return db.execute('SELECT status FROM adoption_requests WHERE id = ?', (request_id,)).fetchone()[0]
+
+
+def test_moderating_a_request_that_is_no_longer_pending_is_a_conflict(owner, db):
+    assert owner.post('/update-request-status/1', json={'status': 'approved'}).status_code == 200
+
+    response = owner.post('/update-request-status/1', json={'status': 'rejected'})
+
+    assert response.status_code == 409
+    assert response.get_json()['success'] is False
+    assert response.get_json()['skipped'] == [{'id': 1, 'status': 'approved'}]
+    assert request_status(db, 1) == 'approved'
+
+
+def test_bulk_moderation_lists_skipped_requests(owner, db):
+    owner.post('/update-request-status/1', json={'status': 'approved'})
+
+    result = owner.post('/moderate-requests', json={'request_ids': [1, 2], 'status': 'rejected'}).get_json()
+
+    assert result['success'] is True
+    assert [row['id'] for row in result['changed']] == [2]
+    assert result['skipped'] == [{'id': 1, 'status': 'approved'}]
+    assert request_status(db, 1) == 'approved'
+    assert request_status(db, 2) == 'rejected'
@@ -0,0 +1,42 @@
+import app as petlink
+
+
+def add_request(db):
+    db.executemany("INSERT INTO owners (id, name, email, password, contact) VALUES (?, 'O', ?, 'x', '1')",
+                   [(1, 'o1@test'), (2, 'o2@test')])
+    db.execute("INSERT INTO users (id, name, email, password, contact, address) VALUES (1, 'U', 'u@test', 'x', '1', 'a')")
+    db.execute('''
+        INSERT INTO pets (id, name, category_id, breed, age, adoption_status, owner_id)
+        VALUES (1, 'Bud', 1, 'Beagle', 2, 'available', 1)
+    ''')
+    db.execute("INSERT INTO adoption_requests (id, user_id, pet_id, message) VALUES (1, 1, 1, 'hi')")
+    db.commit()
+
+
+def request_owner(db):
+    return db.execute('SELECT owner_id FROM adoption_requests WHERE id = 1').fetchone()[0]
+
+
+def test_requests_follow_their_pet_to_a_new_owner(db):
+    add_request(db)
+    assert request_owner(db) == 1
+
+    db.execute('UPDATE pets SET owner_id = 2 WHERE id = 1')
+    db.commit()
+
+    assert request_owner(db) == 2
+    assert petlink.check_owner_stats(db) == {}
+
+
+def test_check_owner_stats_reports_and_rebuild_repairs_request_owner_drift(db):
+    add_request(db)
+    db.execute('UPDATE adoption_requests SET owner_id = 2 WHERE id = 1')
+    db.commit()
+
+    assert petlink.check_owner_stats(db) == {'adoption_requests.owner_id': 1}
+
+    petlink.rebuild_owner_stats(db)
+    db.commit()
+
+    assert request_owner(db) == 1
+    assert petlink.check_owner_stats(db) == {}
@@ -0,0 +1,40 @@
+NEWER_MATCHES = 2100
+
+
+def add_pets(db, rows):
+    db.execute("INSERT OR IGNORE INTO owners (id, name, email, password, contact) VALUES (1, 'O', 'o@test', 'x', '1')")
+    db.executemany('''
+        INSERT INTO pets (name, category_id, breed, age, health_details, medical_details,
+                          adoption_status, image_url, owner_id, created_at)
+        VALUES (?, 1, ?, 2, ?, '', 'available', '', 1, ?)
+    ''', rows)
+    db.commit()
+
+
+def test_best_match_ranks_first_behind_many_newer_matches(client, db):
+    # An exact name hit on an old pet, then thousands of newer pets that only
+    # match the same prefix in their health details
+    add_pets(db, [('Bud', 'Beagle', 'Healthy', '2020-01-01 00:00:00')])
+    add_pets(db, [(f'Pet {i}', 'Mixed', 'Budget friendly', f'2024-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}')
+                  for i in range(NEWER_MATCHES)])
+
+    result = client.get('/search_pets?q=bud').get_json()
+
+    assert result['pets'][0]['name'] == 'Bud'
+    assert result['pets'][0]['name_html'] == '<mark>Bud</mark>'
+
+
+def test_search_cursor_walks_every_match_once(client, db):
+    add_pets(db, [(f'Pet {i}', 'Mixed', 'Budget friendly', f'2024-01-01 00:00:{i % 60:02d}')
+                  for i in range(250)])
+
+    seen, cursor = [], None
+    while True:
+        url = '/search_pets?q=bud&limit=100' + (f'&cursor={cursor}' if cursor else '')
+        result = client.get(url).get_json()
+        seen.extend(pet['id'] for pet in result['pets'])
+        cursor = result['next_cursor']
+        if not cursor:
+            break
+
+    assert sorted(seen) == list(range(1, 251))